@@ -0,0 +1,43 @@
+"""Serialization of a task result holding many ImageTargets.
+
+Compares serializing one Target after the other with the batched
+serialization of cpr_serializer().
+
+Usage: python benchmarks/bench_batch_serialization.py [n targets] [tile size]
+"""
+import sys
+import tempfile
+import time
+
+import numpy as np
+from prefect.serializers import JSONSerializer
+
+from cpr.image.ImageTarget import ImageTarget
+from cpr.Serializer import cpr_serializer
+
+
+def make_targets(location, n, size):
+    targets = []
+    for i in range(n):
+        t = ImageTarget(location=location, name=f"tile-{i}", ext=".tif")
+        t.set_data(np.random.randint(0, 2**12, size=(size, size), dtype=np.uint16))
+        targets.append(t)
+    return targets
+
+
+def main(n=256, size=512):
+    serial = JSONSerializer(
+        object_encoder="cpr.Serializer.target_encoder",
+        object_decoder="cpr.Serializer.target_decoder",
+    )
+    for name, serializer in [("serial", serial), ("batched", cpr_serializer())]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            targets = make_targets(tmp_dir, n, size)
+            start = time.perf_counter()
+            serializer.dumps({"tiles": targets})
+            elapsed = time.perf_counter() - start
+            print(f"{name:8s}: {elapsed:7.3f} s")
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
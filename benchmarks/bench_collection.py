@@ -0,0 +1,52 @@
+"""Result size and load time of many ImageSources as JSON list and as
+ResourceCollection.
+
+Usage: python benchmarks/bench_collection.py [resources]
+"""
+import sys
+import tempfile
+import time
+from os.path import getsize
+
+from cpr.collection.ResourceCollection import ResourceCollection
+from cpr.image.ImageSource import ImageSource
+from cpr.Serializer import cpr_serializer
+
+
+def main(n=100_000):
+    sources = [
+        ImageSource.from_path(
+            f"/data/screen/plate-{i // 10_000:02d}/images/well-{i:06d}.tif",
+            metadata={"axes": "YX", "unit": "micron"},
+            resolution=[1 / 0.134, 1 / 0.134],
+        )
+        for i in range(n)
+    ]
+    serializer = cpr_serializer()
+    print(f"{'format':10s} {'size':>12s} {'dumps':>8s} {'loads':>8s} {'iterate':>8s}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        collection = ResourceCollection(location=tmp_dir, name="sources")
+        collection.set_data(sources)
+        for name, payload in [("json", sources), ("collection", collection)]:
+            start = time.perf_counter()
+            blob = serializer.dumps(payload)
+            dumps = time.perf_counter() - start
+            size = len(blob)
+            if name == "collection":
+                size += getsize(collection.get_path())
+
+            start = time.perf_counter()
+            loaded = serializer.loads(blob)
+            if name == "collection":
+                loaded = loaded.get_data()
+            loads = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in loaded:
+                pass
+            iterate = time.perf_counter() - start
+            print(f"{name:10s} {size:12d} {dumps:7.3f}s {loads:7.3f}s {iterate:7.3f}s")
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
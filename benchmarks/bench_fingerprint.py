@@ -0,0 +1,43 @@
+"""Cost of identifying the task function per task run.
+
+Compares the bytecode hex string used previously with the memoized
+`code_fingerprint`.
+
+Usage: python benchmarks/bench_fingerprint.py [n task runs]
+"""
+import sys
+import time
+
+import numpy as np
+
+from cpr.utilities.fingerprint import code_fingerprint
+
+
+def segment(image, threshold=400, sigma=2.0):
+    smoothed = np.clip(image * sigma, 0, None)
+    labels = [i for i, v in enumerate(smoothed.ravel()) if v > threshold]
+    return {"n": len(labels), "labels": labels}
+
+
+def main(n=100_000):
+    start = time.perf_counter()
+    for _ in range(n):
+        segment.__code__.co_code.hex()
+    co_code = time.perf_counter() - start
+
+    start = time.perf_counter()
+    code_fingerprint(segment, follow_globals=True)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        code_fingerprint(segment, follow_globals=True)
+    memoized = time.perf_counter() - start
+
+    print(f"co_code.hex()         : {1e6 * co_code / n:8.3f} us per run")
+    print(f"code_fingerprint first: {1e6 * first:8.3f} us")
+    print(f"code_fingerprint memo : {1e6 * memoized / n:8.3f} us per run")
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
@@ -0,0 +1,49 @@
+"""Compare the streaming array hash against hashing a concatenated copy.
+
+Usage: python benchmarks/bench_hashing.py [size in MiB]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import xxhash
+
+from cpr.utilities.hashing import hash_array
+
+
+def concatenated_hash(a):
+    data = bytes()
+    data += str(a.dtype).encode("ascii")
+    data += b","
+    data += str(a.shape).encode("ascii")
+    data += b","
+    data += a.tobytes()
+    return xxhash.xxh3_64(data).hexdigest()
+
+
+def measure(fn, a):
+    tracemalloc.start()
+    start = time.perf_counter()
+    digest = fn(a)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return digest, elapsed, peak
+
+
+def main(size_mib=512):
+    a = np.random.randint(0, 2**16, size=size_mib * 2**19, dtype=np.uint16)
+    a = a.reshape(-1, 2048)
+    for label, arr in [("contiguous", a), ("strided", a[:, ::2])]:
+        print(f"{label}: {arr.nbytes / 2**20:.0f} MiB")
+        for fn in [concatenated_hash, hash_array]:
+            digest, elapsed, peak = measure(fn, arr)
+            print(
+                f"  {fn.__name__:>18}: {elapsed:7.3f} s, "
+                f"peak {peak / 2**20:8.1f} MiB, {digest}"
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
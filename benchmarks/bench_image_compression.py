@@ -0,0 +1,87 @@
+"""Benchmark matrix of ImageTarget compression codec x level x dtype.
+
+Reports write and read throughput (MiB of raw data per second) and the
+compression ratio.
+
+Usage: python benchmarks/bench_image_compression.py [size in MiB] [maxworkers]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from os import remove
+from os.path import getsize, join
+
+import numpy as np
+
+from cpr.image.ImageTarget import ImageTarget
+
+CODECS = [
+    ("none", [None], False),
+    ("zlib", [1, 6], False),
+    ("zlib", [1, 6], True),
+    ("zstd", [1, 5, 9], False),
+    ("zstd", [1, 5, 9], True),
+    ("lzma", [None], False),
+]
+
+
+def smooth(image, sigma):
+    """Gaussian blur in the Fourier domain, with periodic boundaries."""
+    fy = np.fft.fftfreq(image.shape[0])[:, np.newaxis]
+    fx = np.fft.rfftfreq(image.shape[1])[np.newaxis]
+    kernel = np.exp(-2 * (np.pi * sigma) ** 2 * (fy**2 + fx**2))
+    return np.fft.irfft2(np.fft.rfft2(image) * kernel, s=image.shape)
+
+
+def microscopy_like(size_mib, dtype):
+    rng = np.random.default_rng(42)
+    n_pixels = size_mib * 2**20 // np.dtype(dtype).itemsize
+    shape = (max(1, n_pixels // 1024**2), 1024, 1024)
+    signal = smooth(rng.random(shape[1:]), 4)
+    signal = (signal - signal.min()) / (signal.max() - signal.min())
+    scale = 200 if dtype == np.uint8 else 4000
+    stack = signal[np.newaxis] * scale + rng.poisson(5, size=shape)
+    return stack.astype(dtype)
+
+
+def main(size_mib=64, maxworkers=None):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for dtype in [np.uint8, np.uint16, np.float32]:
+            data = microscopy_like(size_mib, dtype)
+            raw = data.nbytes / 2**20
+            for codec, levels, predictor in CODECS:
+                for level in levels:
+                    img = ImageTarget.from_path(
+                        join(tmp_dir, "image.tif"),
+                        imagej=False,
+                        compression=codec,
+                        compression_level=level,
+                        predictor=predictor,
+                        maxworkers=maxworkers,
+                    )
+                    img.set_data(data)
+
+                    start = time.perf_counter()
+                    img.serialize()
+                    write = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    img.get_data()
+                    read = time.perf_counter() - start
+
+                    ratio = data.nbytes / getsize(img.get_path())
+                    remove(img.get_path())
+                    label = f"{codec}{'+predictor' if predictor else ''}"
+                    print(
+                        f"{np.dtype(dtype).name:>8} {label:>15} level={str(level):>4}: "
+                        f"write {raw / write:7.1f} MiB/s, "
+                        f"read {raw / read:7.1f} MiB/s, ratio {ratio:5.2f}"
+                    )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
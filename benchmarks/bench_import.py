@@ -0,0 +1,52 @@
+"""Cold-start import time of cpr modules.
+
+Every module is imported in a fresh interpreter with `-X importtime`.
+Each row shows the cumulative import time of the module and the heavy
+dependencies it pulls in.
+
+Usage: python benchmarks/bench_import.py [repeats]
+"""
+import subprocess
+import sys
+
+MODULES = [
+    "cpr.Resource",
+    "cpr.Target",
+    "cpr.numpy.NumpyTarget",
+    "cpr.csv.CSVTarget",
+    "cpr.image.ImageTarget",
+    "cpr.zarr.ZarrSource",
+    "cpr.zarr.ZarrTarget",
+    "cpr.collection.ResourceCollection",
+    "cpr.storage.StorageIndex",
+    "cpr.Serializer",
+]
+HEAVY = ["pandas", "pyarrow", "tifffile", "zarr", "ome_zarr", "prefect", "fsspec"]
+
+
+def import_times(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(repeats=5):
+    for module in MODULES:
+        runs = [import_times(module) for _ in range(repeats)]
+        best = min(r[module] for r in runs) / 1000
+        heavy = ", ".join(h for h in HEAVY if h in runs[0])
+        print(f"{module:36s} {best:8.1f} ms  {heavy}")
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
@@ -0,0 +1,54 @@
+"""Cache key computation for task arguments.
+
+Compares the serialization based `hash_objects` with the structural
+`hash_inputs` for array, DataFrame and Resource arguments.
+
+Usage: python benchmarks/bench_input_hash.py [array size in MiB] [n rows]
+"""
+import sys
+import tempfile
+import time
+from os.path import join
+
+import numpy as np
+import pandas as pd
+
+from cpr.image.ImageSource import ImageSource
+from cpr.utilities.input_hashing import hash_inputs
+from cpr.utilities.utilities import hash_objects
+
+
+def timeit(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main(size_mib=256, n_rows=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cases = {
+            "array": np.random.rand(size_mib * 2**20 // 8),
+            "dataframe": pd.DataFrame(
+                {
+                    "a": np.arange(n_rows),
+                    "b": np.random.rand(n_rows),
+                    "c": np.random.choice(["x", "y", "z"], n_rows),
+                }
+            ),
+            "sources": [
+                ImageSource.from_path(join(tmp_dir, f"img-{i}.tif"))
+                for i in range(1000)
+            ],
+            "scalars": {"sigma": 2.0, "threshold": 400, "name": "nuclei"},
+        }
+        print(
+            f"{'argument':10s} {'hash_objects':>13s} {'hash_inputs':>12s} {'speedup':>8s}"
+        )
+        for name, arg in cases.items():
+            old = timeit(hash_objects, "task", {"arg": arg})
+            new = timeit(hash_inputs, "task", {"arg": arg})
+            print(f"{name:10s} {old:12.4f}s {new:11.4f}s {old / new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
@@ -0,0 +1,58 @@
+"""Chained reads with and without prefetching the next Source.
+
+Every step reads one array and computes on it for `compute_ms`. With
+prefetching the read of the next array overlaps with the computation.
+Storage latency is emulated by `latency_ms` per read, since local reads
+are served from the page cache.
+
+Usage: python benchmarks/bench_prefetch.py [steps] [size] [compute_ms] [latency_ms]
+"""
+import sys
+import tempfile
+import time
+from os.path import join
+
+import numpy as np
+
+from cpr.numpy.NumpySource import NumpySource
+
+
+class SlowSource(NumpySource):
+    latency = 0.0
+
+    def _read_data(self):
+        time.sleep(self.latency)
+        return super(SlowSource, self)._read_data()
+
+
+def run(sources, compute, use_prefetch):
+    start = time.perf_counter()
+    for i, source in enumerate(sources):
+        if use_prefetch and i + 1 < len(sources):
+            sources[i + 1].prefetch_data()
+        data = source.get_data()
+        end = time.perf_counter() + compute
+        while time.perf_counter() < end:
+            data.sum()
+    return time.perf_counter() - start
+
+
+def main(steps=20, size=2048, compute_ms=100, latency_ms=100):
+    SlowSource.latency = latency_ms / 1000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sources = []
+        for i in range(steps):
+            path = join(tmp_dir, f"a-{i}.npy")
+            np.save(path, np.random.rand(size, size).astype(np.float32))
+            sources.append(SlowSource.from_path(path))
+
+        for use_prefetch in [False, True]:
+            elapsed = run(sources, compute_ms / 1000, use_prefetch)
+            print(
+                f"prefetch={use_prefetch!s:5s} {elapsed:7.3f}s "
+                f"{1e3 * elapsed / steps:8.1f}ms per step"
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
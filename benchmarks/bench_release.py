@@ -0,0 +1,63 @@
+"""Serialization latency of many small Targets per garbage collection policy.
+
+A large object graph is kept alive to make full collections as expensive
+as in a worker holding big DataFrames. "always" is only run up to
+`max_always` Targets, because it collects once per Target.
+
+Usage: python benchmarks/bench_release.py [heap objects] [max_always]
+"""
+import sys
+import tempfile
+import time
+
+import numpy as np
+from prefect.serializers import JSONSerializer
+
+from cpr.numpy.NumpyTarget import NumpyTarget
+from cpr.Serializer import cpr_serializer
+from cpr.utilities.release import set_gc_policy
+
+
+def make_targets(location, n):
+    targets = []
+    for i in range(n):
+        t = NumpyTarget(location=location, name=f"t-{i}", ext=".npy")
+        t.set_data(np.full((8, 8), i, dtype=np.uint16))
+        targets.append(t)
+    return targets
+
+
+def main(heap_objects=1_000_000, max_always=100):
+    heap = [{"i": i} for i in range(heap_objects)]  # noqa: F841
+    serializers = [
+        (
+            "serial",
+            JSONSerializer(
+                object_encoder="cpr.Serializer.target_encoder",
+                object_decoder="cpr.Serializer.target_decoder",
+            ),
+        ),
+        ("batched", cpr_serializer(max_workers=1)),
+    ]
+    print(
+        f"{'policy':8s} {'serializer':10s} {'targets':>8s} {'total':>9s} {'per target':>12s}"
+    )
+    for policy in ["always", "deferred", "never"]:
+        set_gc_policy(policy)
+        for name, serializer in serializers:
+            for n in [1, 100, 10_000]:
+                if policy == "always" and name == "serial" and n > max_always:
+                    continue
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    targets = make_targets(tmp_dir, n)
+                    start = time.perf_counter()
+                    serializer.dumps(targets)
+                    elapsed = time.perf_counter() - start
+                print(
+                    f"{policy:8s} {name:10s} {n:8d} {elapsed:8.3f}s "
+                    f"{1e3 * elapsed / n:10.3f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
@@ -0,0 +1,65 @@
+"""Round-trip of result payloads holding many persisted Targets.
+
+Compares the plain JSONSerializer with target_encoder/target_decoder,
+whose decoder resolved the class name of every Target, to cpr_serializer
+with json and orjson. cpr_serializer additionally checks the existence of
+all decoded Resources with one directory listing. The Targets are not
+persisted, so only encoding and decoding is measured.
+
+Usage: python benchmarks/bench_serializer_roundtrip.py [max resources]
+"""
+import sys
+import time
+
+from prefect.serializers import JSONSerializer
+from prefect.utilities.importtools import from_qualified_name
+
+from cpr.numpy.NumpyTarget import NumpyTarget
+from cpr.Serializer import cpr_serializer
+
+
+def uncached_decoder(result: dict):
+    if result.get("__class__", "").startswith("cpr."):
+        return from_qualified_name(result["__class__"])(**result["data"])
+    return result
+
+
+def main(max_resources=100_000):
+    serializers = [
+        (
+            "uncached",
+            JSONSerializer(
+                object_encoder="cpr.Serializer.target_encoder",
+                object_decoder="__main__.uncached_decoder",
+            ),
+        ),
+        ("json", cpr_serializer()),
+        ("orjson", cpr_serializer(jsonlib="orjson")),
+    ]
+    print(f"{'serializer':10s} {'resources':>9s} {'dumps':>9s} {'loads':>9s}")
+    for n in [10, 1_000, 100_000]:
+        if n > max_resources:
+            break
+        payload = {
+            "tiles": [
+                NumpyTarget(
+                    location="/data/results/tiles",
+                    name=f"tile-{i}",
+                    ext=".npy",
+                    data_hash=f"{i:016x}",
+                )
+                for i in range(n)
+            ]
+        }
+        for name, serializer in serializers:
+            start = time.perf_counter()
+            blob = serializer.dumps(payload)
+            dumps = time.perf_counter() - start
+            start = time.perf_counter()
+            serializer.loads(blob)
+            loads = time.perf_counter() - start
+            print(f"{name:10s} {n:9d} {dumps:8.4f}s {loads:8.4f}s")
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
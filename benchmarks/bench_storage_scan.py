@@ -0,0 +1,38 @@
+"""Scan throughput of the storage index.
+
+Creates `n_files` small Target files, spread over `n_dirs` directories
+together with the same number of unrelated files, and scans them.
+
+Usage: python benchmarks/bench_storage_scan.py [n files] [n dirs] [workers]
+"""
+import os
+import sys
+import tempfile
+import time
+from os.path import join
+
+from cpr.storage.StorageIndex import scan
+
+
+def main(n_files=200_000, n_dirs=200, workers=8):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        per_dir = n_files // n_dirs
+        for d in range(n_dirs):
+            location = join(tmp_dir, f"location-{d}")
+            os.makedirs(location)
+            for i in range(per_dir):
+                for name in [f"tile_{i}-{i:016x}.tif", f"log_{i}.txt"]:
+                    with open(join(location, name), "wb") as f:
+                        f.write(b"x")
+
+        start = time.perf_counter()
+        n = sum(1 for _ in scan([tmp_dir], max_workers=workers))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{n} Target files among {2 * n} files: {elapsed:.3f} s, "
+            f"{2 * n / elapsed:,.0f} files/s"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
@@ -0,0 +1,75 @@
+"""Filesystem calls per get_data and per serialize of NumpyTargets.
+
+stat calls are counted by wrapping os.stat, which os.path.exists and
+os.path.isdir use as well. open, scandir, rename and remove calls are
+counted with an audit hook. Each row shows calls per Target.
+
+Usage: python benchmarks/bench_syscalls.py [targets]
+"""
+import os
+import sys
+import tempfile
+from collections import Counter
+
+import numpy as np
+
+from cpr.numpy.NumpyTarget import NumpyTarget
+from cpr.Resource import check_exists
+
+counts = Counter()
+AUDITED = {"open", "os.scandir", "os.listdir", "os.rename", "os.remove"}
+
+
+def audit(event, args):
+    if event in AUDITED:
+        counts[event] += 1
+
+
+_stat = os.stat
+
+
+def counting_stat(*args, **kwargs):
+    counts["os.stat"] += 1
+    return _stat(*args, **kwargs)
+
+
+def report(label, n):
+    calls = ", ".join(f"{k}={v / n:.2f}" for k, v in sorted(counts.items()))
+    print(f"{label:28s} {sum(counts.values()) / n:6.2f}  {calls}")
+    counts.clear()
+
+
+def main(n=1000):
+    sys.addaudithook(audit)
+    os.stat = counting_stat
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        targets = []
+        for i in range(n):
+            t = NumpyTarget(location=tmp_dir, name=f"t-{i}", ext=".npy")
+            t.set_data(np.full((4,), i))
+            targets.append(t)
+        counts.clear()
+
+        print(f"{'':28s} {'total':>6s}  per call")
+        serialized = [t.serialize() for t in targets]
+        report("serialize", n)
+
+        for t in targets:
+            t.get_data()
+        report("get_data (same instance)", n)
+
+        fresh = [NumpyTarget(**d) for d in serialized]
+        for t in fresh:
+            t.get_data()
+        report("get_data (new instance)", n)
+
+        fresh = [NumpyTarget(**d) for d in serialized]
+        check_exists(fresh)
+        for t in fresh:
+            t.get_data()
+        report("check_exists + get_data", n)
+    os.stat = _stat
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
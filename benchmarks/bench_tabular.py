@@ -0,0 +1,60 @@
+"""Compare CSVTarget, ParquetTarget and FeatherTarget.
+
+Reports write time, read time (including hash verification) and file size.
+
+Usage: python benchmarks/bench_tabular.py [number of rows]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from os.path import getsize, join
+
+import numpy as np
+import pandas as pd
+
+from cpr.csv.CSVTarget import CSVTarget
+from cpr.feather.FeatherTarget import FeatherTarget
+from cpr.parquet.ParquetTarget import ParquetTarget
+
+
+def main(n_rows=1_000_000):
+    rng = np.random.default_rng(42)
+    data = pd.DataFrame(
+        {
+            "label": rng.integers(0, 2**16, n_rows),
+            "area": np.round(rng.random(n_rows) * 1000, 2),
+            "intensity": np.round(rng.random(n_rows), 4),
+            "class": rng.choice(["nucleus", "cell", "background"], n_rows),
+        }
+    )
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for clazz, ext in [
+            (CSVTarget, ".csv"),
+            (ParquetTarget, ".parquet"),
+            (FeatherTarget, ".feather"),
+        ]:
+            target = clazz.from_path(join(tmp_dir, f"table{ext}"))
+            target.set_data(data)
+
+            start = time.perf_counter()
+            target.serialize()
+            write = time.perf_counter() - start
+
+            start = time.perf_counter()
+            target.get_data()
+            read = time.perf_counter() - start
+
+            size = getsize(target.get_path()) / 2**20
+            print(
+                f"{clazz.__name__:>13}: write {write:6.2f} s, read {read:6.2f} s, "
+                f"size {size:8.1f} MiB"
+            )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
@@ -0,0 +1,35 @@
+"""Scaling of the "tree" hash mode with the number of threads.
+
+Usage: python benchmarks/bench_tree_hash.py [size in MiB] [max threads]
+"""
+import sys
+import time
+from os import cpu_count
+
+import numpy as np
+
+from cpr.utilities.hashing import hash_array
+
+
+def main(size_mib=1024, max_threads=cpu_count()):
+    a = np.random.randint(0, 255, size=size_mib * 2**20, dtype=np.uint8)
+
+    start = time.perf_counter()
+    hash_array(a, hash_mode="flat")
+    flat = time.perf_counter() - start
+    print(f"flat      : {flat:7.3f} s, {size_mib / flat:8.0f} MiB/s")
+
+    threads = 1
+    while threads <= max_threads:
+        start = time.perf_counter()
+        hash_array(a, hash_mode="tree", max_workers=threads)
+        elapsed = time.perf_counter() - start
+        print(
+            f"tree {threads:4d} : {elapsed:7.3f} s, {size_mib / elapsed:8.0f} MiB/s, "
+            f"speedup {flat / elapsed:5.2f}x"
+        )
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
@@ -0,0 +1,46 @@
+"""Overlapping window reads from a zarr store with and without chunk cache.
+
+Usage: python benchmarks/bench_zarr_cache.py [size] [window] [step]
+"""
+import sys
+import tempfile
+import time
+from os.path import join
+
+import numpy as np
+import zarr
+
+from cpr.zarr.ChunkCache import shared_chunk_cache
+from cpr.zarr.ZarrSource import ZarrSource
+
+
+def read_windows(data, size, window, step):
+    for y in range(0, size - window + 1, step):
+        for x in range(0, size - window + 1, step):
+            data[slice(y, y + window), slice(x, x + window)]
+
+
+def main(size=4096, window=512, step=256):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = join(tmp_dir, "bench.zarr")
+        group = zarr.open_group(path, mode="w")
+        array = group.create_array(
+            "0", shape=(size, size), chunks=(256, 256), dtype=np.uint16
+        )
+        array[...] = np.random.randint(0, 2**12, size=(size, size), dtype=np.uint16)
+
+        for name, kwargs in [
+            ("zarr array", {}),
+            ("lazy, no prefetch", {"lazy": True, "prefetch": False}),
+            ("lazy, prefetch", {"lazy": True, "prefetch": True}),
+        ]:
+            shared_chunk_cache(2**28).clear()
+            data = ZarrSource.from_path(path, group="0", **kwargs).get_data()
+            start = time.perf_counter()
+            read_windows(data, size, window, step)
+            elapsed = time.perf_counter() - start
+            print(f"{name:18s}: {elapsed:7.3f} s")
+
+
+if __name__ == "__main__":
+    main(*[int(v) for v in sys.argv[1:]])
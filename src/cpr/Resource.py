@@ -1,6 +1,16 @@
 from abc import ABC
-from os.path import exists, join, split, splitext
-from typing import Any
+from collections import defaultdict
+from concurrent.futures import Future
+from os.path import basename, join, split, splitext
+from typing import TYPE_CHECKING, Any, Hashable, Iterable, List
+
+from cpr.utilities import filesystem, prefetch
+from cpr.utilities.aio import run_blocking
+
+if TYPE_CHECKING:
+    from fsspec.spec import AbstractFileSystem
+
+_TRANSIENT_ATTRIBUTES = ("_data", "_path_key", "_path", "_existing_path")
 
 
 class Resource(ABC):
@@ -10,6 +20,9 @@ class Resource(ABC):
     name: str
     ext: str
     _data: Any
+    _path_key: tuple = None
+    _path: str = None
+    _existing_path: str = None
 
     def __init__(self, location: str, name: str, ext: str, **kwargs):
         """
@@ -30,13 +43,15 @@ class Resource(ABC):
         super(Resource, self).__init__(**kwargs)
 
     @classmethod
-    def from_path(cls, path: str):
+    def from_path(cls, path: str, **kwargs):
         """Create new instance form file-path.
 
         Parameters
         ----------
         path
             Path to the file
+        kwargs
+            Passed on to the constructor
 
         Returns
         -------
@@ -44,18 +59,71 @@ class Resource(ABC):
         """
         location, file_name = split(path)
         name, ext = splitext(file_name)
-        return cls(location=location, name=name, ext=ext)
+        return cls(location=location, name=name, ext=ext, **kwargs)
 
     def get_data(self, cache=False):
         """Access the data."""
-        assert exists(self.get_path()), (
-            f"Result does not exist at " f"{self.get_path()}."
-        )
+        assert self.exists(), f"Result does not exist at " f"{self.get_path()}."
         if cache:
-            self._data = self._read_data()
+            self._data = self._load()
             return self._data
         else:
-            return self._read_data()
+            return self._load()
+
+    def prefetch_data(self) -> Future:
+        """Start loading the data in the background.
+
+        The data is read in the executor shared by all asynchronous cpr
+        calls and kept in an in-process cache, keyed by file-path and data
+        version. The next `get_data()` of an equal Resource takes the data
+        from this cache, or waits for the running read, instead of reading
+        it again.
+
+        Returns
+        -------
+        Future of the data
+        """
+        assert self.exists(), f"Result does not exist at " f"{self.get_path()}."
+        return prefetch.submit(self._prefetch_key(), self._read_data)
+
+    def _version(self) -> Hashable:
+        """Identify the current version of the data."""
+        return filesystem.version(self.get_path())
+
+    def _prefetch_key(self) -> Hashable:
+        state = {k: v for k, v in vars(self).items() if k not in _TRANSIENT_ATTRIBUTES}
+        return (
+            type(self).__qualname__,
+            self.get_path(),
+            self._version(),
+            repr(state),
+        )
+
+    def _load(self):
+        """Take prefetched data or read it."""
+        future = None
+        if prefetch.has_prefetched():
+            future = prefetch.take(self._prefetch_key())
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                # Read again to raise the error in the calling thread.
+                pass
+        return self._read_data()
+
+    async def aget_data(self, **kwargs):
+        """Access the data without blocking the event loop.
+
+        The data is read in the executor shared by all asynchronous cpr
+        calls, see `cpr.utilities.aio.configure`.
+
+        Parameters
+        ----------
+        kwargs
+            Passed on to `get_data`, e.g. `cache`
+        """
+        return await run_blocking(self.get_data, **kwargs)
 
     def _read_data(self):
         ...
@@ -77,6 +145,36 @@ class Resource(ABC):
             "ext": self.ext,
         }
 
+    def exists(self) -> bool:
+        """Check if the data exists in storage.
+
+        A positive result is cached per instance and path, such that
+        repeated checks do not stat the file again.
+
+        Returns
+        -------
+        True if get_path() exists
+        """
+        path = self.get_path()
+        if self._existing_path != path:
+            if not filesystem.exists(path):
+                return False
+            self._existing_path = path
+        return True
+
+    def get_filesystem(self) -> "AbstractFileSystem":
+        """Get the pooled filesystem of the location.
+
+        Locations are local paths or URLs of any fsspec protocol, e.g.
+        "s3://bucket/results". Storage options are set per protocol with
+        `cpr.utilities.filesystem.configure_filesystem`.
+
+        Returns
+        -------
+        fsspec filesystem
+        """
+        return filesystem.get_filesystem(filesystem.get_protocol(self.location))
+
     def get_path(self) -> str:
         """Get full file-path.
 
@@ -84,4 +182,43 @@ class Resource(ABC):
         -------
         location/name.ext
         """
-        return join(self.location, f"{self.name}{self.ext}")
+        key = (self.location, self.name, self.ext)
+        if self._path_key != key:
+            self._path = join(self.location, f"{self.name}{self.ext}")
+            self._path_key = key
+        return self._path
+
+
+def check_exists(resources: Iterable[Resource], min_batch: int = 16) -> List[bool]:
+    """Check if the data of many Resources exists.
+
+    Locations holding at least `min_batch` of the Resources are listed
+    once, instead of checking every file-path on its own. The results are
+    cached by every Resource, see `Resource.exists`.
+
+    Parameters
+    ----------
+    resources
+        Resources to check
+    min_batch
+        Minimum number of Resources per location to list it, by default 16
+
+    Returns
+    -------
+    Existence of every Resource in the same order
+    """
+    resources = list(resources)
+    by_location = defaultdict(list)
+    for r in resources:
+        by_location[r.location].append(r)
+    listed = {}
+    for location, group in by_location.items():
+        if len(group) < min_batch:
+            continue
+        names = filesystem.list_names(location)
+        for r in group:
+            path = r.get_path()
+            listed[id(r)] = basename(path) in names
+            if listed[id(r)]:
+                r._existing_path = path
+    return [listed[id(r)] if id(r) in listed else r.exists() for r in resources]
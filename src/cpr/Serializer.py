@@ -1,13 +1,58 @@
-from typing import Any
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+from typing import Any, Iterable, List, Optional
 
 from prefect.serializers import (
     JSONSerializer,
     prefect_json_object_decoder,
     prefect_json_object_encoder,
 )
-from prefect.utilities.importtools import from_qualified_name, to_qualified_name
+from prefect.utilities.importtools import from_qualified_name
+from pydantic import Field, model_serializer
 
-from cpr.Resource import Resource
+from cpr.Resource import Resource, check_exists
+from cpr.Target import Target
+from cpr.utilities.imports import qualified_name, resolve_class
+from cpr.utilities.release import deferred_collection
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetimes and dataclasses are passed on to the object encoder and
+# non-str dict keys are converted to strings, as with the json module.
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+def _orjson_equivalent(obj: Any) -> bool:
+    """Check if orjson encodes an object like the json module.
+
+    orjson encodes non-finite floats as null and passes namedtuples to the
+    object encoder, whereas the json module writes NaN and Infinity and
+    encodes namedtuples as lists.
+    """
+    stack = [obj]
+    while len(stack) > 0:
+        o = stack.pop()
+        if isinstance(o, float):
+            if not math.isfinite(o):
+                return False
+        elif isinstance(o, dict):
+            stack.extend(o.values())
+        elif isinstance(o, tuple) and type(o) is not tuple:
+            return False
+        elif isinstance(o, (list, tuple)):
+            stack.extend(o)
+    return True
 
 
 def target_encoder(obj: Any) -> Any:
@@ -18,7 +63,7 @@ def target_encoder(obj: Any) -> Any:
     """
     if isinstance(obj, Resource):
         return {
-            "__class__": to_qualified_name(obj.__class__),
+            "__class__": qualified_name(obj.__class__),
             "data": obj.serialize(),
         }
     else:
@@ -33,7 +78,7 @@ def target_decoder(result: dict):
     """
     if "__class__" in result:
         if result["__class__"].startswith("cpr."):
-            clazz = from_qualified_name(result["__class__"])
+            clazz = resolve_class(result["__class__"])
             return clazz(**result["data"])
         else:
             return prefect_json_object_decoder(result)
@@ -41,10 +86,165 @@ def target_decoder(result: dict):
     return result
 
 
-def cpr_serializer(dumps_kwargs={}) -> JSONSerializer:
-    """JSONSerializer configured to work with cpr objects."""
-    return JSONSerializer(
+def find_targets(obj: Any, cls: type = Target) -> List[Target]:
+    """Find all Targets in lists, tuples, sets and dicts of an object.
+
+    Parameters
+    ----------
+    obj
+        Object to search, e.g. a task result
+    cls
+        Type to search for, by default Target
+
+    Returns
+    -------
+    Targets in order of occurrence, each Target only once
+    """
+    targets, seen, stack = [], set(), [obj]
+    while len(stack) > 0:
+        o = stack.pop()
+        if isinstance(o, cls):
+            if id(o) not in seen:
+                seen.add(id(o))
+                targets.append(o)
+        elif isinstance(o, dict):
+            stack.extend(reversed(list(o.values())))
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(reversed(list(o)))
+    return targets
+
+
+def persist_targets(targets: Iterable[Target], max_workers: int = None):
+    """Persist the data of many Targets concurrently.
+
+    The hash and write work of every Target runs in a thread pool. The
+    garbage collection of released data is deferred until all Targets are
+    persisted.
+
+    Parameters
+    ----------
+    targets
+        Targets to persist
+    max_workers
+        Number of threads, by default the number of CPUs
+    """
+    targets = [t for t in targets if t._data is not None]
+    if len(targets) == 0:
+        return
+    max_workers = min(len(targets), max_workers or cpu_count() or 1)
+    with deferred_collection():
+        if max_workers == 1:
+            for t in targets:
+                t.persist()
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                list(pool.map(Target.persist, targets))
+
+
+class CPRSerializer(JSONSerializer):
+    """JSONSerializer which persists all Targets of an object in parallel.
+
+    Before the object is encoded, all Targets contained in lists, tuples,
+    sets and dicts are persisted by `persist_targets`. The JSON is the same
+    as the one produced by a JSONSerializer with `target_encoder`.
+    Decoding does not touch storage. With `check_existence` the existence
+    of all decoded Resources is checked with `check_exists`, which lists
+    every location holding many of them once.
+
+    With `jsonlib="orjson"` results are encoded with orjson, if it is
+    installed. Results holding non-finite floats, namedtuples or integers
+    beyond 64 bit, or serializers with `dumps_kwargs`, fall back to the
+    json module. Otherwise the JSON equals the one of the json module,
+    apart from UUIDs and enums, which orjson encodes as plain strings and
+    values, which are then also decoded as such.
+
+    Result records store this serializer as a plain JSONSerializer with
+    `target_decoder`, such that results can be read by any process,
+    including processes which did not import cpr.
+    """
+
+    type: str = Field(default="cpr-json", frozen=True)
+    object_encoder: Optional[str] = "cpr.Serializer.target_encoder"
+    object_decoder: Optional[str] = "cpr.Serializer.target_decoder"
+    max_workers: Optional[int] = None
+    check_existence: bool = False
+
+    @model_serializer(mode="wrap")
+    def _serialize_as_json(self, handler) -> dict:
+        # The results are standard JSON, which prefect decodes with
+        # object_hook only with the json module.
+        d = handler(self)
+        d["type"] = "json"
+        d["jsonlib"] = "json"
+        d.pop("max_workers", None)
+        d.pop("check_existence", None)
+        return d
+
+    def dumps(self, obj: Any) -> bytes:
+        with deferred_collection():
+            persist_targets(find_targets(obj), max_workers=self.max_workers)
+            if self.jsonlib != "orjson":
+                return super(CPRSerializer, self).dumps(obj)
+
+            default = None
+            if self.object_encoder:
+                default = from_qualified_name(self.object_encoder)
+            if (
+                orjson is not None
+                and len(self.dumps_kwargs) == 0
+                and _orjson_equivalent(obj)
+            ):
+                try:
+                    return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS)
+                except orjson.JSONEncodeError:
+                    # e.g. integers beyond 64 bit, which the json module
+                    # encodes.
+                    pass
+            return json.dumps(obj, default=default, **self.dumps_kwargs).encode()
+
+    def loads(self, blob: bytes) -> Any:
+        if self.jsonlib == "orjson":
+            # orjson has no object hook, but writes standard JSON.
+            kwargs = self.loads_kwargs.copy()
+            if self.object_decoder:
+                kwargs["object_hook"] = from_qualified_name(self.object_decoder)
+            obj = json.loads(blob.decode(), **kwargs)
+        else:
+            obj = super(CPRSerializer, self).loads(blob)
+        if self.check_existence:
+            # Check all Resources with one directory listing per location.
+            check_exists(find_targets(obj, cls=Resource))
+        return obj
+
+
+def cpr_serializer(
+    dumps_kwargs={},
+    max_workers: int = None,
+    jsonlib: str = "json",
+    check_existence: bool = False,
+) -> JSONSerializer:
+    """JSONSerializer configured to work with cpr objects.
+
+    Parameters
+    ----------
+    dumps_kwargs
+        Passed on to json.dumps
+    max_workers
+        Number of threads used to persist Targets, by default the number
+        of CPUs
+    jsonlib
+        Either "json" or "orjson", by default "json". orjson is only used
+        if it is installed, `dumps_kwargs` is empty and the result holds
+        no values which orjson encodes differently, see CPRSerializer.
+    check_existence
+        Check the existence of all decoded Resources at once, by default
+        False i.e. existence is checked on first access
+    """
+    return CPRSerializer(
         object_encoder="cpr.Serializer.target_encoder",
         object_decoder="cpr.Serializer.target_decoder",
         dumps_kwargs=dumps_kwargs,
+        max_workers=max_workers,
+        jsonlib=jsonlib,
+        check_existence=check_existence,
     )
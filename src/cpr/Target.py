@@ -1,7 +1,14 @@
-import gc
-from os.path import join
+from os.path import dirname, join
+from typing import Dict
+from uuid import uuid4
 
 from cpr.Resource import Resource
+from cpr.utilities.aio import run_blocking
+from cpr.utilities.filesystem import exists, is_local, makedirs, move, remove
+from cpr.utilities.hashing import HASH_MODES
+from cpr.utilities.release import collect_released
+from cpr.utilities.store import blob_path, link_blob
+from cpr.utilities.verification import VERIFY_POLICIES, is_verified, mark_verified
 
 
 class Target(Resource):
@@ -12,9 +19,20 @@ class Target(Resource):
     """
 
     data_hash: str
+    hash_mode: str
+    verify: str
+    store: str
 
     def __init__(
-        self, location: str, name: str, ext: str, data_hash: str = None, **kwargs
+        self,
+        location: str,
+        name: str,
+        ext: str,
+        data_hash: str = None,
+        hash_mode: str = "flat",
+        verify: str = "always",
+        store: str = None,
+        **kwargs,
     ):
         """
         Parameters
@@ -27,10 +45,35 @@ class Target(Resource):
             File extension of the data
         data_hash
             Data hash, by default None
+        hash_mode
+            How the data_hash is computed. "flat" hashes the data
+            sequentially, "tree" hashes blocks of the data in parallel. By
+            default "flat"
+        verify
+            When the data_hash of loaded data is verified. "always" hashes
+            the data on every read, "cached" skips hashing if the file has
+            not changed since its last successful verification and "never"
+            skips hashing. By default "always"
+        store
+            Root directory of a content-addressed store. If given, the data
+            is stored once at store/hash[:2]/hash.ext and linked to
+            location/name-hash.ext. Identical data of all Targets using the
+            same store shares one file. By default None
         """
+        assert hash_mode in HASH_MODES, f"`hash_mode` must be one of {HASH_MODES}."
+        assert verify in VERIFY_POLICIES, f"`verify` must be one of {VERIFY_POLICIES}."
+        assert store is None or (
+            is_local(store) and is_local(location)
+        ), "A content-addressed `store` requires local paths."
         self.data_hash = data_hash
+        self.hash_mode = hash_mode
+        self.verify = verify
+        self.store = store
         super(Target, self).__init__(location=location, name=name, ext=ext, **kwargs)
 
+    def _version(self) -> str:
+        return self.data_hash
+
     def compute_data_hash(self):
         """Compute and set current data_hash."""
         if self._data is not None:
@@ -49,20 +92,167 @@ class Target(Resource):
     def _hash_data(self, data) -> str:
         ...
 
-    def _write_data(self):
+    def _verify(self, data):
+        """Compare the hash of loaded data to data_hash.
+
+        Depending on the `verify` policy the comparison is skipped.
+
+        Parameters
+        ----------
+        data
+            Data loaded from get_path()
+        """
+        if self.verify == "never":
+            return
+        # Verification sidecars are only kept for local files.
+        cached = self.verify == "cached" and is_local(self.get_path())
+        if cached and is_verified(self.get_path(), self.data_hash):
+            return
+
+        assert self._hash_data(data) == self.data_hash, (
+            "Loaded data has a different hash. This data is either "
+            "from a different run or corrupted."
+        )
+        if cached:
+            mark_verified(self.get_path(), self.data_hash)
+
+    def _write_hashed(self, path: str) -> str:
+        """Write data to path and return its data_hash.
+
+        Implementations should hash the data while it is written, such
+        that every byte is only read once.
+
+        Parameters
+        ----------
+        path
+            Temporary file-path to write to
+
+        Returns
+        -------
+        data_hash of the written data
+        """
         ...
 
+    def _write_atomic(self, directory: str, get_final_path):
+        """Write data to a temporary file in `directory` and rename it to
+        `get_final_path()` or discard it, if the final file exists already
+        or is created by a concurrent writer during the rename.
+        """
+        tmp_path = join(directory, f".{self.name}-{uuid4().hex}{self.ext}")
+        try:
+            self.data_hash = self._write_hashed(tmp_path)
+            if exists(get_final_path()):
+                remove(tmp_path)
+            else:
+                try:
+                    move(tmp_path, get_final_path())
+                except OSError:
+                    # A concurrent writer of the same data renamed its
+                    # directory first, e.g. "Directory not empty".
+                    if not exists(get_final_path()):
+                        raise
+                    remove(tmp_path)
+        except BaseException:
+            if exists(tmp_path):
+                remove(tmp_path)
+            raise
+
+    def _write_data(self):
+        """Write data and set data_hash in a single pass.
+
+        The data is written to a temporary file next to the final
+        file-path, which is only known once the data_hash is computed. The
+        temporary file is then atomically renamed to the final file-path or
+        discarded, if the final file-path exists already. Targets which
+        persist a directory e.g. a zarr store are handled the same way.
+
+        With a content-addressed `store` the data_hash is computed first,
+        such that data which is already in the store is not written again.
+        """
+        if self._data is None:
+            return
+
+        if self.store is None:
+            self._write_atomic(self.location, self.get_path)
+        else:
+            self.data_hash = self._hash_data(self._data)
+            if not exists(self.get_blob_path()):
+                makedirs(dirname(self.get_blob_path()))
+                self._write_atomic(dirname(self.get_blob_path()), self.get_blob_path)
+            link_blob(self.get_blob_path(), self.get_path())
+        self._existing_path = self.get_path()
+
+    def release(self) -> bool:
+        """Release the reference to the data.
+
+        The garbage collector runs according to the policy set with
+        `cpr.utilities.release.set_gc_policy`.
+
+        Returns
+        -------
+        True if data was released, False if there was no data
+        """
+        if self._data is None:
+            return False
+        self._data = None
+        collect_released()
+        return True
+
+    def persist(self) -> bool:
+        """Persist data and release the reference to it.
+
+        Returns
+        -------
+        True if data was persisted, False if there was no data to persist
+        """
+        if self._data is None:
+            return False
+        self._write_data()
+        return self.release()
+
     def serialize(self):
         """Persist data and serialize to JSON serializable dict."""
-        self.compute_data_hash()
-        self._write_data()
-        del self._data
-        gc.collect()
-        self._data = None
+        self.persist()
         d = super(Target, self).serialize()
         d["data_hash"] = self.data_hash
+        if self.hash_mode != "flat":
+            d["hash_mode"] = self.hash_mode
+        if self.verify != "always":
+            d["verify"] = self.verify
+        if self.store is not None:
+            d["store"] = self.store
         return d
 
+    async def aserialize(self):
+        """Persist data in the shared executor and serialize to JSON
+        serializable dict."""
+        return await run_blocking(self.serialize)
+
+    def _write_options(self) -> Dict:
+        """Get the options which change the written file other than the
+        data, e.g. compression or metadata.
+
+        Targets with the same data but different options do not share a
+        blob in the content-addressed store.
+        """
+        return {}
+
+    def get_blob_path(self) -> str:
+        """Get the file-path of the data in the content-addressed store.
+
+        Returns
+        -------
+        store/data_hash[:2]/data_hash.ext, with a digest of the write
+        options appended to data_hash if there are any
+        """
+        assert self.store is not None, "Target has no content-addressed store."
+        assert (
+            self.data_hash is not None
+        ), "Data hash is None. Please call set_data first."
+        return blob_path(
+            self.store, self.data_hash, self.ext, options=self._write_options()
+        )
+
     def get_path(self):
         """Get unique file-path.
 
@@ -77,4 +267,8 @@ class Target(Resource):
         assert (
             self.data_hash is not None
         ), "Data hash is None. Please call set_data first."
-        return join(self.location, f"{self.name}-{self.data_hash}{self.ext}")
+        key = (self.location, self.name, self.ext, self.data_hash)
+        if self._path_key != key:
+            self._path = join(self.location, f"{self.name}-{self.data_hash}{self.ext}")
+            self._path_key = key
+        return self._path
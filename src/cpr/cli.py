@@ -0,0 +1,120 @@
+import argparse
+import re
+import sys
+from typing import List
+
+from cpr.storage.StorageIndex import EVICTION_POLICIES, StorageIndex
+
+_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+
+
+def parse_size(size: str) -> int:
+    """Parse a size like "500G" or "1.5T" into bytes."""
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([KMGT]?)I?B?\s*", size.upper())
+    assert match is not None, f"Invalid size {size!r}."
+    return int(float(match[1]) * _UNITS[match[2]])
+
+
+def format_size(size: int) -> str:
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def _build_index(args) -> StorageIndex:
+    return StorageIndex.build(
+        args.locations, results=args.results or [], max_workers=args.workers
+    )
+
+
+def du(args):
+    """Report size per location and name prefix."""
+    index = _build_index(args)
+    report = index.report()
+    print(f"{'files':>8} {'size':>12} {'orphaned':>12}  location/name")
+    for (location, name), s in sorted(report.items()):
+        print(
+            f"{s['files']:8d} {format_size(s['size']):>12} "
+            f"{format_size(s['orphaned']):>12}  {location}/{name}"
+        )
+    orphaned = sum(s["orphaned"] for s in report.values())
+    print(
+        f"{len(index.entries):8d} {format_size(index.total_size()):>12} "
+        f"{format_size(orphaned):>12}  total"
+    )
+
+
+def gc(args):
+    """Evict orphaned files under a disk budget."""
+    index = _build_index(args)
+    plan = index.plan_eviction(
+        budget=parse_size(args.budget) if args.budget else None,
+        max_age=args.max_age * 86400 if args.max_age is not None else None,
+        policy=args.policy,
+        min_age=args.older_than * 86400,
+    )
+    dry_run = not args.delete
+    for entry in plan:
+        print(f"{'would evict' if dry_run else 'evict'} {entry.path}")
+    freed = sum(e.size for e in plan) if dry_run else index.evict(plan)
+    print(
+        f"{'Would free' if dry_run else 'Freed'} {format_size(freed)} "
+        f"in {len(plan)} files."
+    )
+    if dry_run and len(plan) > 0:
+        print("Nothing was removed, pass --delete to evict these files.")
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(
+        prog="cpr", description="Manage files persisted by cpr Targets."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, fn in [("du", du), ("gc", gc)]:
+        command = commands.add_parser(name, help=fn.__doc__)
+        command.set_defaults(fn=fn)
+        command.add_argument("locations", nargs="+", help="Target locations")
+        command.add_argument(
+            "--results",
+            action="append",
+            help="File or directory with serialized results, can be repeated",
+        )
+        command.add_argument(
+            "--workers", type=int, default=8, help="Directories scanned in parallel"
+        )
+    gc_command = commands.choices["gc"]
+    gc_command.add_argument("--budget", help="Disk budget, e.g. 500G")
+    gc_command.add_argument(
+        "--max-age", type=float, help="Evict orphans older than this many days"
+    )
+    gc_command.add_argument(
+        "--older-than",
+        type=float,
+        required=True,
+        help="Only evict orphans not modified for this many days, younger "
+        "files may belong to runs in flight or to results which were not "
+        "scanned",
+    )
+    gc_command.add_argument("--policy", choices=EVICTION_POLICIES, default="lru")
+    delete = gc_command.add_mutually_exclusive_group()
+    delete.add_argument(
+        "--delete",
+        action="store_true",
+        help="Evict the files, by default " "only what would be evicted is printed",
+    )
+    delete.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print what would be " "evicted, the default",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "gc" and not args.results:
+        parser.error("gc requires --results, otherwise every file is orphaned.")
+    args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+import inspect
+import json
+from os.path import commonprefix
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List
+
+from cpr.collection.ResourceSequence import MANIFEST_KEY, ResourceSequence
+from cpr.Resource import Resource
+from cpr.Target import Target
+from cpr.utilities.filesystem import open_file
+from cpr.utilities.hashing import StreamHasher
+from cpr.utilities.imports import qualified_name
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+MANIFEST_VERSION = 1
+
+
+def _column_type(values: List[Any]):
+    """Get the arrow type of a column or None, if it is stored as JSON."""
+    import pyarrow as pa
+
+    present = [v for v in values if v is not None]
+    for types, arrow_type in [
+        ((bool,), pa.bool_()),
+        ((int,), pa.int64()),
+        ((float,), pa.float64()),
+        ((str,), pa.string()),
+    ]:
+        if all(type(v) in types for v in present):
+            return arrow_type
+    return None
+
+
+def _reference(resource: Resource) -> Dict[str, Any]:
+    """Serialize a Resource without persisting the data of a Target.
+
+    The data_hash of a Target with data is computed, such that the
+    reference equals the one returned by serialize() after persisting.
+    """
+    if not isinstance(resource, Target) or resource._data is None:
+        return resource.serialize()
+    resource.compute_data_hash()
+    data, resource._data = resource._data, None
+    try:
+        return resource.serialize()
+    finally:
+        resource._data = data
+
+
+def _default(cls: type, key: str) -> Any:
+    """Get the default of an __init__ parameter of cls or its bases."""
+    for base in cls.__mro__:
+        if "__init__" not in vars(base):
+            continue
+        parameter = inspect.signature(base.__init__).parameters.get(key)
+        if parameter is not None and parameter.default is not parameter.empty:
+            return parameter.default
+    raise AssertionError(f"All Resources must serialize '{key}'.")
+
+
+def encode_manifest(resources: List[Resource], persist: bool = True) -> "pa.Table":
+    """Encode Resources of the same class as columnar manifest.
+
+    Values shared by all Resources are stored once in the metadata. Of
+    every varying string column the common prefix is stored once in the
+    metadata and the remaining suffixes are dictionary encoded. Values
+    which are not scalars, e.g. metadata dicts, are dictionary encoded as
+    JSON strings. Keys a Resource omits at their default are filled in
+    with the default of the respective __init__ parameter.
+
+    Parameters
+    ----------
+    resources
+        Resources of the same class
+    persist
+        Persist the data of Targets while they are serialized, by default
+        True. Otherwise the manifest only references their data_hash.
+
+    Returns
+    -------
+    Manifest table
+    """
+    import pyarrow as pa
+
+    classes = {type(r) for r in resources}
+    assert len(classes) == 1, "All Resources must be of the same class."
+    dicts = [r.serialize() if persist else _reference(r) for r in resources]
+    keys = list(dict.fromkeys(k for d in dicts for k in d))
+    cls = next(iter(classes))
+    for d in dicts:
+        for key in keys:
+            if key not in d:
+                d[key] = _default(cls, key)
+
+    constants, prefixes, json_columns, columns = {}, {}, [], {}
+    for key in keys:
+        values = [d[key] for d in dicts]
+        if all(v == values[0] for v in values):
+            constants[key] = values[0]
+            continue
+
+        arrow_type = _column_type(values)
+        if arrow_type is None:
+            json_columns.append(key)
+            values = [None if v is None else json.dumps(v) for v in values]
+            arrow_type = pa.string()
+        elif arrow_type == pa.string():
+            prefix = commonprefix([v for v in values if v is not None])
+            if len(prefix) > 0:
+                prefixes[key] = prefix
+                n = len(prefix)
+                values = [None if v is None else v[n:] for v in values]
+
+        column = pa.array(values, type=arrow_type)
+        if arrow_type == pa.string():
+            column = column.dictionary_encode()
+        columns[key] = column
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "class": qualified_name(classes.pop()),
+        "length": len(dicts),
+        "keys": keys,
+        "constants": constants,
+        "prefixes": prefixes,
+        "json_columns": json_columns,
+    }
+    schema = pa.schema(
+        [pa.field(k, c.type) for k, c in columns.items()],
+        metadata={MANIFEST_KEY: json.dumps(manifest)},
+    )
+    return pa.Table.from_arrays(list(columns.values()), schema=schema)
+
+
+class ResourceCollection(Target):
+    """Persists a large collection of Resources of the same class as
+    compact binary manifest.
+
+    With set_data a list of Resources can be provided. When serialize() is
+    called the Resources are serialized and stored column-wise in an Arrow
+    IPC file at location/name-{data_hash}.arrow. Only the reference to
+    this file ends up in the task result.
+
+    When get_data() is called the manifest is loaded and a
+    ResourceSequence is returned, which creates the Resources only on
+    access.
+    """
+
+    def __init__(
+        self,
+        location: str,
+        name: str,
+        ext: str = ".arrow",
+        data_hash: str = None,
+        hash_mode: str = "flat",
+        verify: str = "always",
+        store: str = None,
+    ):
+        """
+        Parameters
+        ----------
+        location
+            Where the manifest file is stored
+        name
+            Name of the manifest file
+        ext
+            File extension, must be .arrow
+        data_hash
+            Manifest hash, by default None
+        hash_mode
+            Either "flat" or "tree", by default "flat"
+        verify
+            Either "always", "cached" or "never", by default "always"
+        store
+            Root directory of a content-addressed store shared by Targets,
+            by default None
+        """
+        assert ext == ".arrow", "Extension must be .arrow."
+        super(ResourceCollection, self).__init__(
+            location=location,
+            name=name,
+            ext=ext,
+            data_hash=data_hash,
+            hash_mode=hash_mode,
+            verify=verify,
+            store=store,
+        )
+
+    def set_data(self, resources: Iterable[Resource]):
+        """Set the Resources of this collection.
+
+        Parameters
+        ----------
+        resources
+            Resources of the same class. Targets are persisted with the
+            collection.
+        """
+        resources = list(resources)
+        assert len(resources) > 0, "A ResourceCollection must not be empty."
+        self._data = resources
+
+    @staticmethod
+    def _encode(resources: List[Resource], persist: bool = True) -> "pa.Buffer":
+        import pyarrow as pa
+
+        table = encode_manifest(resources, persist=persist)
+        compression = "zstd" if pa.Codec.is_available("zstd") else None
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+
+    def _hash_data(self, data) -> str:
+        """Hash the encoded manifest of a list of Resources or the
+        manifest bytes read from storage.
+
+        Targets in the list are not persisted, their manifest references
+        are computed from their data_hash.
+        """
+        if isinstance(data, list):
+            data = self._encode(data, persist=False)
+        hasher = StreamHasher(hash_mode=self.hash_mode)
+        hasher.update(data)
+        return hasher.hexdigest()
+
+    def _write_hashed(self, path: str) -> str:
+        buffer = self._encode(self._data)
+        with open_file(path, "wb") as f:
+            f.write(buffer)
+        return self._hash_data(buffer)
+
+    def _read_data(self) -> ResourceSequence:
+        import pyarrow as pa
+
+        with open_file(self.get_path()) as f:
+            buffer = f.read()
+        self._verify(buffer)
+        table = pa.ipc.open_file(pa.py_buffer(buffer)).read_all()
+        return ResourceSequence(table)
@@ -0,0 +1,115 @@
+import json
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List
+
+from cpr.Resource import Resource
+from cpr.utilities.imports import resolve_class
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+MANIFEST_KEY = b"cpr"
+
+
+class ResourceSequence(Sequence):
+    """Read-only sequence of Resources backed by a columnar manifest.
+
+    Resources are only created on access. Values shared by all Resources
+    are stored once in the manifest metadata, varying values are stored
+    as columns, see `ResourceCollection`.
+    """
+
+    def __init__(self, table: "pa.Table"):
+        """
+        Parameters
+        ----------
+        table
+            Manifest table with cpr metadata
+        """
+        manifest = json.loads(table.schema.metadata[MANIFEST_KEY])
+        self.table = table
+        self.class_name = manifest["class"]
+        self._length = manifest["length"]
+        self._keys = manifest["keys"]
+        self._constants = manifest["constants"]
+        self._prefixes = manifest["prefixes"]
+        self._json_columns = set(manifest["json_columns"])
+        # Every Resource gets its own copy of shared containers. Flat
+        # containers are copied shallowly, nested ones decoded from JSON,
+        # which is faster than deepcopy.
+        self._shared_flat, self._shared_json = {}, {}
+        for k, v in self._constants.items():
+            if isinstance(v, (dict, list)):
+                values = v.values() if isinstance(v, dict) else v
+                if any(isinstance(x, (dict, list)) for x in values):
+                    self._shared_json[k] = json.dumps(v)
+                else:
+                    self._shared_flat[k] = v
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _value(self, key: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if key in self._json_columns:
+            return json.loads(value)
+        if key in self._prefixes:
+            return self._prefixes[key] + value
+        return value
+
+    def _constant(self, key: str) -> Any:
+        if key in self._shared_flat:
+            return self._shared_flat[key].copy()
+        if key in self._shared_json:
+            return json.loads(self._shared_json[key])
+        return self._constants[key]
+
+    def _row(self, index: int) -> Dict[str, Any]:
+        return {
+            key: (
+                self._constant(key)
+                if key in self._constants
+                else self._value(key, self.table.column(key)[index].as_py())
+            )
+            for key in self._keys
+        }
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ResourceSequence index out of range.")
+        return resolve_class(self.class_name)(**self._row(index))
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the serialized Resources without creating them.
+
+        Returns
+        -------
+        Iterator over dicts as created by `target_encoder`
+        """
+        columns = {
+            key: self.table.column(key).to_pylist()
+            for key in self._keys
+            if key not in self._constants
+        }
+        for index in range(len(self)):
+            data = {}
+            for key in self._keys:
+                if key in self._constants:
+                    data[key] = self._constant(key)
+                else:
+                    data[key] = self._value(key, columns[key][index])
+            yield {"__class__": self.class_name, "data": data}
+
+    def __iter__(self) -> Iterator[Resource]:
+        clazz = resolve_class(self.class_name)
+        for d in self.iter_dicts():
+            yield clazz(**d["data"])
+
+    def to_list(self) -> List[Resource]:
+        """Create all Resources."""
+        return list(self)
@@ -1,16 +1,28 @@
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, Iterator, List
 
 from cpr.Resource import Resource
+from cpr.utilities.filesystem import open_file
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class CSVSource(Resource):
-    """Provides access to a csv file."""
+    """Provides access to a csv file.
+
+    The first column of the csv file is used as index. If `usecols` is
+    given, only the index and these columns are parsed. Large files can be
+    processed with bounded memory by iterating over `iter_chunks()`.
+    """
 
     def __init__(
         self,
         location: str,
         name: str,
         ext: str = ".csv",
+        usecols: List[str] = None,
+        dtype: Dict[str, str] = None,
+        chunksize: int = 100_000,
     ):
         """
         Parameters
@@ -21,13 +33,68 @@ class CSVSource(Resource):
             Name of the csv file
         ext
             File extension, must be csv
+        usecols
+            Columns to read, by default None i.e. all columns
+        dtype
+            Column dtypes passed on to pandas.read_csv, by default None
+        chunksize
+            Number of rows per DataFrame yielded by iter_chunks(), by
+            default 100000
         """
         assert ext == ".csv", "Extension must be .csv."
+        self.usecols = usecols
+        self.dtype = dtype
+        self.chunksize = chunksize
         super(CSVSource, self).__init__(
             location=location,
             name=name,
             ext=ext,
         )
 
+    def _read_kwargs(self) -> Dict:
+        kwargs = {"index_col": 0, "dtype": self.dtype}
+        if self.usecols is not None:
+            import pandas as pd
+
+            with open_file(self.get_path()) as f:
+                index_name = pd.read_csv(f, nrows=0).columns[0]
+            kwargs["usecols"] = [index_name] + [
+                c for c in self.usecols if c != index_name
+            ]
+        return kwargs
+
     def _read_data(self):
-        return pd.read_csv(self.get_path(), index_col=0)
+        import pandas as pd
+
+        kwargs = self._read_kwargs()
+        with open_file(self.get_path()) as f:
+            return pd.read_csv(f, **kwargs)
+
+    def iter_chunks(self, chunksize: int = None) -> Iterator["pd.DataFrame"]:
+        """Iterate over the csv file in chunks of rows.
+
+        Parameters
+        ----------
+        chunksize
+            Number of rows per chunk, by default `self.chunksize`
+
+        Returns
+        -------
+        Iterator over DataFrames
+        """
+        import pandas as pd
+
+        assert self.exists(), f"Result does not exist at " f"{self.get_path()}."
+        kwargs = self._read_kwargs()
+        with open_file(self.get_path()) as f, pd.read_csv(
+            f, chunksize=chunksize or self.chunksize, **kwargs
+        ) as reader:
+            yield from reader
+
+    def serialize(self) -> Dict:
+        """Serialize to JSON serializable dict."""
+        d = super(CSVSource, self).serialize()
+        d["usecols"] = self.usecols
+        d["dtype"] = self.dtype
+        d["chunksize"] = self.chunksize
+        return d
@@ -1,10 +1,6 @@
-from os.path import exists
-
-import pandas as pd
-import xxhash
-from pandas.core.util.hashing import hash_pandas_object
-
 from cpr.Target import Target
+from cpr.utilities.filesystem import open_file
+from cpr.utilities.hashing import dataframe_hasher, hash_dataframe
 
 
 class CSVTarget(Target):
@@ -22,12 +18,17 @@ class CSVTarget(Target):
     hash_data is compared to the hash of the loaded data.
     """
 
+    CHUNK_ROWS = 100_000
+
     def __init__(
         self,
         location: str,
         name: str,
         ext: str = ".csv",
         data_hash: str = None,
+        hash_mode: str = "flat",
+        verify: str = "always",
+        store: str = None,
     ):
         """
         Parameters
@@ -40,6 +41,13 @@ class CSVTarget(Target):
             File extension, must be csv
         data_hash
             DataFrame hash, by default None
+        hash_mode
+            Either "flat" or "tree", by default "flat"
+        verify
+            Either "always", "cached" or "never", by default "always"
+        store
+            Root directory of a content-addressed store shared by Targets,
+            by default None
         """
         assert ext == ".csv", "Extension must be .csv."
         super(CSVTarget, self).__init__(
@@ -47,19 +55,31 @@ class CSVTarget(Target):
             name=name,
             ext=ext,
             data_hash=data_hash,
+            hash_mode=hash_mode,
+            verify=verify,
+            store=store,
         )
 
     def _read_data(self):
-        data = pd.read_csv(self.get_path(), index_col=0)
-        assert self._hash_data(data) == self.data_hash, (
-            "Loaded csv has a different hash. This data is either "
-            "from a different run or corrupted."
-        )
+        import pandas as pd
+
+        with open_file(self.get_path()) as f:
+            data = pd.read_csv(f, index_col=0)
+        self._verify(data)
         return data
 
     def _hash_data(self, a):
-        return xxhash.xxh3_64(hash_pandas_object(a).values.tobytes()).hexdigest()
+        # CSV does not store dtypes, which are hence not part of the hash.
+        return hash_dataframe(a, hash_mode=self.hash_mode, dtypes=False)
+
+    def _write_hashed(self, path: str) -> str:
+        from pandas.util import hash_pandas_object
 
-    def _write_data(self):
-        if self._data is not None and not exists(self.get_path()):
-            self._data.to_csv(self.get_path(), mode="w")
+        hasher = dataframe_hasher(self._data, hash_mode=self.hash_mode, dtypes=False)
+        with open_file(path, mode="w", newline="") as f:
+            for start in range(0, max(1, len(self._data)), self.CHUNK_ROWS):
+                end = start + self.CHUNK_ROWS
+                chunk = self._data.iloc[start:end]
+                chunk.to_csv(f, header=start == 0)
+                hasher.update(hash_pandas_object(chunk).values)
+        return hasher.hexdigest()
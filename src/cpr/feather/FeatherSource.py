@@ -0,0 +1,47 @@
+from typing import Dict, List
+
+from cpr.Resource import Resource
+from cpr.utilities.filesystem import open_file
+
+
+class FeatherSource(Resource):
+    """Provides access to a feather file."""
+
+    def __init__(
+        self,
+        location: str,
+        name: str,
+        ext: str = ".feather",
+        columns: List[str] = None,
+    ):
+        """
+        Parameters
+        ----------
+        location
+            Where the feather file is stored
+        name
+            Name of the feather file
+        ext
+            File extension, must be .feather
+        columns
+            Columns to read, by default None i.e. all columns
+        """
+        assert ext == ".feather", "Extension must be .feather."
+        self.columns = columns
+        super(FeatherSource, self).__init__(
+            location=location,
+            name=name,
+            ext=ext,
+        )
+
+    def _read_data(self):
+        import pandas as pd
+
+        with open_file(self.get_path()) as f:
+            return pd.read_feather(f, columns=self.columns)
+
+    def serialize(self) -> Dict:
+        """Serialize to JSON serializable dict."""
+        d = super(FeatherSource, self).serialize()
+        d["columns"] = self.columns
+        return d
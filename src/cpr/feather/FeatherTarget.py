@@ -0,0 +1,76 @@
+from cpr.Target import Target
+from cpr.utilities.filesystem import open_file
+from cpr.utilities.hashing import hash_dataframe
+
+
+class FeatherTarget(Target):
+    """Persists tabular data to feather and serializes a JSON serializable
+    dictionary.
+
+    A FeatherTarget must have a file-location, -name and -extension
+    (extension must be feather). With set_data a pandas.DataFrame can be
+    provided. In contrast to CSVTarget the dtypes of the DataFrame are
+    preserved.
+
+    When serialize() is called on a FeatherTarget the DataFrame is saved as
+    feather to location/name-{data_hash}.ext.
+
+    When get_data() is called the data is retrieved from its location and
+    hash_data is compared to the hash of the loaded data.
+    """
+
+    def __init__(
+        self,
+        location: str,
+        name: str,
+        ext: str = ".feather",
+        data_hash: str = None,
+        hash_mode: str = "flat",
+        verify: str = "always",
+        store: str = None,
+    ):
+        """
+        Parameters
+        ----------
+        location
+            Where the feather file is stored
+        name
+            Name of the feather file
+        ext
+            File extension, must be .feather
+        data_hash
+            DataFrame hash, by default None
+        hash_mode
+            Either "flat" or "tree", by default "flat"
+        verify
+            Either "always", "cached" or "never", by default "always"
+        store
+            Root directory of a content-addressed store shared by Targets,
+            by default None
+        """
+        assert ext == ".feather", "Extension must be .feather."
+        super(FeatherTarget, self).__init__(
+            location=location,
+            name=name,
+            ext=ext,
+            data_hash=data_hash,
+            hash_mode=hash_mode,
+            verify=verify,
+            store=store,
+        )
+
+    def _read_data(self):
+        import pandas as pd
+
+        with open_file(self.get_path()) as f:
+            data = pd.read_feather(f)
+        self._verify(data)
+        return data
+
+    def _hash_data(self, a):
+        return hash_dataframe(a, hash_mode=self.hash_mode)
+
+    def _write_hashed(self, path: str) -> str:
+        with open_file(path, mode="wb") as f:
+            self._data.to_feather(f)
+        return self._hash_data(self._data)
@@ -1,14 +1,20 @@
 from typing import Any, Dict, List
 
 from numpy._typing import ArrayLike
-from tifffile import imread
 
 from cpr.image.Metadata import Metadata
 from cpr.Resource import Resource
+from cpr.utilities.filesystem import open_file
+from cpr.utilities.slicing import from_slices, to_slices
 
 
 class ImageSource(Resource, Metadata):
-    """Provides access to an image file and its metadata."""
+    """Provides access to an image file and its metadata.
+
+    If `slices_start` and `slices_stop` indicate a ROI, only this ROI is
+    read from storage. For tiled TIFF files only the overlapping tiles are
+    decoded.
+    """
 
     def __init__(
         self,
@@ -17,6 +23,8 @@ class ImageSource(Resource, Metadata):
         ext: str,
         metadata: Dict = None,
         resolution: List[Any] = None,
+        slices_start: List[int] = [],
+        slices_stop: List[int] = [],
     ):
         """
         Parameters
@@ -31,6 +39,10 @@ class ImageSource(Resource, Metadata):
             Image metadata passed on to tifffile, by default None
         resolution
             Resolution metadata passed on to tifffile, by default None
+        slices_start
+            Start indices of slices used to access the data
+        slices_stop
+            Stop indices of slices used to access the data
 
         Example
         -------
@@ -54,9 +66,17 @@ class ImageSource(Resource, Metadata):
             metadata=metadata,
             resolution=resolution,
         )
+        self._slices = to_slices(slices_start, slices_stop)
 
     @classmethod
-    def from_path(cls, path: str, metadata: Dict = None, resolution: List[Any] = None):
+    def from_path(
+        cls,
+        path: str,
+        metadata: Dict = None,
+        resolution: List[Any] = None,
+        slices_start: List[int] = [],
+        slices_stop: List[int] = [],
+    ):
         """Create new instance from file-path.
 
         Parameters
@@ -67,6 +87,10 @@ class ImageSource(Resource, Metadata):
             Image metadata passed on to tifffile, by default None
         resolution
             Image resolution passed on to tifffile, by default None
+        slices_start
+            Start indices of slices used to access the data
+        slices_stop
+            Stop indices of slices used to access the data
 
         Returns
         -------
@@ -85,17 +109,31 @@ class ImageSource(Resource, Metadata):
         img.get_data()
         """
 
-        img = super(ImageSource, cls).from_path(path=path)
+        img = super(ImageSource, cls).from_path(
+            path=path, slices_start=slices_start, slices_stop=slices_stop
+        )
         img.metadata = metadata
         img.resolution = resolution
         return img
 
     def _read_data(self) -> ArrayLike:
-        return imread(self.get_path())
+        from tifffile import imread
+
+        with open_file(self.get_path()) as f:
+            if self._slices is None:
+                return imread(f)
+
+            import zarr
+
+            with imread(f, aszarr=True) as store:
+                return zarr.open(store, mode="r")[self._slices]
 
     def serialize(self) -> Dict:
         """Serialize to JSON serializable dict."""
         d = super(ImageSource, self).serialize()
         d["metadata"] = self.metadata
         d["resolution"] = self.resolution
+        starts, stops = from_slices(self._slices)
+        d["slices_start"] = starts
+        d["slices_stop"] = stops
         return d
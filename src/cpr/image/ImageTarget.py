@@ -1,12 +1,12 @@
-from os.path import exists
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 
-import xxhash
+import numpy as np
 from numpy._typing import ArrayLike
-from tifffile import imread, imwrite
 
 from cpr.image.Metadata import Metadata
 from cpr.Target import Target
+from cpr.utilities.filesystem import open_file
+from cpr.utilities.hashing import StreamHasher, array_header, hash_array, iter_buffers
 
 
 class ImageTarget(Target, Metadata):
@@ -32,6 +32,15 @@ class ImageTarget(Target, Metadata):
         resolution: List[Any] = None,
         imagej: bool = True,
         data_hash: str = None,
+        hash_mode: str = "flat",
+        verify: str = "always",
+        compression: str = "zlib",
+        compression_level: int = None,
+        predictor: bool = False,
+        maxworkers: int = None,
+        tile: List[int] = None,
+        bigtiff: bool = False,
+        store: str = None,
     ):
         """
         Parameters
@@ -50,6 +59,34 @@ class ImageTarget(Target, Metadata):
             Save imagej compatible, by default True.
         data_hash
             Image data hash, by default None
+        hash_mode
+            Either "flat" or "tree", by default "flat"
+        verify
+            Either "always", "cached" or "never", by default "always"
+        compression
+            Compression codec passed on to tifffile e.g. "zlib", "zstd",
+            "lzma", "lzw" or "none", by default "zlib". Note that ImageJ
+            only reads zlib, lzw and packbits compressed files.
+        compression_level
+            Codec specific compression level, by default None i.e. the
+            codec default
+        predictor
+            Apply a horizontal differencing predictor before compression,
+            by default False
+        maxworkers
+            Number of threads used to compress strips or tiles, by default
+            None i.e. chosen by tifffile
+        tile
+            Tile shape [rows, cols] of the written TIFF, by default None i.e.
+            the image is written in strips. Both must be multiples of 16.
+            Tiled images allow efficient ROI reads with ImageSource.
+        bigtiff
+            Write a BigTIFF file, which is required for files larger than
+            4 GB, by default False. ImageJ does not read BigTIFF files, hence
+            `imagej` is ignored if set.
+        store
+            Root directory of a content-addressed store shared by Targets,
+            by default None
 
         Example
         -------
@@ -75,10 +112,19 @@ class ImageTarget(Target, Metadata):
             name=name,
             ext=ext,
             data_hash=data_hash,
+            hash_mode=hash_mode,
+            verify=verify,
+            store=store,
             metadata=metadata,
             resolution=resolution,
             imagej=imagej,
         )
+        self.compression = compression
+        self.compression_level = compression_level
+        self.predictor = predictor
+        self.maxworkers = maxworkers
+        self.tile = tile
+        self.bigtiff = bigtiff
 
     @classmethod
     def from_path(
@@ -87,6 +133,7 @@ class ImageTarget(Target, Metadata):
         metadata: Dict = None,
         resolution: List[Any] = None,
         imagej: bool = True,
+        **kwargs,
     ):
         """Create new instance from file-path.
 
@@ -100,6 +147,8 @@ class ImageTarget(Target, Metadata):
             Image resolution metadata passed on to tifffile, by default None
         imagej
            Save imagej compatible.
+        kwargs
+            Passed on to the constructor e.g. `compression`
 
         Returns
         -------
@@ -122,7 +171,7 @@ class ImageTarget(Target, Metadata):
         img.set_data(np.random.rand(0, 255, (100, 100)))
         img.get_data()
         """
-        img = super(ImageTarget, cls).from_path(path=path)
+        img = super(ImageTarget, cls).from_path(path=path, **kwargs)
         img.metadata = metadata
         img.resolution = resolution
         img.imagej = imagej
@@ -151,61 +200,115 @@ class ImageTarget(Target, Metadata):
         self.resolution = resolution
 
     def _read_data(self) -> ArrayLike:
-        data = imread(self.get_path())
-        assert self._hash_data(data) == self.data_hash, (
-            "Loaded image has a different hash. This data is either "
-            "from a different run or corrupted."
-        )
+        from tifffile import imread
+
+        with open_file(self.get_path()) as f:
+            data = imread(f)
+        self._verify(data)
         return data
 
     def _hash_data(self, a):
-        data = bytes()
-        data += str(a.dtype).encode("ascii")
-        data += b","
-        data += str(a.shape).encode("ascii")
-        data += b","
-        data += a.tobytes()
-        return xxhash.xxh3_64(data).hexdigest()
-
-    def _write_data(self):
-        if self._data is not None and not exists(self.get_path()):
-            if (self.metadata is not None) and (self.resolution is not None):
-                # Save with metadata and resolution information
-                imwrite(
-                    self.get_path(),
-                    self._data,
-                    compression="zlib",
-                    resolution=tuple(self.resolution),
-                    resolutionunit="CENTIMETER",
-                    metadata=self.metadata,
-                    imagej=self.imagej,
-                )
-            elif self.metadata is not None:
-                # Save with metadata
-                imwrite(
-                    self.get_path(),
-                    self._data,
-                    compression="zlib",
-                    resolution=(1.0,) * len(self._data.shape),
-                    resolutionunit="CENTIMETER",
-                    metadata=self.metadata,
-                    imagej=self.imagej,
-                )
-            elif self.resolution is not None:
-                # Save with resolution information
-                imwrite(
-                    self.get_path(),
-                    self._data,
-                    compression="zlib",
-                    resolution=tuple(self.resolution),
-                    resolutionunit="CENTIMETER",
-                    imagej=self.imagej,
-                )
+        return hash_array(a, hash_mode=self.hash_mode)
+
+    def _iter_chunks(self, hasher: StreamHasher) -> Iterator[ArrayLike]:
+        """Iterate over the image pages or tiles and hash them on the way.
+
+        Pages are the trailing YX or YXS (RGB) axes, which tifffile writes
+        as one image file directory each. If `tile` is set, every page is
+        hashed as a whole before its tiles are yielded.
+        """
+        a = np.asanyarray(self._data)
+        n_page_dims = 3 if self._photometric() == "rgb" else 2
+        leading_shape = a.shape[: max(0, a.ndim - n_page_dims)]
+        for index in np.ndindex(leading_shape):
+            page = a[index]
+            for buffer in iter_buffers(page):
+                hasher.update(buffer)
+            if self.tile is None:
+                yield page
             else:
-                # Save without metadata
-                imwrite(
-                    self.get_path(), self._data, compression="zlib", imagej=self.imagej
-                )
+                yield from self._iter_tiles(page)
+
+    def _iter_tiles(self, page: ArrayLike) -> Iterator[ArrayLike]:
+        """Iterate over the zero-padded tiles of a page in row-major order."""
+        rows, cols = self.tile
+        for y in range(0, page.shape[0], rows):
+            for x in range(0, page.shape[1], cols):
+                y_end, x_end = y + rows, x + cols
+                tile = page[y:y_end, x:x_end]
+                if tile.shape[:2] != (rows, cols):
+                    padded = np.zeros((rows, cols) + page.shape[2:], dtype=page.dtype)
+                    padded[: tile.shape[0], : tile.shape[1]] = tile
+                    tile = padded
+                yield tile
+
+    def _imagej(self) -> bool:
+        # tifffile would write a nonconformant ImageJ BigTIFF.
+        return self.imagej and not self.bigtiff
+
+    def _photometric(self) -> str:
+        a = self._data
+        rgb = a.ndim > 2 and a.shape[-1] in (3, 4)
+        if self._imagej():
+            rgb = rgb and a.dtype == np.uint8
+        return "rgb" if rgb else "minisblack"
+
+    def _write_kwargs(self) -> Dict:
+        kwargs = {
+            "compression": None if self.compression == "none" else self.compression,
+            "imagej": self._imagej(),
+            "maxworkers": self.maxworkers,
+            "bigtiff": self.bigtiff,
+        }
+        if self.tile is not None:
+            kwargs["tile"] = tuple(self.tile)
+        if self.compression_level is not None:
+            kwargs["compressionargs"] = {"level": self.compression_level}
+        if self.predictor:
+            kwargs["predictor"] = True
+        if self.metadata is not None:
+            kwargs["metadata"] = self.metadata
+        if self.resolution is not None:
+            kwargs["resolution"] = tuple(self.resolution)
+            kwargs["resolutionunit"] = "CENTIMETER"
+        elif self.metadata is not None:
+            kwargs["resolution"] = (1.0,) * len(self._data.shape)
+            kwargs["resolutionunit"] = "CENTIMETER"
+        return kwargs
+
+    def _write_options(self) -> Dict:
+        return {
+            "metadata": self.metadata,
+            "resolution": self.resolution,
+            "imagej": self.imagej,
+            "compression": self.compression,
+            "compression_level": self.compression_level,
+            "predictor": self.predictor,
+            "tile": self.tile,
+            "bigtiff": self.bigtiff,
+        }
+
+    def _write_hashed(self, path: str) -> str:
+        from tifffile import imwrite
+
+        a = self._data
+        if a.ndim < 2:
+            # tifffile does not accept page iterators for 1D data
+            with open_file(path, "wb") as f:
+                imwrite(f, a, **self._write_kwargs())
+            return self._hash_data(a)
+
+        hasher = StreamHasher(array_header(a), hash_mode=self.hash_mode)
+        with open_file(path, "wb") as f:
+            imwrite(
+                f,
+                data=self._iter_chunks(hasher),
+                shape=a.shape,
+                dtype=a.dtype,
+                photometric=self._photometric(),
+                **self._write_kwargs(),
+            )
+        return hasher.hexdigest()
 
     def serialize(self):
         """Persist image and serialize to JSON serializable dict."""
@@ -213,4 +316,16 @@ class ImageTarget(Target, Metadata):
         d["resolution"] = self.resolution
         d["metadata"] = self.metadata
         d["imagej"] = self.imagej
+        if self.compression != "zlib":
+            d["compression"] = self.compression
+        if self.compression_level is not None:
+            d["compression_level"] = self.compression_level
+        if self.predictor:
+            d["predictor"] = self.predictor
+        if self.maxworkers is not None:
+            d["maxworkers"] = self.maxworkers
+        if self.tile is not None:
+            d["tile"] = self.tile
+        if self.bigtiff:
+            d["bigtiff"] = self.bigtiff
         return d
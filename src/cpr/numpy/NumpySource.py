@@ -1,12 +1,16 @@
+from io import BytesIO
+from typing import Dict
+
 import numpy as np
 
 from cpr.Resource import Resource
+from cpr.utilities.filesystem import is_local, local_path, open_file
 
 
 class NumpySource(Resource):
     """Provides access to a numpy array file."""
 
-    def __init__(self, location: str, name: str, ext: str):
+    def __init__(self, location: str, name: str, ext: str, mmap_mode: str = None):
         """
         Parameters
         ----------
@@ -16,8 +20,12 @@ class NumpySource(Resource):
             Name of the image file
         ext
             File extension
+        mmap_mode
+            Memory-map mode passed on to numpy.load, by default None. Use
+            "r" to access slices of large .npy files without loading them.
         """
         assert ext in [".npz", ".npy"], "Extension must be .npz or .npy."
+        self.mmap_mode = mmap_mode
         super(NumpySource, self).__init__(
             location=location,
             name=name,
@@ -25,4 +33,16 @@ class NumpySource(Resource):
         )
 
     def _read_data(self):
-        return np.load(self.get_path())
+        if is_local(self.get_path()):
+            return np.load(local_path(self.get_path()), mmap_mode=self.mmap_mode)
+        with open_file(self.get_path()) as f:
+            if self.ext == ".npz":
+                # NpzFile reads members lazily from the file.
+                return np.load(BytesIO(f.read()))
+            return np.load(f)
+
+    def serialize(self) -> Dict:
+        """Serialize to JSON serializable dict."""
+        d = super(NumpySource, self).serialize()
+        d["mmap_mode"] = self.mmap_mode
+        return d
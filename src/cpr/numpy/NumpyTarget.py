@@ -1,9 +1,11 @@
-from os.path import exists
-
 import numpy as np
-import xxhash
 
 from cpr.Target import Target
+from cpr.utilities.filesystem import is_local, local_path, open_file
+from cpr.utilities.hashing import StreamHasher, array_header, hash_array, iter_buffers
+
+# Read-only memory-maps. "r+" and "w+" would modify the persisted data.
+MMAP_MODES = (None, "r", "c")
 
 
 class NumpyTarget(Target):
@@ -17,7 +19,11 @@ class NumpyTarget(Target):
     location/name-{data_hash}.npz.
 
     When get_data() is called the data is retrieved from its location and
-    hash_data is compared to the hash of the loaded data.
+    hash_data is compared to the hash of the loaded data. If `mmap_mode` is
+    set, the data is memory-mapped. Verifying a memory-map still reads the
+    whole file once, hence `verify` defaults to "cached" with `mmap_mode`,
+    which hashes each file version only once. With "never" this pass is
+    skipped entirely.
     """
 
     def __init__(
@@ -26,6 +32,10 @@ class NumpyTarget(Target):
         name: str,
         ext: str,
         data_hash: str = None,
+        hash_mode: str = "flat",
+        verify: str = None,
+        mmap_mode: str = None,
+        store: str = None,
     ):
         """
         Parameters
@@ -36,32 +46,74 @@ class NumpyTarget(Target):
             Name of the image file
         ext
             File extension must be .npy
+        data_hash
+            Data hash, by default None
+        hash_mode
+            Either "flat" or "tree", by default "flat"
+        verify
+            Either "always", "cached" or "never", by default "cached" if
+            `mmap_mode` is set and "always" otherwise
+        mmap_mode
+            Memory-map mode passed on to numpy.load, either None, "r" or
+            "c", by default None. Unless `verify` is "never", the first
+            `get_data()` still reads and hashes the entire file. With
+            "cached" later loads of the unchanged file only map it.
+        store
+            Root directory of a content-addressed store shared by Targets,
+            by default None
         """
         assert ext == ".npy", "`ext` must be .npy."
+        assert mmap_mode in MMAP_MODES, f"`mmap_mode` must be one of {MMAP_MODES}."
+        if verify is None:
+            verify = "always" if mmap_mode is None else "cached"
+        self.mmap_mode = mmap_mode
         super(NumpyTarget, self).__init__(
             location=location,
             name=name,
             ext=ext,
             data_hash=data_hash,
+            hash_mode=hash_mode,
+            verify=verify,
+            store=store,
         )
 
     def _read_data(self):
-        data = np.load(self.get_path())
-        assert self._hash_data(data) == self.data_hash, (
-            "Loaded data has a different hash. This data is either "
-            "from a different run or corrupted."
-        )
+        if is_local(self.get_path()):
+            data = np.load(local_path(self.get_path()), mmap_mode=self.mmap_mode)
+        else:
+            with open_file(self.get_path()) as f:
+                data = np.load(f)
+        self._verify(data)
         return data
 
     def _hash_data(self, a) -> str:
-        data = bytes()
-        data += str(a.dtype).encode("ascii")
-        data += b","
-        data += str(a.shape).encode("ascii")
-        data += b","
-        data += a.tobytes()
-        return xxhash.xxh3_64(data).hexdigest()
+        return hash_array(a, hash_mode=self.hash_mode)
+
+    def _write_hashed(self, path: str) -> str:
+        a = np.asanyarray(self._data)
+        if a.dtype.hasobject:
+            with open_file(path, "wb") as f:
+                np.save(f, a)
+            return self._hash_data(a)
+
+        hasher = StreamHasher(array_header(a), hash_mode=self.hash_mode)
+        header = {
+            "descr": np.lib.format.dtype_to_descr(a.dtype),
+            "fortran_order": False,
+            "shape": a.shape,
+        }
+        with open_file(path, "wb") as f:
+            try:
+                np.lib.format.write_array_header_1_0(f, header)
+            except ValueError:
+                np.lib.format.write_array_header_2_0(f, header)
+            for buffer in iter_buffers(a):
+                f.write(buffer)
+                hasher.update(buffer)
+        return hasher.hexdigest()
 
-    def _write_data(self):
-        if self._data is not None and not exists(self.get_path()):
-            np.save(self.get_path(), self._data)
+    def serialize(self):
+        """Persist data and serialize to JSON serializable dict."""
+        d = super(NumpyTarget, self).serialize()
+        d["mmap_mode"] = self.mmap_mode
+        return d
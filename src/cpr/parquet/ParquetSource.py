@@ -0,0 +1,58 @@
+from typing import Any, Dict, List
+
+from cpr.Resource import Resource
+from cpr.utilities.filesystem import open_file
+
+
+class ParquetSource(Resource):
+    """Provides access to a parquet file.
+
+    Only the given `columns` are read. Row-groups can be skipped with
+    `filters` e.g. `[["area", ">", 100]]`, which are passed on to
+    pandas.read_parquet.
+    """
+
+    def __init__(
+        self,
+        location: str,
+        name: str,
+        ext: str = ".parquet",
+        columns: List[str] = None,
+        filters: List[Any] = None,
+    ):
+        """
+        Parameters
+        ----------
+        location
+            Where the parquet file is stored
+        name
+            Name of the parquet file
+        ext
+            File extension, must be .parquet
+        columns
+            Columns to read, by default None i.e. all columns
+        filters
+            Row filters in disjunctive normal form as lists of
+            [column, op, value], by default None
+        """
+        assert ext == ".parquet", "Extension must be .parquet."
+        self.columns = columns
+        self.filters = filters
+        super(ParquetSource, self).__init__(
+            location=location,
+            name=name,
+            ext=ext,
+        )
+
+    def _read_data(self):
+        import pandas as pd
+
+        with open_file(self.get_path()) as f:
+            return pd.read_parquet(f, columns=self.columns, filters=self.filters)
+
+    def serialize(self) -> Dict:
+        """Serialize to JSON serializable dict."""
+        d = super(ParquetSource, self).serialize()
+        d["columns"] = self.columns
+        d["filters"] = self.filters
+        return d
@@ -0,0 +1,92 @@
+from typing import Dict
+
+from cpr.Target import Target
+from cpr.utilities.filesystem import open_file
+from cpr.utilities.hashing import hash_dataframe
+
+
+class ParquetTarget(Target):
+    """Persists tabular data to parquet and serializes a JSON serializable
+    dictionary.
+
+    A ParquetTarget must have a file-location, -name and -extension
+    (extension must be parquet). With set_data a pandas.DataFrame can be
+    provided. In contrast to CSVTarget the dtypes of the DataFrame are
+    preserved.
+
+    When serialize() is called on a ParquetTarget the DataFrame is saved as
+    parquet to location/name-{data_hash}.ext.
+
+    When get_data() is called the data is retrieved from its location and
+    hash_data is compared to the hash of the loaded data.
+    """
+
+    def __init__(
+        self,
+        location: str,
+        name: str,
+        ext: str = ".parquet",
+        data_hash: str = None,
+        hash_mode: str = "flat",
+        verify: str = "always",
+        row_group_size: int = None,
+        store: str = None,
+    ):
+        """
+        Parameters
+        ----------
+        location
+            Where the parquet file is stored
+        name
+            Name of the parquet file
+        ext
+            File extension, must be .parquet
+        data_hash
+            DataFrame hash, by default None
+        hash_mode
+            Either "flat" or "tree", by default "flat"
+        verify
+            Either "always", "cached" or "never", by default "always"
+        row_group_size
+            Maximum number of rows per row-group, by default None i.e. the
+            pyarrow default
+        store
+            Root directory of a content-addressed store shared by Targets,
+            by default None
+        """
+        assert ext == ".parquet", "Extension must be .parquet."
+        self.row_group_size = row_group_size
+        super(ParquetTarget, self).__init__(
+            location=location,
+            name=name,
+            ext=ext,
+            data_hash=data_hash,
+            hash_mode=hash_mode,
+            verify=verify,
+            store=store,
+        )
+
+    def _read_data(self):
+        import pandas as pd
+
+        with open_file(self.get_path()) as f:
+            data = pd.read_parquet(f)
+        self._verify(data)
+        return data
+
+    def _hash_data(self, a):
+        return hash_dataframe(a, hash_mode=self.hash_mode)
+
+    def _write_options(self) -> Dict:
+        return {"row_group_size": self.row_group_size}
+
+    def _write_hashed(self, path: str) -> str:
+        with open_file(path, mode="wb") as f:
+            self._data.to_parquet(f, row_group_size=self.row_group_size)
+        return self._hash_data(self._data)
+
+    def serialize(self):
+        """Persist DataFrame and serialize to JSON serializable dict."""
+        d = super(ParquetTarget, self).serialize()
+        d["row_group_size"] = self.row_group_size
+        return d
@@ -0,0 +1,372 @@
+import json
+import os
+import re
+import shutil
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from os.path import abspath, basename, dirname, join, lexists
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+from cpr.utilities.imports import resolve_class
+from cpr.utilities.store import blob_path, read_refs, refs_path
+from cpr.utilities.verification import sidecar_path
+
+TARGET_PATTERN = re.compile(r"^(?P<name>.+)-(?P<hash>[0-9a-f]{16})(?P<ext>\.\w+)$")
+BLOB_PATTERN = re.compile(
+    r"^(?P<hash>[0-9a-f]{16})(-(?P<options>[0-9a-f]{16}))?(?P<ext>\.\w+)$"
+)
+EVICTION_POLICIES = ("lru", "age")
+COLLECTION_CLASS = "cpr.collection.ResourceCollection.ResourceCollection"
+
+
+class FileEntry(NamedTuple):
+    """A file or directory persisted by a Target."""
+
+    path: str
+    name: str
+    data_hash: str
+    ext: str
+    size: int
+    atime: float
+    mtime: float
+    kind: str
+
+    @property
+    def location(self) -> str:
+        return dirname(self.path)
+
+
+def _dir_stats(path: str) -> Tuple[int, float, float]:
+    """Get total size and latest access and modification time of all
+    files in a directory, e.g. a zarr store."""
+    size, atime, mtime = 0, 0.0, 0.0
+    stack = [path]
+    while len(stack) > 0:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    st = entry.stat(follow_symlinks=False)
+                    size += st.st_size
+                    atime = max(atime, st.st_atime)
+                    mtime = max(mtime, st.st_mtime)
+    return size, atime, mtime
+
+
+def _scan_dir(path: str) -> Tuple[List[FileEntry], List[str]]:
+    """Scan a single directory for Target files and subdirectories.
+
+    Hidden files i.e. temporary files and sidecars are skipped. Target
+    directories are not descended into.
+    """
+    entries, subdirs = [], []
+    is_shard = len(basename(path)) == 2
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            kind, match = "target", None
+            if is_shard:
+                # Blobs with write options also match TARGET_PATTERN.
+                match = BLOB_PATTERN.match(entry.name)
+                if match is not None and match["hash"][:2] == basename(path):
+                    kind = "blob"
+                else:
+                    match = None
+            if match is None:
+                match = TARGET_PATTERN.match(entry.name)
+            if match is None:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                continue
+
+            if entry.is_symlink():
+                st = entry.stat(follow_symlinks=False)
+                kind, size, atime, mtime = "link", 0, st.st_atime, st.st_mtime
+            elif entry.is_dir(follow_symlinks=False):
+                size, atime, mtime = _dir_stats(entry.path)
+            else:
+                st = entry.stat(follow_symlinks=False)
+                size, atime, mtime = st.st_size, st.st_atime, st.st_mtime
+            entries.append(
+                FileEntry(
+                    path=abspath(entry.path),
+                    name=match.groupdict().get("name", ""),
+                    data_hash=match["hash"],
+                    ext=match["ext"],
+                    size=size,
+                    atime=atime,
+                    mtime=mtime,
+                    kind=kind,
+                )
+            )
+    return entries, subdirs
+
+
+def scan(roots: Iterable[str], max_workers: int = 8) -> Iterator[FileEntry]:
+    """Find all files persisted by Targets below `roots`.
+
+    Directories are scanned concurrently with `os.scandir`, which reads
+    file types from the directory listing. Only Target files are stat-ed.
+
+    Parameters
+    ----------
+    roots
+        Directories to scan recursively
+    max_workers
+        Number of directories scanned concurrently, by default 8
+
+    Returns
+    -------
+    Iterator over FileEntries in no particular order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(_scan_dir, root) for root in roots}
+        while len(pending) > 0:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entries, subdirs = future.result()
+                yield from entries
+                pending |= {pool.submit(_scan_dir, d) for d in subdirs}
+
+
+def _collect_references(obj, refs: Set[str]):
+    stack = [obj]
+    while len(stack) > 0:
+        o = stack.pop()
+        if isinstance(o, dict):
+            data = o.get("data")
+            if (
+                str(o.get("__class__", "")).startswith("cpr.")
+                and isinstance(data, dict)
+                and data.get("data_hash") is not None
+            ):
+                name = f"{data['name']}-{data['data_hash']}{data['ext']}"
+                refs.add(abspath(join(data["location"], name)))
+                if data.get("store") is not None:
+                    refs.add(abspath(_blob_path(o["__class__"], data)))
+                if o["__class__"] == COLLECTION_CLASS:
+                    stack.extend(_collection_items(data))
+            stack.extend(o.values())
+        elif isinstance(o, list):
+            stack.extend(o)
+        elif isinstance(o, str) and o[:1] in "{[" and "cpr." in o:
+            # Prefect stores serialized results as JSON string in the
+            # result record.
+            try:
+                stack.append(json.loads(o))
+            except ValueError:
+                pass
+
+
+def _blob_path(class_name: str, data: dict) -> str:
+    """Get the blob path of a serialized Target, including its write
+    options."""
+    try:
+        return resolve_class(class_name)(**data).get_blob_path()
+    except (ImportError, AttributeError, TypeError):
+        return blob_path(data["store"], data["data_hash"], data["ext"])
+
+
+def _collection_items(data: dict) -> List[dict]:
+    """Read the serialized Resources of a persisted ResourceCollection."""
+    # Resolved on use, such that pyarrow is only imported with collections.
+    collection = resolve_class(COLLECTION_CLASS)(**dict(data, verify="never"))
+    if not collection.exists():
+        return []
+    return list(collection.get_data().iter_dicts())
+
+
+def find_references(paths: Iterable[str]) -> Set[str]:
+    """Find all Target files referenced by serialized results.
+
+    Parameters
+    ----------
+    paths
+        Result files or directories, which are searched recursively
+
+    Returns
+    -------
+    Absolute file-paths of referenced Target files and blobs
+    """
+    refs = set()
+    for path in paths:
+        if os.path.isdir(path):
+            files = (join(d, f) for d, _, fs in os.walk(path) for f in fs)
+        else:
+            files = [path]
+        for file in files:
+            with open(file, "rb") as f:
+                content = f.read()
+            if b"cpr." not in content:
+                continue
+            try:
+                _collect_references(json.loads(content), refs)
+            except ValueError:
+                pass
+    return refs
+
+
+def _remove_entry(entry: FileEntry):
+    if entry.kind == "target" and os.path.isdir(entry.path):
+        shutil.rmtree(entry.path)
+    elif lexists(entry.path):
+        os.remove(entry.path)
+    for extra in [sidecar_path(entry.path), refs_path(entry.path)]:
+        if lexists(extra):
+            os.remove(extra)
+
+
+class StorageIndex:
+    """Index of the files persisted by Targets in result locations.
+
+    Files are matched against the Target references found in serialized
+    results. Files which are not referenced are orphans and can be
+    evicted. Blobs of a content-addressed store are referenced as long as
+    one of their links exists.
+    """
+
+    def __init__(self, entries: List[FileEntry], references: Set[str]):
+        """
+        Parameters
+        ----------
+        entries
+            Target files
+        references
+            Absolute file-paths referenced by results
+        """
+        self.entries = entries
+        self.references = references
+
+    @classmethod
+    def build(
+        cls,
+        locations: Iterable[str],
+        results: Iterable[str] = (),
+        max_workers: int = 8,
+    ):
+        """Scan locations and results.
+
+        Parameters
+        ----------
+        locations
+            Result locations of Targets, including content-addressed stores
+        results
+            Files or directories holding serialized results
+        max_workers
+            Number of directories scanned concurrently, by default 8
+
+        Returns
+        -------
+        A new StorageIndex
+        """
+        entries = list(scan(locations, max_workers=max_workers))
+        return cls(entries, find_references(results))
+
+    def is_referenced(self, entry: FileEntry) -> bool:
+        if entry.path in self.references:
+            return True
+        if entry.kind == "blob":
+            return any(lexists(ref) for ref in read_refs(entry.path))
+        return False
+
+    def orphans(self) -> List[FileEntry]:
+        """Get all entries which are not referenced."""
+        return [e for e in self.entries if not self.is_referenced(e)]
+
+    def total_size(self) -> int:
+        return sum(e.size for e in self.entries)
+
+    def report(self) -> Dict[Tuple[str, str], Dict[str, int]]:
+        """Summarize the storage per location and name prefix.
+
+        Returns
+        -------
+        Dict mapping (location, name) to the number of files, their total
+        size and the size of orphaned files
+        """
+        summary = defaultdict(lambda: {"files": 0, "size": 0, "orphaned": 0})
+        for e in self.entries:
+            s = summary[(e.location, e.name)]
+            s["files"] += 1
+            s["size"] += e.size
+            if not self.is_referenced(e):
+                s["orphaned"] += e.size
+        return dict(summary)
+
+    def plan_eviction(
+        self,
+        budget: int = None,
+        max_age: float = None,
+        policy: str = "lru",
+        now: float = None,
+        min_age: float = None,
+    ) -> List[FileEntry]:
+        """Select orphans to evict.
+
+        Orphans are evicted in least-recently-used ("lru") or oldest first
+        ("age") order while the total size exceeds `budget`. Orphans older
+        than `max_age` are evicted regardless of the budget. Referenced
+        files and orphans younger than `min_age` are never evicted, the
+        latter may belong to runs in flight or to results which were not
+        scanned. Note that access times are only as accurate as the mount
+        options of the file system allow.
+
+        Parameters
+        ----------
+        budget
+            Maximum total size in bytes, by default None
+        max_age
+            Maximum age in seconds since the last modification, by default
+            None
+        policy
+            Either "lru" or "age", by default "lru"
+        now
+            Reference time, by default the current time
+        min_age
+            Minimum age in seconds since the last modification, by default
+            None
+
+        Returns
+        -------
+        Entries to evict
+        """
+        assert (
+            policy in EVICTION_POLICIES
+        ), f"`policy` must be one of {EVICTION_POLICIES}."
+        now = time.time() if now is None else now
+        key = (lambda e: e.atime) if policy == "lru" else (lambda e: e.mtime)
+        total = self.total_size()
+        plan = []
+        for entry in sorted(self.orphans(), key=key):
+            if min_age is not None and now - entry.mtime < min_age:
+                continue
+            too_old = max_age is not None and now - entry.mtime > max_age
+            over_budget = budget is not None and total > budget
+            if too_old or over_budget:
+                plan.append(entry)
+                total -= entry.size
+        return plan
+
+    def evict(self, entries: List[FileEntry]) -> int:
+        """Remove entries together with their sidecar files.
+
+        Parameters
+        ----------
+        entries
+            Entries to remove, e.g. from `plan_eviction`
+
+        Returns
+        -------
+        Number of freed bytes
+        """
+        freed = 0
+        evicted = set()
+        for entry in entries:
+            _remove_entry(entry)
+            freed += entry.size
+            evicted.add(entry.path)
+        self.entries = [e for e in self.entries if e.path not in evicted]
+        return freed
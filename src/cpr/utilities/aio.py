@@ -0,0 +1,124 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from os import cpu_count
+from threading import Lock
+from typing import Any, Callable, Iterable, List
+from weakref import WeakKeyDictionary
+
+from cpr.utilities.release import deferred_collection
+
+_lock = Lock()
+_state = {"executor": None, "max_workers": None, "max_concurrency": None}
+_semaphores = WeakKeyDictionary()
+
+
+def configure(max_workers: int = None, max_concurrency: int = None):
+    """Configure the executor shared by all asynchronous cpr calls.
+
+    Parameters
+    ----------
+    max_workers
+        Number of threads of the shared executor, by default
+        min(32, number of CPUs + 4)
+    max_concurrency
+        Maximum number of blocking calls running at once per event loop,
+        by default `max_workers`
+    """
+    with _lock:
+        if _state["executor"] is not None:
+            _state["executor"].shutdown(wait=False)
+            _state["executor"] = None
+        _state["max_workers"] = max_workers
+        _state["max_concurrency"] = max_concurrency
+        _semaphores.clear()
+
+
+def _max_workers() -> int:
+    return _state["max_workers"] or min(32, (cpu_count() or 1) + 4)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared executor, which is created on first use."""
+    with _lock:
+        if _state["executor"] is None:
+            _state["executor"] = ThreadPoolExecutor(
+                max_workers=_max_workers(), thread_name_prefix="cpr-io"
+            )
+        return _state["executor"]
+
+
+def _get_semaphore():
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        semaphore = _semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(_state["max_concurrency"] or _max_workers())
+            _semaphores[loop] = semaphore
+        return semaphore
+
+
+async def run_blocking(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking call in the shared executor.
+
+    At most `max_concurrency` calls run at once per event loop, further
+    calls wait without occupying a thread.
+
+    Parameters
+    ----------
+    fn
+        Blocking function
+    args
+        Passed on to `fn`
+    kwargs
+        Passed on to `fn`
+
+    Returns
+    -------
+    Return value of `fn`
+    """
+    import asyncio
+
+    async with _get_semaphore():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), partial(fn, *args, **kwargs))
+
+
+async def gather_data(resources: Iterable, **kwargs) -> List[Any]:
+    """Load the data of many Resources concurrently.
+
+    Parameters
+    ----------
+    resources
+        Resources to load
+    kwargs
+        Passed on to `get_data` of every Resource e.g. `cache`
+
+    Returns
+    -------
+    Data of the Resources in the same order
+    """
+    import asyncio
+
+    return list(await asyncio.gather(*(r.aget_data(**kwargs) for r in resources)))
+
+
+async def gather_serialize(targets: Iterable) -> List[dict]:
+    """Persist and serialize many Targets concurrently.
+
+    Garbage collection is deferred until all Targets are persisted.
+
+    Parameters
+    ----------
+    targets
+        Targets to serialize
+
+    Returns
+    -------
+    Serialized dicts of the Targets in the same order
+    """
+    import asyncio
+
+    with deferred_collection():
+        return list(await asyncio.gather(*(t.aserialize() for t in targets)))
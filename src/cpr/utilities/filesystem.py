@@ -0,0 +1,212 @@
+import os
+import shutil
+from os.path import isdir
+from threading import Lock
+from typing import IO, TYPE_CHECKING, Dict, Hashable, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from fsspec.spec import AbstractFileSystem
+
+LOCAL_PROTOCOLS = ("file", "local")
+
+_lock = Lock()
+_filesystems: Dict[str, "AbstractFileSystem"] = {}
+_storage_options: Dict[str, Dict] = {}
+
+
+def configure_filesystem(protocol: str, **storage_options):
+    """Set the storage options used for all paths of a protocol.
+
+    Parameters
+    ----------
+    protocol
+        fsspec protocol, e.g. "s3"
+    storage_options
+        Passed on to `fsspec.filesystem`
+    """
+    with _lock:
+        _storage_options[protocol] = storage_options
+        _filesystems.pop(protocol, None)
+
+
+def get_filesystem(protocol: str = "file") -> "AbstractFileSystem":
+    """Get the pooled filesystem instance of a protocol.
+
+    Every protocol has one instance per process, such that connections
+    are reused by all Resources.
+
+    Parameters
+    ----------
+    protocol
+        fsspec protocol, by default "file"
+
+    Returns
+    -------
+    fsspec filesystem
+    """
+    with _lock:
+        fs = _filesystems.get(protocol)
+        if fs is None:
+            import fsspec
+
+            fs = fsspec.filesystem(protocol, **_storage_options.get(protocol, {}))
+            _filesystems[protocol] = fs
+        return fs
+
+
+def split_protocol(path: str) -> Tuple[Optional[str], str]:
+    """Split a URL into protocol and path, as `fsspec.core.split_protocol`
+    does, without importing fsspec."""
+    if "://" in path:
+        protocol, rest = path.split("://", 1)
+        # Single letters are Windows drive letters.
+        if len(protocol) > 1:
+            return protocol, rest
+    return None, path
+
+
+def get_protocol(path: str) -> str:
+    """Get the protocol of a path or URL, "file" for plain paths."""
+    return split_protocol(path)[0] or "file"
+
+
+def is_local(path: str) -> bool:
+    return get_protocol(path) in LOCAL_PROTOCOLS
+
+
+def local_path(path: str) -> str:
+    """Strip the protocol of a local URL."""
+    return split_protocol(path)[1] if is_local(path) else path
+
+
+def exists(path: str) -> bool:
+    if is_local(path):
+        return os.path.exists(local_path(path))
+    return get_filesystem(get_protocol(path)).exists(path)
+
+
+def list_names(directory: str) -> Set[str]:
+    """List the names of all entries of a directory in one call.
+
+    Parameters
+    ----------
+    directory
+        Path or URL of the directory
+
+    Returns
+    -------
+    Entry names, empty if the directory does not exist
+    """
+    try:
+        if is_local(directory):
+            with os.scandir(local_path(directory)) as it:
+                return {entry.name for entry in it}
+        fs = get_filesystem(get_protocol(directory))
+        return {
+            p.rstrip("/").rsplit("/", 1)[-1] for p in fs.ls(directory, detail=False)
+        }
+    except FileNotFoundError:
+        return set()
+
+
+def open_file(path: str, mode: str = "rb", **kwargs) -> IO:
+    """Open a file on the filesystem of its protocol.
+
+    Parameters
+    ----------
+    path
+        Path or URL of the file
+    mode
+        File mode, by default "rb"
+    kwargs
+        Passed on to `open` of the filesystem, e.g. `newline`
+
+    Returns
+    -------
+    File object
+    """
+    if is_local(path):
+        return open(local_path(path), mode, **kwargs)
+    return get_filesystem(get_protocol(path)).open(path, mode, **kwargs)
+
+
+def zarr_store(path: str, read_only: bool = False):
+    """Get a zarr store on the filesystem of its protocol.
+
+    Parameters
+    ----------
+    path
+        Path or URL of the zarr container
+    read_only
+        Open the store read-only, by default False
+
+    Returns
+    -------
+    The local path, which zarr opens as LocalStore, or an FsspecStore on
+    the pooled filesystem
+    """
+    if is_local(path):
+        return local_path(path)
+
+    import zarr
+    from fsspec.implementations.asyn_wrapper import AsyncFileSystemWrapper
+
+    fs = get_filesystem(get_protocol(path))
+    if not fs.async_impl:
+        fs = AsyncFileSystemWrapper(fs, asynchronous=True)
+    return zarr.storage.FsspecStore(
+        fs, path=fs._strip_protocol(path), read_only=read_only
+    )
+
+
+def makedirs(path: str):
+    if is_local(path):
+        os.makedirs(local_path(path), exist_ok=True)
+    else:
+        get_filesystem(get_protocol(path)).makedirs(path, exist_ok=True)
+
+
+def move(src: str, dst: str):
+    """Move a file or directory.
+
+    Local moves are atomic renames. Other filesystems move with the best
+    guarantee they provide, e.g. a copy followed by a delete on object
+    stores.
+    """
+    if is_local(src) and is_local(dst):
+        os.replace(local_path(src), local_path(dst))
+    else:
+        get_filesystem(get_protocol(src)).mv(src, dst, recursive=True)
+
+
+def remove(path: str):
+    """Remove a file or a directory with its content."""
+    if is_local(path):
+        if isdir(local_path(path)):
+            shutil.rmtree(local_path(path))
+        else:
+            os.remove(local_path(path))
+    else:
+        get_filesystem(get_protocol(path)).rm(path, recursive=True)
+
+
+def version(path: str) -> Hashable:
+    """Identify the current version of a file.
+
+    Parameters
+    ----------
+    path
+        Path or URL of the file
+
+    Returns
+    -------
+    Modification time and size of local files or the corresponding
+    entries of the file info on other filesystems
+    """
+    if is_local(path):
+        st = os.stat(local_path(path))
+        return st.st_mtime_ns, st.st_size
+    info = get_filesystem(get_protocol(path)).info(path)
+    return tuple(
+        str(info.get(k)) for k in ["size", "mtime", "LastModified", "created", "ETag"]
+    )
@@ -0,0 +1,135 @@
+from types import CodeType, FunctionType
+from typing import Any, Callable, Dict, List
+from weakref import finalize
+
+from cpr.utilities.input_hashing import InputHasher
+
+# Memoized fingerprints by id of the function. Entries are removed when the
+# function is garbage collected, before its id can be reused.
+_fingerprints = {}
+
+
+def _normalize_const(const: Any) -> Any:
+    if isinstance(const, CodeType):
+        return ("<code>", _code_digest(const))
+    if isinstance(const, tuple):
+        return tuple(_normalize_const(c) for c in const)
+    if isinstance(const, frozenset):
+        return frozenset(_normalize_const(c) for c in const)
+    return const
+
+
+def _code_digest(code: CodeType) -> str:
+    """Hash bytecode, referenced names and constants of a code object.
+
+    Nested code objects e.g. of inner functions, lambdas and
+    comprehensions are hashed recursively.
+    """
+    hasher = InputHasher()
+    hasher.update(
+        (
+            code.co_code,
+            code.co_names,
+            code.co_argcount,
+            code.co_kwonlyargcount,
+            code.co_flags,
+            tuple(_normalize_const(c) for c in code.co_consts),
+        )
+    )
+    return hasher.hexdigest()
+
+
+def _referenced_names(code: CodeType) -> List[str]:
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names.extend(_referenced_names(const))
+    return names
+
+
+def _closure_value(value: Any) -> Any:
+    if isinstance(value, FunctionType):
+        # Only the code is hashed, as recursive inner functions reference
+        # themselves in their closure.
+        return ("<function>", _code_digest(value.__code__))
+    try:
+        hasher = InputHasher()
+        hasher.update(value)
+        return hasher.hexdigest()
+    except Exception:
+        return ("<unhashable>", type(value).__qualname__)
+
+
+def _function_digest(fn: FunctionType) -> str:
+    hasher = InputHasher()
+    hasher.update(_code_digest(fn.__code__))
+    hasher.update([_closure_value(cell.cell_contents) for cell in fn.__closure__ or ()])
+    hasher.update(_closure_value(fn.__defaults__))
+    hasher.update(_closure_value(fn.__kwdefaults__))
+    return hasher.hexdigest()
+
+
+def _module_functions(fn: FunctionType) -> Dict[str, FunctionType]:
+    """Find all module-level functions of the module of `fn`, which are
+    referenced by `fn` directly or indirectly.
+    """
+    found, stack = {}, [fn]
+    while len(stack) > 0:
+        f = stack.pop()
+        for name in _referenced_names(f.__code__):
+            obj = f.__globals__.get(name)
+            if (
+                isinstance(obj, FunctionType)
+                and obj is not fn
+                and obj.__module__ == fn.__module__
+                and name not in found
+            ):
+                found[name] = obj
+                stack.append(obj)
+    return found
+
+
+def code_fingerprint(fn: Callable, follow_globals: bool = False) -> str:
+    """Compute a stable fingerprint of the code of a function.
+
+    The fingerprint covers the bytecode, referenced names, constants and
+    nested code objects, closure variables and default arguments. With
+    `follow_globals` the module-level functions of the same module, which
+    are referenced directly or indirectly, are covered as well.
+
+    Fingerprints are memoized per function object. Hence, rebinding a
+    referenced global later in the same process does not change the
+    fingerprint.
+
+    Parameters
+    ----------
+    fn
+        Function to fingerprint
+    follow_globals
+        Include referenced module-level functions, by default False
+
+    Returns
+    -------
+    Hex digest of the function
+    """
+    fn = getattr(fn, "__func__", fn)
+    if not isinstance(fn, FunctionType):
+        hasher = InputHasher()
+        hasher.update((getattr(fn, "__module__", None), fn.__qualname__))
+        return hasher.hexdigest()
+
+    memo = _fingerprints.get(id(fn))
+    if memo is None:
+        memo = _fingerprints[id(fn)] = {}
+        finalize(fn, _fingerprints.pop, id(fn), None)
+    if follow_globals not in memo:
+        digest = _function_digest(fn)
+        if follow_globals:
+            hasher = InputHasher()
+            hasher.update(digest)
+            referenced = _module_functions(fn)
+            for name in sorted(referenced):
+                hasher.update((name, code_fingerprint(referenced[name])))
+            digest = hasher.hexdigest()
+        memo[follow_globals] = digest
+    return memo[follow_globals]
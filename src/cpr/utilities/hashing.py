@@ -0,0 +1,235 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+from typing import TYPE_CHECKING, Iterator
+
+import numpy as np
+import xxhash
+from numpy._typing import ArrayLike
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CHUNK_SIZE = 2**24
+TREE_BLOCK_SIZE = 2**22
+HASH_MODES = ("flat", "tree")
+
+
+def iter_buffers(a: ArrayLike, chunk_size: int = CHUNK_SIZE) -> Iterator[memoryview]:
+    """Iterate over the C-ordered bytes of an array.
+
+    C-contiguous arrays are exposed as zero-copy memoryviews into their
+    buffer. Other arrays are copied chunk-wise into a buffer of at most
+    `chunk_size` bytes, which is reused between iterations.
+
+    Parameters
+    ----------
+    a
+        Array to iterate over
+    chunk_size
+        Maximum number of bytes per buffer
+
+    Returns
+    -------
+    Iterator over buffers which yield the same bytes as `a.tobytes()`
+    """
+    a = np.asanyarray(a)
+    if a.dtype.hasobject or a.flags.c_contiguous:
+        if a.dtype.hasobject:
+            buffer = memoryview(a.tobytes())
+        else:
+            buffer = memoryview(np.ascontiguousarray(a).reshape(-1).view(np.uint8))
+        for start in range(0, len(buffer), chunk_size):
+            end = start + chunk_size
+            yield buffer[start:end]
+    else:
+        it = np.nditer(
+            a,
+            flags=["external_loop", "buffered", "zerosize_ok"],
+            order="C",
+            buffersize=max(1, chunk_size // a.itemsize),
+        )
+        for chunk in it:
+            yield memoryview(np.ascontiguousarray(chunk).view(np.uint8))
+
+
+def array_header(a: ArrayLike) -> bytes:
+    """Encode dtype and shape of an array as hash prefix."""
+    return f"{a.dtype},{a.shape},".encode("ascii")
+
+
+class StreamHasher:
+    """Incremental xxh3_64 hash over a stream of buffers.
+
+    In "flat" mode all bytes are fed into a single hash state. In "tree"
+    mode the stream is split into blocks of `TREE_BLOCK_SIZE` bytes, which
+    are hashed in a thread pool. The root hash is then computed over the
+    header and the concatenated block digests.
+
+    Buffers passed to `update` are not referenced after the call returns,
+    hence they can be reused by the caller.
+    """
+
+    def __init__(
+        self, header: bytes = b"", hash_mode: str = "flat", max_workers: int = None
+    ):
+        """
+        Parameters
+        ----------
+        header
+            Bytes hashed before any data
+        hash_mode
+            Either "flat" or "tree", by default "flat"
+        max_workers
+            Number of threads used in "tree" mode, by default the number
+            of CPUs
+        """
+        assert hash_mode in HASH_MODES, f"`hash_mode` must be one of {HASH_MODES}."
+        self.hash_mode = hash_mode
+        self.max_workers = max_workers or cpu_count() or 1
+        self._state = xxhash.xxh3_64(header)
+        self._block = bytearray()
+        self._pool = None
+        if hash_mode == "tree":
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def update(self, buffer):
+        """Hash the next buffer of the stream."""
+        if self._pool is None:
+            self._state.update(buffer)
+            return
+
+        buffer = memoryview(buffer).cast("B")
+        pending = deque()
+        start = 0
+        if len(self._block) > 0:
+            start = min(len(buffer), TREE_BLOCK_SIZE - len(self._block))
+            self._block += buffer[:start]
+            if len(self._block) == TREE_BLOCK_SIZE:
+                self._state.update(xxhash.xxh3_64_digest(self._block))
+                self._block = bytearray()
+
+        while len(buffer) - start >= TREE_BLOCK_SIZE:
+            end = start + TREE_BLOCK_SIZE
+            pending.append(self._pool.submit(xxhash.xxh3_64_digest, buffer[start:end]))
+            if len(pending) >= 2 * self.max_workers:
+                self._state.update(pending.popleft().result())
+            start = end
+
+        while len(pending) > 0:
+            self._state.update(pending.popleft().result())
+        self._block += buffer[start:]
+
+    def hexdigest(self) -> str:
+        """Finish the stream and return the hex digest."""
+        if self._pool is not None:
+            if len(self._block) > 0:
+                self._state.update(xxhash.xxh3_64_digest(self._block))
+                self._block = bytearray()
+            self._pool.shutdown()
+            self._pool = None
+        return self._state.hexdigest()
+
+
+def hash_array(
+    a: ArrayLike,
+    hash_mode: str = "flat",
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: int = None,
+) -> str:
+    """Compute the xxh3_64 hash of an array.
+
+    The hash covers dtype, shape and the C-ordered data of the array. In
+    "flat" mode the data is streamed into a single hash state, so at most
+    `chunk_size` bytes are copied for arrays which are not C-contiguous.
+    In "tree" mode blocks of `TREE_BLOCK_SIZE` bytes are hashed in parallel
+    by a `StreamHasher`.
+
+    Parameters
+    ----------
+    a
+        Array to hash
+    hash_mode
+        Either "flat" or "tree", by default "flat"
+    chunk_size
+        Maximum number of bytes copied at once
+    max_workers
+        Number of threads used in "tree" mode
+
+    Returns
+    -------
+    Hex digest of the array
+    """
+    hasher = StreamHasher(array_header(a), hash_mode=hash_mode, max_workers=max_workers)
+    if hash_mode == "tree":
+        # Hand enough blocks to the hasher to keep all threads busy.
+        chunk_size = max(chunk_size, hasher.max_workers * TREE_BLOCK_SIZE)
+    for buffer in iter_buffers(a, chunk_size=chunk_size):
+        hasher.update(buffer)
+    return hasher.hexdigest()
+
+
+def dataframe_header(df: "pd.DataFrame", dtypes: bool = True) -> bytes:
+    """Encode column names, index names and dtypes of a DataFrame as hash
+    prefix."""
+    schema = [[str(c) for c in df.columns], [str(n) for n in df.index.names]]
+    if dtypes:
+        schema.append([str(d) for d in df.dtypes] + [str(df.index.dtype)])
+    return f"{schema},".encode("utf-8")
+
+
+def dataframe_hasher(
+    df: "pd.DataFrame", hash_mode: str = "flat", dtypes: bool = True
+) -> StreamHasher:
+    """Create a hasher for the row hashes of a DataFrame.
+
+    The hash is prefixed by the schema of the DataFrame. The row hashes
+    computed by `hash_pandas_object` of consecutive chunks of the
+    DataFrame can be fed to the returned hasher one after the other.
+
+    Parameters
+    ----------
+    df
+        DataFrame to hash
+    hash_mode
+        Either "flat" or "tree", by default "flat"
+    dtypes
+        Include the dtypes in the schema, by default True. Formats which
+        do not store dtypes, e.g. CSV, disable this.
+
+    Returns
+    -------
+    A new StreamHasher
+    """
+    header = dataframe_header(df, dtypes=dtypes)
+    if hash_mode == "tree":
+        header += array_header(np.empty((len(df),), dtype=np.uint64))
+    return StreamHasher(header, hash_mode=hash_mode)
+
+
+def hash_dataframe(
+    df: "pd.DataFrame", hash_mode: str = "flat", dtypes: bool = True
+) -> str:
+    """Compute the xxh3_64 hash of a DataFrame including its index.
+
+    The hash covers column names, index names, dtypes and the row hashes
+    of the DataFrame.
+
+    Parameters
+    ----------
+    df
+        DataFrame to hash
+    hash_mode
+        Either "flat" or "tree", by default "flat"
+    dtypes
+        Include the dtypes in the hash, by default True
+
+    Returns
+    -------
+    Hex digest of the DataFrame
+    """
+    from pandas.util import hash_pandas_object
+
+    hasher = dataframe_hasher(df, hash_mode=hash_mode, dtypes=dtypes)
+    hasher.update(hash_pandas_object(df).values)
+    return hasher.hexdigest()
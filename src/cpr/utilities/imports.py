@@ -0,0 +1,25 @@
+from functools import lru_cache
+from importlib import import_module
+
+
+@lru_cache(maxsize=None)
+def resolve_class(qualified_name: str) -> type:
+    """Resolve a qualified class name, once per process.
+
+    Parameters
+    ----------
+    qualified_name
+        Module and name of the class, e.g. "cpr.numpy.NumpyTarget.NumpyTarget"
+
+    Returns
+    -------
+    The class
+    """
+    module, name = qualified_name.rsplit(".", 1)
+    return getattr(import_module(module), name)
+
+
+@lru_cache(maxsize=None)
+def qualified_name(clazz: type) -> str:
+    """Get module and name of a class, the inverse of `resolve_class`."""
+    return clazz.__module__ + "." + clazz.__qualname__
@@ -0,0 +1,184 @@
+import sys
+
+import numpy as np
+import xxhash
+from cloudpickle import cloudpickle
+from prefect.serializers import prefect_json_object_encoder
+from prefect.utilities.importtools import to_qualified_name
+
+from cpr.Resource import Resource
+from cpr.Target import Target
+from cpr.utilities.hashing import array_header, iter_buffers
+
+_SCALARS = (type(None), bool, int, float, str, bytes)
+
+
+def _pandas_types() -> tuple:
+    # Objects can only be pandas objects if pandas was imported already.
+    pd = sys.modules.get("pandas")
+    return () if pd is None else (pd.DataFrame, pd.Series, pd.Index)
+
+
+class InputHasher:
+    """Incremental xxh3_128 hash over the structure of task inputs.
+
+    Objects are walked recursively and fed into the hash state without
+    building an intermediate serialization:
+
+    * numpy arrays contribute dtype, shape and their raw buffer,
+    * pandas objects contribute their index and columns, numeric values
+      as raw buffers and other values by their pandas hashes,
+    * Targets contribute location, name, ext and data_hash; the data of
+      a Target which has not been persisted yet is hashed in memory,
+    * other Resources contribute their serialized dict,
+    * dicts and sets are hashed independently of their order.
+
+    Objects of other types are encoded by the prefect JSON encoder and, if
+    this fails, by cloudpickle.
+    """
+
+    def __init__(self):
+        self._state = xxhash.xxh3_128()
+
+    def _tag(self, tag: bytes, *parts: str):
+        self._state.update(tag)
+        for part in parts:
+            encoded = part.encode("utf-8")
+            self._state.update(len(encoded).to_bytes(8, "little"))
+            self._state.update(encoded)
+
+    def update(self, obj):
+        """Feed an object into the hash state."""
+        if isinstance(obj, _SCALARS):
+            self._update_scalar(obj)
+        elif isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+            self._tag(b"a")
+            self._state.update(array_header(obj))
+            for buffer in iter_buffers(obj):
+                self._state.update(buffer)
+        elif isinstance(obj, np.generic) and not isinstance(obj, np.object_):
+            self._tag(b"g", str(obj.dtype))
+            self._state.update(obj.tobytes())
+        elif isinstance(obj, _pandas_types()):
+            self._update_pandas(obj)
+        elif isinstance(obj, Resource):
+            self._update_resource(obj)
+        elif isinstance(obj, dict):
+            if all(isinstance(k, str) for k in obj):
+                self._tag(b"k", str(len(obj)))
+                for k in sorted(obj):
+                    self._tag(b"u", k)
+                    self.update(obj[k])
+            else:
+                self._update_unordered(b"d", [(k, v) for k, v in obj.items()])
+        elif isinstance(obj, (set, frozenset)):
+            self._update_unordered(b"s", [(v,) for v in obj])
+        elif isinstance(obj, (list, tuple)):
+            self._tag(b"l" if isinstance(obj, list) else b"t", str(len(obj)))
+            for item in obj:
+                self.update(item)
+        else:
+            self._update_leaf(obj)
+
+    def _update_scalar(self, obj):
+        if obj is None:
+            self._tag(b"n")
+        elif isinstance(obj, bool):
+            self._tag(b"b", str(obj))
+        elif isinstance(obj, int):
+            self._tag(b"i", str(obj))
+        elif isinstance(obj, float):
+            self._tag(b"f", obj.hex())
+        elif isinstance(obj, str):
+            self._tag(b"u", obj)
+        else:
+            self._tag(b"y", str(len(obj)))
+            self._state.update(obj)
+
+    def _update_values(self, values):
+        """Feed the values of an Index or Series.
+
+        Numeric values are fed as raw buffer, other values by their pandas
+        hashes.
+        """
+        self._tag(b"v", str(values.dtype))
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufcmM":
+            self.update(values.to_numpy())
+        else:
+            from pandas.util import hash_pandas_object
+
+            self._state.update(hash_pandas_object(values, index=False).values)
+
+    def _update_pandas(self, obj):
+        import pandas as pd
+
+        self._tag(b"p", type(obj).__name__, str(obj.shape))
+        if isinstance(obj, pd.Index):
+            self._update_values(obj)
+            return
+        self._update_values(obj.index)
+        if isinstance(obj, pd.Series):
+            self.update(str(obj.name))
+            self._update_values(obj)
+            return
+        for name, column in obj.items():
+            self.update(str(name))
+            self._update_values(column)
+
+    def _update_resource(self, obj: Resource):
+        self._tag(b"r", to_qualified_name(obj.__class__))
+        if isinstance(obj, Target):
+            data_hash = obj.data_hash
+            if obj._data is not None:
+                data_hash = obj._hash_data(obj._data)
+            self.update([obj.location, obj.name, obj.ext, data_hash])
+        else:
+            self.update(obj.serialize())
+
+    def _update_unordered(self, tag: bytes, items):
+        digests = []
+        for item in items:
+            digests.append(b"".join(_digest(v) for v in item))
+        self._tag(tag, str(len(digests)))
+        for digest in sorted(digests):
+            self._state.update(digest)
+
+    def _update_leaf(self, obj):
+        try:
+            encoded = prefect_json_object_encoder(obj)
+        except Exception:
+            encoded = None
+        if isinstance(encoded, dict):
+            self._tag(b"j", to_qualified_name(obj.__class__))
+            self.update(encoded)
+        else:
+            self._tag(b"c")
+            self._state.update(cloudpickle.dumps(obj))
+
+    def hexdigest(self) -> str:
+        return self._state.hexdigest()
+
+
+def _digest(obj) -> bytes:
+    hasher = InputHasher()
+    hasher.update(obj)
+    return hasher._state.digest()
+
+
+def hash_inputs(*args, **kwargs) -> str:
+    """Compute a deterministic structural hash of arguments.
+
+    Parameters
+    ----------
+    args
+        Positional arguments
+    kwargs
+        Keyword arguments
+
+    Returns
+    -------
+    Hex digest of the arguments
+    """
+    hasher = InputHasher()
+    hasher.update((args, kwargs))
+    return hasher.hexdigest()
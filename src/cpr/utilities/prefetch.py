@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from typing import Callable, Hashable, Optional
+
+from cpr.utilities.aio import get_executor
+
+_lock = Lock()
+_prefetched: "OrderedDict[Hashable, Future]" = OrderedDict()
+_state = {"max_prefetched": 16}
+
+
+def set_max_prefetched(max_prefetched: int):
+    """Set how many prefetched Resources are kept at most.
+
+    Once the limit is reached, the oldest prefetch is discarded.
+
+    Parameters
+    ----------
+    max_prefetched
+        Maximum number of prefetched Resources
+    """
+    assert max_prefetched > 0, "`max_prefetched` must be positive."
+    with _lock:
+        _state["max_prefetched"] = max_prefetched
+        _evict()
+
+
+def _evict():
+    while len(_prefetched) > _state["max_prefetched"]:
+        _, future = _prefetched.popitem(last=False)
+        future.cancel()
+
+
+def submit(key: Hashable, fn: Callable) -> Future:
+    """Run `fn` in the shared executor and keep the future under `key`.
+
+    If a prefetch for `key` is kept already, its future is returned.
+
+    Parameters
+    ----------
+    key
+        Identifies the data, e.g. path and hash of a Resource
+    fn
+        Reads the data
+
+    Returns
+    -------
+    Future of the data
+    """
+    with _lock:
+        future = _prefetched.get(key)
+        if future is None or future.cancelled():
+            future = get_executor().submit(fn)
+            _prefetched[key] = future
+            _evict()
+        return future
+
+
+def has_prefetched() -> bool:
+    """Check if any prefetch is kept, without computing keys."""
+    return len(_prefetched) > 0
+
+
+def take(key: Hashable) -> Optional[Future]:
+    """Remove and return the prefetch kept under `key`.
+
+    The data is handed over once, such that the cache does not hold on to
+    it after it was accessed.
+
+    Parameters
+    ----------
+    key
+        Identifies the data
+
+    Returns
+    -------
+    Future of the data or None, if nothing was prefetched
+    """
+    with _lock:
+        future = _prefetched.pop(key, None)
+    if future is None or future.cancelled():
+        return None
+    return future
+
+
+def clear():
+    """Discard all prefetched data."""
+    with _lock:
+        for future in _prefetched.values():
+            future.cancel()
+        _prefetched.clear()
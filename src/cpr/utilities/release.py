@@ -0,0 +1,74 @@
+import gc
+from contextlib import contextmanager
+from os import environ
+from threading import Lock
+
+GC_POLICIES = ("never", "deferred", "always")
+
+_lock = Lock()
+_state = {
+    "policy": environ.get("CPR_GC_POLICY", "deferred"),
+    "depth": 0,
+    "pending": False,
+}
+assert _state["policy"] in GC_POLICIES, f"CPR_GC_POLICY must be one of {GC_POLICIES}."
+
+
+def set_gc_policy(policy: str):
+    """Set when the garbage collector runs after Targets release their data.
+
+    "never" leaves collection to the interpreter. "deferred" collects once
+    at the end of a `deferred_collection` block, e.g. once per serialized
+    task result. "always" additionally collects after every Target which
+    releases its data outside of such a block. The default is read from
+    the environment variable CPR_GC_POLICY and is "deferred" if unset.
+
+    Parameters
+    ----------
+    policy
+        Either "never", "deferred" or "always"
+    """
+    assert policy in GC_POLICIES, f"`policy` must be one of {GC_POLICIES}."
+    _state["policy"] = policy
+
+
+def get_gc_policy() -> str:
+    """Get the current garbage collection policy."""
+    return _state["policy"]
+
+
+def collect_released():
+    """Notify that a Target released its data.
+
+    Depending on the policy the garbage collector runs immediately or at
+    the end of the enclosing `deferred_collection` block.
+    """
+    if _state["policy"] == "never":
+        return
+    with _lock:
+        if _state["depth"] > 0:
+            _state["pending"] = True
+            return
+    if _state["policy"] == "always":
+        gc.collect()
+
+
+@contextmanager
+def deferred_collection():
+    """Defer garbage collection of released data to the end of the block.
+
+    Blocks can be nested and used from several threads. The garbage
+    collector runs at most once, when the outermost block exits.
+    """
+    with _lock:
+        _state["depth"] += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _state["depth"] -= 1
+            collect = _state["depth"] == 0 and _state["pending"]
+            if collect:
+                _state["pending"] = False
+        if collect and _state["policy"] != "never":
+            gc.collect()
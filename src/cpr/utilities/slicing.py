@@ -0,0 +1,72 @@
+import math
+from typing import List, Optional, Tuple
+
+
+def to_slices(slices_start: List[int], slices_stop: List[int]) -> Optional[Tuple]:
+    """Build a ROI from start and stop indices.
+
+    Parameters
+    ----------
+    slices_start
+        Start indices per axis
+    slices_stop
+        Stop indices per axis
+
+    Returns
+    -------
+    Tuple of slices or None if no indices are given
+    """
+    if len(slices_start) == 0:
+        return None
+    return tuple(slice(s, e) for s, e in zip(slices_start, slices_stop))
+
+
+def from_slices(slices: Optional[Tuple]) -> Tuple[List[int], List[int]]:
+    """Split a ROI into JSON serializable start and stop indices.
+
+    Parameters
+    ----------
+    slices
+        Tuple of slices or None
+
+    Returns
+    -------
+    Start and stop indices per axis
+    """
+    starts, stops = [], []
+    if slices is not None:
+        for sl in slices:
+            starts.append(sl.start)
+            stops.append(sl.stop)
+    return starts, stops
+
+
+def rescale_slices(
+    slices: Tuple, shape: Tuple[int, ...], factors: List[float]
+) -> Tuple:
+    """Map a ROI to a downsampled version of an array.
+
+    The ROI is normalized with respect to `shape` and then divided by
+    `factors`. Starts are rounded down and stops up, such that the
+    rescaled ROI covers the original ROI.
+
+    Parameters
+    ----------
+    slices
+        Tuple of slices without step into an array of `shape`
+    shape
+        Shape of the array `slices` refer to
+    factors
+        Downsampling factor per axis
+
+    Returns
+    -------
+    Tuple of slices into the downsampled array
+    """
+    rescaled = []
+    for sl, n, f in zip(slices, shape, factors):
+        start, stop, _ = sl.indices(n)
+        start = int(math.floor(start / f + 1e-9))
+        stop = max(start, int(math.ceil(stop / f - 1e-9)))
+        rescaled.append(slice(start, stop))
+    return tuple(rescaled)
@@ -0,0 +1,111 @@
+import json
+import os
+from os.path import abspath, dirname, exists, join, lexists
+from typing import Dict, List
+from uuid import uuid4
+
+import xxhash
+
+REFS_EXT = ".refs"
+
+
+def options_digest(options: Dict) -> str:
+    """Hash JSON serializable write options."""
+    return xxhash.xxh3_64_hexdigest(json.dumps(options, sort_keys=True).encode())
+
+
+def blob_path(store: str, data_hash: str, ext: str, options: Dict = None) -> str:
+    """Get the content-addressed file-path of data.
+
+    Parameters
+    ----------
+    store
+        Root directory of the content-addressed store
+    data_hash
+        Hash of the data
+    ext
+        File extension of the data
+    options
+        Options which change the written file other than the data, e.g.
+        compression or metadata, by default None
+
+    Returns
+    -------
+    store/data_hash[:2]/data_hash.ext or
+    store/data_hash[:2]/data_hash-options_digest.ext
+    """
+    key = data_hash
+    if options:
+        key = f"{data_hash}-{options_digest(options)}"
+    return join(store, data_hash[:2], f"{key}{ext}")
+
+
+def refs_path(blob: str) -> str:
+    """Get the file-path of the reference list of a blob."""
+    return f"{blob}{REFS_EXT}"
+
+
+def add_ref(blob: str, path: str):
+    """Record that `path` links to `blob`.
+
+    References are appended as lines to the reference list next to the
+    blob. Appends of single lines are atomic, so several processes can add
+    references concurrently.
+
+    Parameters
+    ----------
+    blob
+        File-path of the blob
+    path
+        File-path of the link
+    """
+    with open(refs_path(blob), "a") as f:
+        f.write(abspath(path) + "\n")
+
+
+def read_refs(blob: str) -> List[str]:
+    """Read all recorded references of a blob.
+
+    Parameters
+    ----------
+    blob
+        File-path of the blob
+
+    Returns
+    -------
+    Unique file-paths which were linked to the blob
+    """
+    if not exists(refs_path(blob)):
+        return []
+    with open(refs_path(blob)) as f:
+        return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+
+
+def link_blob(blob: str, path: str):
+    """Make `blob` available at `path` and record the reference.
+
+    A symbolic link is created atomically. If symbolic links are not
+    supported, a hard link is created instead. Existing files at `path`
+    are left untouched.
+
+    Parameters
+    ----------
+    blob
+        File-path of the blob
+    path
+        File-path of the link
+    """
+    if not lexists(path):
+        os.makedirs(dirname(abspath(path)), exist_ok=True)
+        tmp_path = join(dirname(abspath(path)), f".link-{uuid4().hex}")
+        try:
+            os.symlink(abspath(blob), tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            if lexists(tmp_path):
+                os.remove(tmp_path)
+            try:
+                os.link(blob, path)
+            except FileExistsError:
+                pass
+    add_ref(blob, path)
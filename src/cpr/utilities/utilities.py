@@ -1,10 +1,12 @@
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from cloudpickle import cloudpickle
 from prefect.context import TaskRunContext
 from prefect.utilities.hashing import _md5, stable_hash
 
 from cpr.Serializer import cpr_serializer
+from cpr.utilities.fingerprint import code_fingerprint
+from cpr.utilities.input_hashing import hash_inputs
 
 
 def hash_objects(*args, hash_algo=_md5, **kwargs) -> Optional[str]:
@@ -22,11 +24,54 @@ def hash_objects(*args, hash_algo=_md5, **kwargs) -> Optional[str]:
     return None
 
 
+def task_input_hash_fn(
+    follow_globals: bool = False,
+) -> Callable[["TaskRunContext", Dict[str, Any]], Optional[str]]:
+    """Create a cache key function which hashes the task and its arguments.
+
+    Parameters
+    ----------
+    follow_globals
+        Include the module-level functions referenced by the task function
+        in its code fingerprint, by default False
+
+    Returns
+    -------
+    A cache key function, which can be passed to the task decorator
+    """
+
+    def cache_key_fn(
+        context: "TaskRunContext", arguments: Dict[str, Any]
+    ) -> Optional[str]:
+        try:
+            return hash_inputs(
+                context.task.task_key,
+                code_fingerprint(context.task.fn, follow_globals=follow_globals),
+                arguments,
+            )
+        except Exception:
+            return None
+
+    return cache_key_fn
+
+
 def task_input_hash(
     context: "TaskRunContext", arguments: Dict[str, Any]
 ) -> Optional[str]:
-    return hash_objects(
-        context.task.task_key,
-        context.task.fn.__code__.co_code.hex(),
-        arguments,
-    )
+    """Cache key function which hashes the task and its arguments.
+
+    The task function is identified by its memoized `code_fingerprint`,
+    which covers bytecode, constants, nested code objects, closures and
+    default arguments. The arguments are hashed structurally by
+    `hash_inputs`, i.e. arrays, DataFrames and Resources are fed directly
+    into the hash without serializing them first. Targets are not
+    persisted by hashing.
+
+    Returns
+    -------
+    Hex digest or None if the arguments cannot be hashed
+    """
+    return _task_input_hash(context, arguments)
+
+
+_task_input_hash = task_input_hash_fn()
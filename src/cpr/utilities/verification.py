@@ -0,0 +1,166 @@
+import json
+from os import remove, replace, stat
+from os.path import join, split
+from typing import Dict
+from uuid import uuid4
+
+VERIFY_POLICIES = ("always", "cached", "never")
+
+
+def sidecar_path(path: str) -> str:
+    """Get the file-path of the verification sidecar of a file.
+
+    Parameters
+    ----------
+    path
+        File-path of the verified file
+
+    Returns
+    -------
+    location/.name.ext.verified
+    """
+    location, file_name = split(path)
+    return join(location, f".{file_name}.verified")
+
+
+def _fingerprint(path: str, data_hash: str) -> dict:
+    st = stat(path)
+    return {
+        "data_hash": data_hash,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "inode": st.st_ino,
+    }
+
+
+def is_verified(path: str, data_hash: str) -> bool:
+    """Check if a file was verified and has not changed since.
+
+    Parameters
+    ----------
+    path
+        File-path of the data
+    data_hash
+        Expected data hash
+
+    Returns
+    -------
+    True if the sidecar matches data_hash, size, mtime and inode of the file
+    """
+    try:
+        with open(sidecar_path(path)) as f:
+            return json.load(f) == _fingerprint(path, data_hash)
+    except (OSError, ValueError):
+        return False
+
+
+def mark_verified(path: str, data_hash: str):
+    """Record a successful verification in the sidecar of a file.
+
+    Failing to write the sidecar, e.g. in a read-only location, is not an
+    error. The file is simply verified again on the next read.
+
+    Parameters
+    ----------
+    path
+        File-path of the data
+    data_hash
+        Verified data hash
+    """
+    location, _ = split(path)
+    tmp_path = join(location, f".{uuid4().hex}.verified")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(_fingerprint(path, data_hash), f)
+        replace(tmp_path, sidecar_path(path))
+    except OSError:
+        try:
+            remove(tmp_path)
+        except OSError:
+            pass
+
+
+def verified_chunks(path: str) -> Dict[str, dict]:
+    """Read the verified chunks of a chunked store e.g. a zarr store.
+
+    The chunks are recorded line by line in the sidecar of the store, see
+    `mark_chunk_verified`. Unreadable lines are skipped.
+
+    Parameters
+    ----------
+    path
+        Directory of the store
+
+    Returns
+    -------
+    Fingerprint of every verified chunk by chunk file-path relative to path
+    """
+    chunks = {}
+    try:
+        with open(sidecar_path(path)) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    chunks[entry.pop("chunk")] = entry
+                except (ValueError, KeyError, AttributeError):
+                    continue
+    except OSError:
+        pass
+    return chunks
+
+
+def is_chunk_verified(
+    chunks: Dict[str, dict], path: str, chunk: str, data_hash: str
+) -> bool:
+    """Check if a chunk was verified and has not changed since.
+
+    Parameters
+    ----------
+    chunks
+        Verified chunks as read by `verified_chunks`
+    path
+        Directory of the store
+    chunk
+        Chunk file-path relative to path
+    data_hash
+        Expected hash of the chunk
+
+    Returns
+    -------
+    True if the recorded fingerprint matches the chunk file
+    """
+    try:
+        return chunks.get(chunk) == _fingerprint(join(path, chunk), data_hash)
+    except OSError:
+        return False
+
+
+def mark_chunk_verified(path: str, chunk: str, data_hash: str) -> dict:
+    """Record a successful chunk verification in the sidecar of a store.
+
+    The record is appended, such that every chunk is written once. As with
+    `mark_verified` failing to write the sidecar is not an error.
+
+    Parameters
+    ----------
+    path
+        Directory of the store
+    chunk
+        Chunk file-path relative to path
+    data_hash
+        Verified hash of the chunk
+
+    Returns
+    -------
+    Fingerprint of the chunk or None, if the chunk file does not exist
+    """
+    try:
+        fingerprint = _fingerprint(join(path, chunk), data_hash)
+    except OSError:
+        return None
+    try:
+        with open(sidecar_path(path), "a") as f:
+            f.write(json.dumps(dict(fingerprint, chunk=chunk)) + "\n")
+    except OSError:
+        pass
+    return fingerprint
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+from threading import Lock
+from typing import Hashable, Optional
+
+import numpy as np
+
+
+class ChunkCache:
+    """Thread-safe LRU cache of decompressed chunks with a byte budget.
+
+    Chunks are evicted in least-recently-used order as soon as the total
+    number of cached bytes exceeds `max_bytes`. Chunks larger than the
+    budget are not cached.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Parameters
+        ----------
+        max_bytes
+            Maximum number of bytes held by the cache
+        """
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self._chunks = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._chunks
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """Get a cached chunk and mark it as recently used.
+
+        Parameters
+        ----------
+        key
+            Chunk key
+
+        Returns
+        -------
+        The cached chunk or None
+        """
+        with self._lock:
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                self._chunks.move_to_end(key)
+            return chunk
+
+    def put(self, key: Hashable, chunk: np.ndarray):
+        """Add a chunk and evict least-recently-used chunks if required.
+
+        Parameters
+        ----------
+        key
+            Chunk key
+        chunk
+            Decompressed chunk data
+        """
+        if chunk.nbytes > self.max_bytes:
+            return
+        chunk.flags.writeable = False
+        with self._lock:
+            old = self._chunks.pop(key, None)
+            if old is not None:
+                self.n_bytes -= old.nbytes
+            self._chunks[key] = chunk
+            self.n_bytes += chunk.nbytes
+            while self.n_bytes > self.max_bytes:
+                _, evicted = self._chunks.popitem(last=False)
+                self.n_bytes -= evicted.nbytes
+
+    def clear(self):
+        """Remove all chunks."""
+        with self._lock:
+            self._chunks.clear()
+            self.n_bytes = 0
+
+
+_shared_cache = None
+_prefetch_pool = None
+_lock = Lock()
+
+
+def shared_chunk_cache(max_bytes: int) -> ChunkCache:
+    """Get the chunk cache shared by all ZarrSources of this process.
+
+    Parameters
+    ----------
+    max_bytes
+        Requested byte budget. The budget of the shared cache is the
+        largest budget requested so far.
+
+    Returns
+    -------
+    The process-wide ChunkCache
+    """
+    global _shared_cache
+    with _lock:
+        if _shared_cache is None:
+            _shared_cache = ChunkCache(max_bytes)
+        _shared_cache.max_bytes = max(_shared_cache.max_bytes, max_bytes)
+        return _shared_cache
+
+
+def prefetch_pool() -> ThreadPoolExecutor:
+    """Get the thread pool used to prefetch chunks in the background."""
+    global _prefetch_pool
+    with _lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(
+                max_workers=min(8, cpu_count() or 1) + 1,
+                thread_name_prefix="cpr-prefetch",
+            )
+        return _prefetch_pool
@@ -0,0 +1,245 @@
+from itertools import product
+from threading import Lock
+from typing import Any, Callable, Hashable, Iterator, List, Tuple
+
+import numpy as np
+from numpy._typing import ArrayLike
+
+from cpr.zarr.ChunkCache import ChunkCache, prefetch_pool
+
+
+class ChunkedArray:
+    """Read-only array view which reads a zarr array chunk by chunk.
+
+    Indexing with integers and slices reads only the chunks overlapping
+    the selection. Every chunk which is read from storage is passed on to
+    `on_chunk`, which allows to verify chunks as they are loaded.
+
+    The view can be restricted to a `region` of the array. Decompressed
+    chunks are kept in an optional LRU `cache` and with `prefetch` the
+    chunks adjacent to every selection are read in a background thread
+    pool.
+    """
+
+    def __init__(
+        self,
+        array: Any,
+        on_chunk: Callable[[Tuple[int, ...], np.ndarray], None] = None,
+        region: Tuple[slice, ...] = None,
+        cache: ChunkCache = None,
+        cache_key: Hashable = None,
+        prefetch: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        array
+            zarr array to read from
+        on_chunk
+            Called with chunk index and data of every chunk read from
+            storage, by default None
+        region
+            Slices without step restricting the view to a region of
+            `array`, by default None i.e. the whole array
+        cache
+            Cache for decompressed chunks, by default None
+        cache_key
+            Identifies `array` in `cache`, by default the store and path of
+            `array`
+        prefetch
+            Read chunks adjacent to every selection in the background, by
+            default False
+        """
+        self._array = array
+        self._on_chunk = on_chunk
+        if region is None:
+            region = ()
+        region = tuple(region) + (slice(None),) * (len(array.shape) - len(region))
+        bounds = [sl.indices(n)[:2] for sl, n in zip(region, array.shape)]
+        self._offset = tuple(start for start, _ in bounds)
+        self._shape = tuple(max(0, stop - start) for start, stop in bounds)
+        self._cache = cache
+        if cache_key is None:
+            cache_key = (str(getattr(array, "store", id(array))), array.path)
+        self._cache_key = cache_key
+        self._prefetch = prefetch
+        self._pending = {}
+        self._lock = Lock()
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._shape
+
+    @property
+    def chunks(self) -> Tuple[int, ...]:
+        return tuple(self._array.chunks)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(self._array.dtype)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def grid_shape(self) -> Tuple[int, ...]:
+        """Number of chunks per axis of the underlying array."""
+        return tuple(-(-s // c) for s, c in zip(self._array.shape, self.chunks))
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        data = self[...]
+        return data if dtype is None else data.astype(dtype)
+
+    def chunk_slices(self, index: Tuple[int, ...]) -> Tuple[slice, ...]:
+        """Get the region of the underlying array covered by a chunk.
+
+        Parameters
+        ----------
+        index
+            Chunk index per axis
+
+        Returns
+        -------
+        Tuple of slices, clipped to the array shape
+        """
+        return tuple(
+            slice(i * c, min((i + 1) * c, s))
+            for i, c, s in zip(index, self.chunks, self._array.shape)
+        )
+
+    def chunk_indices(self, box: List[Tuple[int, int]]) -> Iterator[Tuple[int, ...]]:
+        """Iterate over the indices of all chunks overlapping a box.
+
+        Parameters
+        ----------
+        box
+            Start and stop per axis in coordinates of the underlying array
+
+        Returns
+        -------
+        Iterator over chunk indices in C-order
+        """
+        ranges = []
+        for (start, stop), c in zip(box, self.chunks):
+            if stop <= start:
+                return iter(())
+            ranges.append(range(start // c, (stop - 1) // c + 1))
+        return product(*ranges)
+
+    def _load_chunk(self, index: Tuple[int, ...]) -> np.ndarray:
+        chunk = np.asarray(self._array[self.chunk_slices(index)])
+        if self._on_chunk is not None:
+            self._on_chunk(index, chunk)
+        if self._cache is not None:
+            self._cache.put((self._cache_key, index), chunk)
+        return chunk
+
+    def _read_chunk(self, index: Tuple[int, ...]) -> np.ndarray:
+        if self._cache is not None:
+            chunk = self._cache.get((self._cache_key, index))
+            if chunk is not None:
+                return chunk
+        with self._lock:
+            future = self._pending.get(index)
+        if future is not None:
+            return future.result()
+        return self._load_chunk(index)
+
+    def _prefetch_around(self, box: List[Tuple[int, int]]):
+        """Read the chunks adjacent to `box` in the background.
+
+        Only chunks inside the view region are prefetched and at most half
+        of the cache budget is requested at once.
+        """
+        selected = [
+            range(start // c, (stop - 1) // c + 1)
+            for (start, stop), c in zip(box, self.chunks)
+        ]
+        lower = [o // c for o, c in zip(self._offset, self.chunks)]
+        upper = [
+            -(-(o + s) // c) for o, s, c in zip(self._offset, self.shape, self.chunks)
+        ]
+        neighbourhood = [
+            range(max(lo, r.start - 1), min(hi, r.stop + 1))
+            for r, lo, hi in zip(selected, lower, upper)
+        ]
+        budget = self._cache.max_bytes // 2
+        chunk_bytes = int(np.prod(self.chunks)) * self.dtype.itemsize
+        pool = prefetch_pool()
+        for index in product(*neighbourhood):
+            if all(i in r for i, r in zip(index, selected)):
+                continue
+            if budget < chunk_bytes:
+                break
+            with self._lock:
+                if index in self._pending or (self._cache_key, index) in self._cache:
+                    continue
+                future = pool.submit(self._load_chunk, index)
+                self._pending[index] = future
+            future.add_done_callback(lambda f, i=index: self._done(i))
+            budget -= chunk_bytes
+
+    def _done(self, index: Tuple[int, ...]):
+        with self._lock:
+            self._pending.pop(index, None)
+
+    def _bounding_box(self, key) -> Tuple[List[Tuple[int, int]], Tuple]:
+        """Split a selection into a box of start-stop pairs and an index
+        into the box, which applies steps and drops integer-indexed axes.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = key.index(Ellipsis)
+            fill = (slice(None),) * (self.ndim - len(key) + 1)
+            rest = i + 1
+            key = key[:i] + fill + key[rest:]
+        key = key + (slice(None),) * (self.ndim - len(key))
+        if len(key) != self.ndim:
+            raise IndexError(f"Too many indices for array of dimension {self.ndim}.")
+
+        box, index = [], []
+        for k, n in zip(key, self.shape):
+            if isinstance(k, (int, np.integer)):
+                k = int(k) + n if k < 0 else int(k)
+                if not 0 <= k < n:
+                    raise IndexError(f"Index {k} is out of bounds for size {n}.")
+                box.append((k, k + 1))
+                index.append(0)
+            elif isinstance(k, slice):
+                start, stop, step = k.indices(n)
+                if step > 0:
+                    box.append((start, max(start, stop)))
+                    index.append(slice(None, None, step))
+                else:
+                    low = stop + 1
+                    box.append((low, max(low, start + 1)))
+                    index.append(slice(start - low, None, step))
+            else:
+                raise TypeError(f"Unsupported index {k!r}.")
+        return box, tuple(index)
+
+    def __getitem__(self, key) -> ArrayLike:
+        try:
+            box, index = self._bounding_box(key)
+        except TypeError:
+            # Fancy indexing is applied to the fully loaded array.
+            return self[...][key]
+
+        box = [(start + o, stop + o) for (start, stop), o in zip(box, self._offset)]
+        out = np.empty(tuple(stop - start for start, stop in box), dtype=self.dtype)
+        if self._prefetch and self._cache is not None and out.size > 0:
+            self._prefetch_around(box)
+        for chunk_index in self.chunk_indices(box):
+            chunk = self._read_chunk(chunk_index)
+            src, dst = [], []
+            for (start, stop), sl in zip(box, self.chunk_slices(chunk_index)):
+                low, high = max(start, sl.start), min(stop, sl.stop)
+                src.append(slice(low - sl.start, high - sl.start))
+                dst.append(slice(low - start, high - start))
+            out[tuple(dst)] = chunk[tuple(src)]
+        return out[index]
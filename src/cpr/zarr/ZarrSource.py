@@ -1,11 +1,15 @@
-from os.path import exists, split, splitext
-from typing import Dict, List
+from os.path import split, splitext
+from typing import Dict, Hashable, List, Optional, Tuple
 
-import zarr
+import numpy as np
 from numpy._typing import ArrayLike
-from ome_zarr.io import parse_url
 
 from cpr.Resource import Resource
+from cpr.utilities import filesystem
+from cpr.utilities.filesystem import is_local, local_path
+from cpr.utilities.slicing import from_slices, rescale_slices, to_slices
+from cpr.zarr.ChunkCache import shared_chunk_cache
+from cpr.zarr.ChunkedArray import ChunkedArray
 
 
 class ZarrSource(Resource):
@@ -16,6 +20,20 @@ class ZarrSource(Resource):
 
     If `slices_start` and `slices_stop` indicate a ROI this ROI is loaded
     from storage and cached on `get_data()`.
+
+    With `lazy` a ChunkedArray view of the zarr-array, restricted to the
+    ROI, is returned instead. Chunks are then only read on access and kept
+    in an LRU cache, which is shared by all ZarrSources of the process.
+    Repeated and overlapping reads are served from this cache. Cached
+    chunks are keyed by the version of the array metadata, so they are
+    read again once the array is recreated, but not after chunks were
+    overwritten in place. With `prefetch` the chunks adjacent to every access are read in the
+    background.
+
+    If `resolution` or `max_bytes` is given, the pyramid level is selected
+    from the OME-Zarr multiscales metadata instead of `group`. The ROI is
+    then given in full resolution coordinates and rescaled to the selected
+    level.
     """
 
     def __init__(
@@ -27,6 +45,11 @@ class ZarrSource(Resource):
         slices_start: List[int],
         slices_stop: List[int],
         mode: str = "r",
+        lazy: bool = False,
+        cache_bytes: int = 2**28,
+        prefetch: bool = True,
+        resolution: List[float] = None,
+        max_bytes: int = None,
     ):
         """
         Parameters
@@ -44,7 +67,25 @@ class ZarrSource(Resource):
         slices_stop
             Stop indices of slices used to access the data
         mode
-            How to open the zarr container.
+            How to open the zarr container. Any mode other than "r" opens
+            the existing group for writing, it is never truncated.
+        lazy
+            Return a lazy ChunkedArray view on `get_data()`, by default
+            False
+        cache_bytes
+            Byte budget of the chunk cache used by lazy views, by default
+            256 MiB. Chunks are only cached in mode "r".
+        prefetch
+            Prefetch chunks adjacent to accessed chunks of lazy views, by
+            default True
+        resolution
+            Target pixel size per axis in the units of the multiscales
+            metadata. The coarsest level with a pixel size not larger than
+            `resolution` is selected. By default None
+        max_bytes
+            Maximum number of bytes of the ROI. Starting from the level
+            selected by `resolution`, coarser levels are selected until the
+            ROI fits. By default None
         """
 
         super(ZarrSource, self).__init__(
@@ -53,15 +94,14 @@ class ZarrSource(Resource):
             ext=ext,
         )
         self._group = group
-        if len(slices_start) > 0:
-            slices = []
-            for s, e in zip(slices_start, slices_stop):
-                slices.append(slice(s, e))
-            self._slices = tuple(slices)
-        else:
-            self._slices = None
+        self._slices = to_slices(slices_start, slices_stop)
 
         self._mode = mode
+        self.lazy = lazy
+        self.cache_bytes = cache_bytes
+        self.prefetch = prefetch
+        self.resolution = resolution
+        self.max_bytes = max_bytes
 
     @classmethod
     def from_path(
@@ -71,6 +111,7 @@ class ZarrSource(Resource):
         slices_start: List[int] = [],
         slices_stop: List[int] = [],
         mode: str = "r",
+        **kwargs,
     ):
         """Create new instance from file-path.
 
@@ -86,6 +127,8 @@ class ZarrSource(Resource):
             Stop indices of slices used to access the data
         mode
             How to open the zarr container.
+        kwargs
+            Passed on to the constructor e.g. `lazy`
 
         Returns
         -------
@@ -101,41 +144,156 @@ class ZarrSource(Resource):
             slices_start=slices_start,
             slices_stop=slices_stop,
             mode=mode,
+            **kwargs,
         )
 
+    @staticmethod
+    def _datasets(zdata) -> List[Dict]:
+        """Get the datasets of the first OME-Zarr multiscales entry."""
+        attrs = zdata.attrs.asdict()
+        multiscales = attrs.get("ome", attrs).get("multiscales", [])
+        if len(multiscales) == 0:
+            return []
+        return multiscales[0]["datasets"]
+
+    def _resolve_group(self, zdata) -> str:
+        """Get the path of the requested group within `zdata`.
+
+        If `group` does not exist but is an integer, it is interpreted as
+        pyramid level of the OME-Zarr multiscales metadata. Recent
+        ome-zarr versions name levels "s0", "s1", ... instead of "0", "1",
+        ...
+        """
+        if self._group in zdata or not self._group.isdigit():
+            return self._group
+        datasets = self._datasets(zdata)
+        if len(datasets) == 0:
+            return self._group
+        return datasets[int(self._group)]["path"]
+
+    @staticmethod
+    def _scale(dataset: Dict, array, base) -> List[float]:
+        """Get the pixel size of a level from its scale transformation or,
+        if missing, from its shape relative to the base level.
+        """
+        for transform in dataset.get("coordinateTransformations", []):
+            if transform["type"] == "scale":
+                return transform["scale"]
+        return [b / max(1, s) for b, s in zip(base.shape, array.shape)]
+
+    def _select_level(self, zdata) -> Tuple[str, Optional[Tuple]]:
+        """Select the pyramid level and the ROI within this level.
+
+        Returns
+        -------
+        Path of the selected level and the rescaled ROI
+        """
+        if self.resolution is None and self.max_bytes is None:
+            return self._resolve_group(zdata), self._slices
+
+        datasets = self._datasets(zdata)
+        assert (
+            len(datasets) > 0
+        ), "Selecting a level requires OME-Zarr multiscales metadata."
+        arrays = [zdata[d["path"]] for d in datasets]
+        scales = [self._scale(d, a, arrays[0]) for d, a in zip(datasets, arrays)]
+        base = arrays[0]
+        full = self._slices
+        if full is None:
+            full = tuple(slice(None) for _ in base.shape)
+
+        def roi(level):
+            factors = [s / b for s, b in zip(scales[level], scales[0])]
+            return rescale_slices(full, base.shape, factors)
+
+        def roi_bytes(level):
+            shape = [
+                len(range(*sl.indices(n)))
+                for sl, n in zip(roi(level), arrays[level].shape)
+            ]
+            return int(np.prod(shape)) * arrays[level].dtype.itemsize
+
+        level = 0
+        if self.resolution is not None:
+            assert len(self.resolution) == base.ndim, "`resolution` must match ndim."
+            for i, scale in enumerate(scales):
+                if all(s <= r * (1 + 1e-6) for s, r in zip(scale, self.resolution)):
+                    level = i
+        if self.max_bytes is not None:
+            while level < len(arrays) - 1 and roi_bytes(level) > self.max_bytes:
+                level += 1
+
+        if self._slices is None:
+            return datasets[level]["path"], None
+        return datasets[level]["path"], roi(level)
+
     def get_data(self) -> ArrayLike:
         """Access zarr data.
 
         The zarr data is loaded and cached iff `slices_start` and
-        `slices_end` is provided.
+        `slices_end` is provided and `lazy` is False.
 
         Returns
         -------
-        Either the zarr group or the actual data.
+        Either the zarr array, a lazy view or the actual data.
         """
 
         if self._data is None:
-            assert exists(self.get_path()), f"{self.get_path()} does not " f"exist."
-
-            store = parse_url(path=self.get_path(), mode=self._mode).store
-            zdata = zarr.group(store=store)
-            if self._slices is None:
-                self._data = zdata[self._group]
-            else:
-                self._data = zdata[self._group][self._slices]
+            assert self.exists(), f"{self.get_path()} does not " f"exist."
+            self._data = self._load()
 
         return self._data
 
+    def _store(self):
+        """Open the zarr store on the pooled filesystem of the location."""
+        if is_local(self.get_path()):
+            from ome_zarr.io import parse_url
+
+            return parse_url(path=local_path(self.get_path()), mode=self._mode).store
+
+        return filesystem.zarr_store(self.get_path(), read_only=self._mode == "r")
+
+    def _array_version(self, array) -> Hashable:
+        """Identify the current version of an array by its metadata file,
+        which is rewritten whenever the array is recreated."""
+        name = "zarr.json" if array.metadata.zarr_format == 3 else ".zarray"
+        return filesystem.version("/".join([self.get_path(), array.path, name]))
+
+    def _read_data(self) -> ArrayLike:
+        import zarr
+
+        # Like zarr.group, never truncate or create the group on read.
+        mode = "r" if self._mode == "r" else "r+"
+        zdata = zarr.open_group(store=self._store(), mode=mode)
+        group, slices = self._select_level(zdata)
+        if self.lazy:
+            cache = None
+            if self._mode == "r":
+                cache = shared_chunk_cache(self.cache_bytes)
+            array = zdata[group]
+            return ChunkedArray(
+                array,
+                region=slices,
+                cache=cache,
+                cache_key=(self.get_path(), group, self._array_version(array)),
+                prefetch=self.prefetch,
+            )
+        elif slices is None:
+            return zdata[group]
+        else:
+            return zdata[group][slices]
+
     def serialize(self) -> Dict:
         """Serialize to JSON serializable dict."""
         d = super(ZarrSource, self).serialize()
         d["group"] = self._group
-        starts, stops = [], []
-        if self._slices is not None:
-            for sl in self._slices:
-                starts.append(sl.start)
-                stops.append(sl.stop)
+        starts, stops = from_slices(self._slices)
         d["slices_start"] = starts
         d["slices_stop"] = stops
         d["mode"] = self._mode
+        d["lazy"] = self.lazy
+        d["cache_bytes"] = self.cache_bytes
+        d["prefetch"] = self.prefetch
+        d["resolution"] = self.resolution
+        d["max_bytes"] = self.max_bytes
         return d
@@ -0,0 +1,262 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+from typing import Dict, List, Tuple
+
+import numpy as np
+import xxhash
+from numpy._typing import ArrayLike
+
+from cpr.Target import Target
+from cpr.utilities.filesystem import is_local, local_path, zarr_store
+from cpr.utilities.hashing import array_header, hash_array
+from cpr.utilities.verification import (
+    is_chunk_verified,
+    mark_chunk_verified,
+    verified_chunks,
+)
+from cpr.zarr.ChunkedArray import ChunkedArray
+
+CHUNK_BYTES = 2**22
+COMPRESSORS = ("zstd", "lz4", "zlib", "none")
+
+
+class ZarrTarget(Target):
+    """Persists array data as zarr store and serializes a JSON serializable
+    dictionary.
+
+    The array is written chunk-wise to the dataset "0" of a zarr group. Each
+    chunk is hashed while it is written and the chunks are processed in a
+    thread pool. The chunk hashes are stored with the group and the
+    data_hash is computed over dtype, shape, chunk shape and the chunk
+    hashes.
+
+    When get_data() is called the stored chunk hashes are checked against
+    the data_hash and a ChunkedArray is returned. Only chunks which are
+    accessed are loaded and, depending on `verify`, hashed.
+
+    If `axes` is given, OME-Zarr multiscales metadata is written as well.
+    """
+
+    def __init__(
+        self,
+        location: str,
+        name: str,
+        ext: str = ".zarr",
+        data_hash: str = None,
+        hash_mode: str = "flat",
+        verify: str = "always",
+        chunks: List[int] = None,
+        compressor: str = "zstd",
+        compression_level: int = 5,
+        axes: List[str] = None,
+        max_workers: int = None,
+        store: str = None,
+    ):
+        """
+        Parameters
+        ----------
+        location
+            Where the zarr store is stored
+        name
+            Name of the zarr store
+        ext
+            File extension, must be .zarr
+        data_hash
+            Data hash, by default None
+        hash_mode
+            Either "flat" or "tree", used to hash the individual chunks. By
+            default "flat"
+        verify
+            Either "always", "cached" or "never". With "always" every
+            accessed chunk is hashed on read, with "cached" every chunk is
+            hashed only on its first read. Verified chunks are recorded
+            with their file fingerprint in the sidecar of local stores and
+            hashed again once the chunk file changes. By default "always"
+        chunks
+            Chunk shape, by default None i.e. chunks of about 4 MB
+        compressor
+            Blosc compressor "zstd", "lz4", "zlib" or "none", by default
+            "zstd"
+        compression_level
+            Blosc compression level, by default 5
+        axes
+            Axis names e.g. ["z", "y", "x"]. If given, OME-Zarr multiscales
+            metadata is written. By default None
+        max_workers
+            Number of threads used to write chunks, by default the number of
+            CPUs
+        store
+            Root directory of a content-addressed store shared by Targets,
+            by default None
+        """
+        assert ext == ".zarr", "`ext` must be .zarr."
+        assert compressor in COMPRESSORS, f"`compressor` must be one of {COMPRESSORS}."
+        self.chunks = chunks
+        self.compressor = compressor
+        self.compression_level = compression_level
+        self.axes = axes
+        self.max_workers = max_workers
+        super(ZarrTarget, self).__init__(
+            location=location,
+            name=name,
+            ext=ext,
+            data_hash=data_hash,
+            hash_mode=hash_mode,
+            verify=verify,
+            store=store,
+        )
+
+    def _chunk_shape(self, a: ArrayLike) -> Tuple[int, ...]:
+        """Get the chunk shape used to store `a`.
+
+        Without explicit `chunks` the largest axis is halved until a chunk
+        holds at most `CHUNK_BYTES`.
+        """
+        if self.chunks is not None:
+            assert len(self.chunks) == a.ndim, "`chunks` must match data.ndim."
+            return tuple(max(1, min(c, s)) for c, s in zip(self.chunks, a.shape))
+
+        chunks = [max(1, s) for s in a.shape]
+        while np.prod(chunks) * a.dtype.itemsize > CHUNK_BYTES and max(chunks) > 1:
+            i = int(np.argmax(chunks))
+            chunks[i] = -(-chunks[i] // 2)
+        return tuple(chunks)
+
+    def _root_hash(self, a: ArrayLike, chunks: Tuple[int, ...], chunk_hashes) -> str:
+        header = array_header(a) + f"{tuple(chunks)},".encode("ascii")
+        root = xxhash.xxh3_64(header)
+        for chunk_hash in chunk_hashes:
+            root.update(bytes.fromhex(chunk_hash))
+        return root.hexdigest()
+
+    def _iter_chunk_slices(self, a: ArrayLike, chunks: Tuple[int, ...]):
+        grid = tuple(-(-s // c) for s, c in zip(a.shape, chunks))
+        for index in np.ndindex(grid):
+            yield tuple(
+                slice(i * c, min((i + 1) * c, s))
+                for i, c, s in zip(index, chunks, a.shape)
+            )
+
+    def _map_chunks(self, fn, a: ArrayLike, chunks: Tuple[int, ...]) -> List[str]:
+        """Apply `fn` to all chunk slices of `a` in a thread pool.
+
+        At most twice as many chunks as workers are in flight, which bounds
+        the memory used by chunk copies.
+        """
+        max_workers = self.max_workers or cpu_count() or 1
+        results, pending = [], deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for sl in self._iter_chunk_slices(a, chunks):
+                pending.append(pool.submit(fn, sl))
+                if len(pending) >= 2 * max_workers:
+                    results.append(pending.popleft().result())
+            while len(pending) > 0:
+                results.append(pending.popleft().result())
+        return results
+
+    def _hash_data(self, data) -> str:
+        a = np.asanyarray(data)
+        chunks = self._chunk_shape(a)
+
+        def hash_chunk(sl):
+            return hash_array(a[sl], hash_mode=self.hash_mode)
+
+        return self._root_hash(a, chunks, self._map_chunks(hash_chunk, a, chunks))
+
+    def _compressors(self):
+        if self.compressor == "none":
+            return None
+
+        from zarr.codecs import BloscCodec
+
+        return BloscCodec(cname=self.compressor, clevel=self.compression_level)
+
+    def _write_options(self) -> Dict:
+        return {
+            "compressor": self.compressor,
+            "compression_level": self.compression_level,
+            "axes": self.axes,
+        }
+
+    def _write_hashed(self, path: str) -> str:
+        import zarr
+
+        a = np.asanyarray(self._data)
+        chunks = self._chunk_shape(a)
+        group = zarr.open_group(zarr_store(path), mode="w")
+        array = group.create_array(
+            "0",
+            shape=a.shape,
+            chunks=chunks,
+            dtype=a.dtype,
+            compressors=self._compressors(),
+        )
+
+        def write_chunk(sl):
+            block = np.ascontiguousarray(a[sl])
+            array[sl] = block
+            return hash_array(block, hash_mode=self.hash_mode)
+
+        chunk_hashes = self._map_chunks(write_chunk, a, chunks)
+        group.attrs["cpr"] = {"chunk_hashes": chunk_hashes}
+        if self.axes is not None:
+            from ome_zarr.writer import write_multiscales_metadata
+
+            write_multiscales_metadata(
+                group,
+                datasets=[
+                    {
+                        "path": "0",
+                        "coordinateTransformations": [
+                            {"type": "scale", "scale": [1.0] * a.ndim}
+                        ],
+                    }
+                ],
+                axes=self.axes,
+            )
+        return self._root_hash(a, chunks, chunk_hashes)
+
+    def _read_data(self) -> ChunkedArray:
+        import zarr
+
+        store = zarr_store(self.get_path(), read_only=True)
+        group = zarr.open_group(store, mode="r")
+        array = group["0"]
+        if self.verify == "never":
+            return ChunkedArray(array)
+
+        chunk_hashes = group.attrs["cpr"]["chunk_hashes"]
+        assert self._root_hash(array, array.chunks, chunk_hashes) == self.data_hash, (
+            "Loaded data has a different hash. This data is either "
+            "from a different run or corrupted."
+        )
+        grid = tuple(-(-s // c) for s, c in zip(array.shape, array.chunks))
+        # Verification sidecars are only kept for local stores.
+        cached = self.verify == "cached" and is_local(self.get_path())
+        path = local_path(self.get_path())
+        verified = verified_chunks(path) if cached else {}
+
+        def verify_chunk(index, block):
+            chunk_hash = chunk_hashes[np.ravel_multi_index(index, grid)]
+            chunk = "0/" + array.metadata.encode_chunk_key(index)
+            if cached and is_chunk_verified(verified, path, chunk, chunk_hash):
+                return
+            assert hash_array(block, hash_mode=self.hash_mode) == chunk_hash, (
+                f"Loaded chunk {index} has a different hash. This data is "
+                f"either from a different run or corrupted."
+            )
+            if cached:
+                verified[chunk] = mark_chunk_verified(path, chunk, chunk_hash)
+
+        return ChunkedArray(array, on_chunk=verify_chunk)
+
+    def serialize(self) -> Dict:
+        """Persist data and serialize to JSON serializable dict."""
+        d = super(ZarrTarget, self).serialize()
+        d["chunks"] = self.chunks
+        d["compressor"] = self.compressor
+        d["compression_level"] = self.compression_level
+        d["axes"] = self.axes
+        d["max_workers"] = self.max_workers
+        return d
@@ -0,0 +1,15 @@
+from typing import List
+
+import numpy as np
+
+from cpr.numpy.NumpyTarget import NumpyTarget
+
+
+def numpy_targets(location: str, n: int) -> List[NumpyTarget]:
+    """Create n NumpyTargets with distinct data which is not persisted yet."""
+    targets = []
+    for i in range(n):
+        t = NumpyTarget(location=location, name=f"t-{i}", ext=".npy")
+        t.set_data(np.full((4, 4), i))
+        targets.append(t)
+    return targets
@@ -0,0 +1,70 @@
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+from os.path import exists
+from unittest import TestCase
+
+import numpy as np
+
+from cpr.utilities import aio
+from tests.helpers import numpy_targets
+
+
+class AioTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        aio.configure()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_aserialize_aget_data(self):
+        target = numpy_targets(self.tmp_dir, 1)[0]
+        d = asyncio.run(target.aserialize())
+        assert exists(target.get_path())
+        assert d["data_hash"] == target.data_hash
+        assert target._data is None
+
+        data = asyncio.run(target.aget_data(cache=True))
+        np.testing.assert_array_equal(data, np.full((4, 4), 0))
+        assert target._data is data
+
+    def test_gather(self):
+        targets = numpy_targets(self.tmp_dir, 10)
+        serialized = asyncio.run(aio.gather_serialize(targets))
+        assert [d["name"] for d in serialized] == [f"t-{i}" for i in range(10)]
+
+        data = asyncio.run(aio.gather_data(targets))
+        for i, d in enumerate(data):
+            np.testing.assert_array_equal(d, np.full((4, 4), i))
+
+    def test_concurrency_limit(self):
+        aio.configure(max_workers=8, max_concurrency=2)
+        lock = threading.Lock()
+        running = {"now": 0, "max": 0}
+
+        def work():
+            with lock:
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+            time.sleep(0.01)
+            with lock:
+                running["now"] -= 1
+
+        async def run():
+            await asyncio.gather(*(aio.run_blocking(work) for _ in range(10)))
+
+        asyncio.run(run())
+        assert running["max"] == 2
+
+    def test_shared_executor(self):
+        async def thread_names():
+            return await asyncio.gather(
+                *(aio.run_blocking(threading.current_thread) for _ in range(4))
+            )
+
+        threads = asyncio.run(thread_names())
+        assert all(t.name.startswith("cpr-io") for t in threads)
+        assert aio.get_executor() is aio.get_executor()
@@ -0,0 +1,140 @@
+import json
+import shutil
+import tempfile
+from os.path import getsize, join
+from unittest import TestCase
+
+import numpy as np
+
+from cpr.collection.ResourceCollection import ResourceCollection, encode_manifest
+from cpr.collection.ResourceSequence import ResourceSequence
+from cpr.image.ImageSource import ImageSource
+from cpr.numpy.NumpyTarget import NumpyTarget
+from cpr.Serializer import cpr_serializer
+from cpr.storage.StorageIndex import StorageIndex
+
+
+class ResourceCollectionTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def _sources(self, n):
+        return [
+            ImageSource.from_path(
+                f"/data/plate/images/well-{i:04d}.tif",
+                metadata={"axes": "YX", "unit": "micron"},
+                resolution=[7.4, 7.4],
+            )
+            for i in range(n)
+        ]
+
+    def test_manifest(self):
+        sources = self._sources(100)
+        sources[3].metadata = {"axes": "ZYX", "unit": "micron"}
+        table = encode_manifest(sources)
+        manifest = json.loads(table.schema.metadata[b"cpr"])
+        assert manifest["constants"]["location"] == "/data/plate/images"
+        assert manifest["constants"]["resolution"] == [7.4, 7.4]
+        assert manifest["prefixes"] == {"name": "well-00"}
+        assert manifest["json_columns"] == ["metadata"]
+        assert table.column_names == ["name", "metadata"]
+        assert table.column("metadata").chunk(0).dictionary.to_pylist() == [
+            '{"axes": "YX", "unit": "micron"}',
+            '{"axes": "ZYX", "unit": "micron"}',
+        ]
+
+        sequence = ResourceSequence(table)
+        assert len(sequence) == 100
+        assert [s.serialize() for s in sequence] == [s.serialize() for s in sources]
+        assert sequence[-1].get_path() == "/data/plate/images/well-0099.tif"
+        assert len(sequence[10:20]) == 10
+        assert sequence[0].metadata is not sequence[1].metadata
+        with self.assertRaises(IndexError):
+            sequence[100]
+
+    def test_column_types(self):
+        targets = [
+            NumpyTarget(
+                location=self.tmp_dir,
+                name=f"t-{i}",
+                ext=".npy",
+                data_hash=f"{i:016x}",
+                mmap_mode=None if i % 2 else "r",
+            )
+            for i in range(4)
+        ]
+        sequence = ResourceSequence(encode_manifest(targets))
+        assert [t.serialize() for t in sequence] == [t.serialize() for t in targets]
+
+    def test_default_keys(self):
+        targets = [
+            NumpyTarget(
+                location=self.tmp_dir,
+                name=f"t-{i}",
+                ext=".npy",
+                data_hash=f"{i:016x}",
+                hash_mode="tree" if i % 2 else "flat",
+            )
+            for i in range(4)
+        ]
+        sequence = ResourceSequence(encode_manifest(targets))
+        assert [t.hash_mode for t in sequence] == ["flat", "tree", "flat", "tree"]
+
+    def test_homogeneous(self):
+        target = NumpyTarget(location=self.tmp_dir, name="t", ext=".npy")
+        with self.assertRaises(AssertionError):
+            encode_manifest(self._sources(2) + [target])
+
+    def test_serialize(self):
+        sources = self._sources(1000)
+        collection = ResourceCollection(location=self.tmp_dir, name="images")
+        collection.set_data(sources)
+
+        serializer = cpr_serializer()
+        blob = serializer.dumps({"images": collection})
+        assert len(blob) < 500
+        size = getsize(collection.get_path())
+        assert size < len(json.dumps([s.serialize() for s in sources])) / 10
+
+        loaded = serializer.loads(blob)["images"].get_data()
+        assert isinstance(loaded, ResourceSequence)
+        assert loaded[42].get_path() == sources[42].get_path()
+        assert loaded[42].get_metadata() == sources[42].get_metadata()
+
+    def test_targets(self):
+        targets = []
+        for i in range(3):
+            t = NumpyTarget(location=self.tmp_dir, name=f"t-{i}", ext=".npy")
+            t.set_data(np.full((4,), i))
+            targets.append(t)
+        collection = ResourceCollection(location=self.tmp_dir, name="targets")
+        collection.set_data(targets)
+        d = collection.serialize()
+
+        loaded = ResourceCollection(**d).get_data()
+        for i, t in enumerate(loaded):
+            np.testing.assert_array_equal(t.get_data(), np.full((4,), i))
+
+        # Targets in a referenced collection are not orphaned.
+        with open(join(self.tmp_dir, "record"), "wb") as f:
+            f.write(cpr_serializer().dumps([ResourceCollection(**d)]))
+        index = StorageIndex.build(
+            [self.tmp_dir], results=[join(self.tmp_dir, "record")]
+        )
+        assert index.orphans() == []
+
+    def test_hash_without_persisting(self):
+        pending = NumpyTarget(location=self.tmp_dir, name="pending", ext=".npy")
+        pending.set_data(np.arange(4))
+        collection = ResourceCollection(location=self.tmp_dir, name="pending")
+        collection.set_data([pending])
+        collection.compute_data_hash()
+        assert pending.data_hash is not None
+        assert not pending.exists()
+        assert pending._data is not None
+        expected = collection.data_hash
+        assert collection.serialize()["data_hash"] == expected
+        assert pending.exists()
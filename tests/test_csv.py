@@ -35,17 +35,26 @@ class CSVTest(TestCase):
         assert encoded_dict["data"]["location"] == self.tmp_dir
         assert encoded_dict["data"]["name"] == "test"
         assert encoded_dict["data"]["ext"] == ".csv"
-        assert encoded_dict["data"]["data_hash"] == "b44f1e9ba85e9b4d"
+        assert encoded_dict["data"]["data_hash"] == "b0d6cd03097d0b21"
 
-        assert exists(join(self.tmp_dir, "test-b44f1e9ba85e9b4d.csv"))
+        assert exists(join(self.tmp_dir, "test-b0d6cd03097d0b21.csv"))
 
         csv_dec = serializer.loads(encoded)
         assert isinstance(csv_dec, CSVTarget)
         assert all(csv_dec.get_data() == self.data)
-        assert csv_dec.get_path() == join(self.tmp_dir, "test-b44f1e9ba85e9b4d.csv")
+        assert csv_dec.get_path() == join(self.tmp_dir, "test-b0d6cd03097d0b21.csv")
         assert csv_dec.get_path() == csv.get_path()
         assert csv_dec.get_name() == csv.get_name()
 
+    def test_csv_target_chunked(self):
+        csv = CSVTarget.from_path(join(self.tmp_dir, "test.csv"))
+        csv.CHUNK_ROWS = 2
+        csv.set_data(self.data)
+        csv.serialize()
+
+        assert csv.data_hash == "b0d6cd03097d0b21"
+        assert all(pd.read_csv(csv.get_path(), index_col=0) == self.data)
+
     def test_csv_source(self):
         path = join(self.tmp_dir, "source_table.csv")
         self.data.to_csv(path, index=True)
@@ -74,3 +83,27 @@ class CSVTest(TestCase):
         assert csv_dec.get_path() == join(self.tmp_dir, "source_table.csv")
         assert csv_dec.get_path() == csv.get_path()
         assert csv_dec.get_name() == csv.get_name()
+
+    def test_csv_source_chunks(self):
+        path = join(self.tmp_dir, "source_table.csv")
+        self.data.to_csv(path, index=True)
+
+        csv = CSVSource.from_path(
+            path, usecols=["col2"], dtype={"col2": "category"}, chunksize=2
+        )
+
+        data = csv.get_data()
+        assert list(data.columns) == ["col2"]
+        assert data["col2"].dtype == "category"
+        assert all(data["col2"] == self.data["col2"])
+
+        chunks = list(csv.iter_chunks())
+        assert [len(c) for c in chunks] == [2, 1]
+        assert all(pd.concat(chunks)["col2"] == self.data["col2"])
+        assert len(list(csv.iter_chunks(chunksize=1))) == 3
+
+        serializer = cpr_serializer()
+        encoded_dict = json.loads(serializer.dumps(csv).decode())
+        assert encoded_dict["data"]["usecols"] == ["col2"]
+        assert encoded_dict["data"]["dtype"] == {"col2": "category"}
+        assert encoded_dict["data"]["chunksize"] == 2
@@ -0,0 +1,86 @@
+import json
+import shutil
+import tempfile
+from os.path import exists, join
+from unittest import TestCase
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from cpr.feather.FeatherSource import FeatherSource
+from cpr.feather.FeatherTarget import FeatherTarget
+from cpr.Serializer import cpr_serializer
+
+
+class FeatherTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data = pd.DataFrame(
+            {"col1": [1, 2, 3], "col2": ["a", "b", "c"], "col3": [0.5, 1.5, 2.5]}
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_feather_target(self):
+        serializer = cpr_serializer()
+
+        ft = FeatherTarget.from_path(join(self.tmp_dir, "test.feather"))
+        ft.set_data(self.data)
+
+        encoded = serializer.dumps(ft)
+
+        assert isinstance(encoded, bytes)
+
+        encoded_dict = json.loads(encoded.decode())
+
+        assert encoded_dict["__class__"] == "cpr.feather.FeatherTarget.FeatherTarget"
+        assert encoded_dict["data"]["location"] == self.tmp_dir
+        assert encoded_dict["data"]["name"] == "test"
+        assert encoded_dict["data"]["ext"] == ".feather"
+        assert encoded_dict["data"]["data_hash"] == "c5e390d92676b8b5"
+
+        assert exists(join(self.tmp_dir, "test-c5e390d92676b8b5.feather"))
+
+        ft_dec = serializer.loads(encoded)
+        assert isinstance(ft_dec, FeatherTarget)
+        assert_frame_equal(ft_dec.get_data(), self.data)
+        assert ft_dec.get_path() == ft.get_path()
+        assert ft_dec.get_name() == ft.get_name()
+
+    def test_schema_in_hash(self):
+        area = pd.DataFrame({"area": pd.array([1, 2, 3], dtype="int32")})
+        volume = pd.DataFrame({"volume": pd.array([1, 2, 3], dtype="int64")})
+        targets = []
+        for df in [area, volume]:
+            ft = FeatherTarget.from_path(join(self.tmp_dir, "measurements.feather"))
+            ft.set_data(df)
+            ft.serialize()
+            targets.append(ft)
+
+        assert targets[0].data_hash != targets[1].data_hash
+        assert_frame_equal(pd.read_feather(targets[0].get_path()), area)
+        assert_frame_equal(pd.read_feather(targets[1].get_path()), volume)
+
+    def test_feather_source(self):
+        path = join(self.tmp_dir, "source_table.feather")
+        self.data.to_feather(path)
+
+        ft = FeatherSource.from_path(path, columns=["col2"])
+        assert_frame_equal(ft.get_data(), self.data[["col2"]])
+
+        serializer = cpr_serializer()
+
+        encoded = serializer.dumps(ft)
+
+        encoded_dict = json.loads(encoded.decode())
+
+        assert encoded_dict["__class__"] == "cpr.feather.FeatherSource.FeatherSource"
+        assert encoded_dict["data"]["location"] == self.tmp_dir
+        assert encoded_dict["data"]["name"] == "source_table"
+        assert encoded_dict["data"]["ext"] == ".feather"
+        assert encoded_dict["data"]["columns"] == ["col2"]
+
+        ft_dec = serializer.loads(encoded)
+        assert isinstance(ft_dec, FeatherSource)
+        assert_frame_equal(ft_dec.get_data(), self.data[["col2"]])
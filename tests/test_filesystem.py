@@ -0,0 +1,228 @@
+import shutil
+import tempfile
+from os.path import exists, join
+from unittest import TestCase
+from unittest.mock import patch
+
+import fsspec
+import numpy as np
+import pandas as pd
+from fsspec.implementations.memory import MemoryFileSystem
+
+from cpr.csv.CSVTarget import CSVTarget
+from cpr.feather.FeatherSource import FeatherSource
+from cpr.feather.FeatherTarget import FeatherTarget
+from cpr.image.ImageSource import ImageSource
+from cpr.image.ImageTarget import ImageTarget
+from cpr.numpy.NumpyTarget import NumpyTarget
+from cpr.parquet.ParquetSource import ParquetSource
+from cpr.parquet.ParquetTarget import ParquetTarget
+from cpr.Resource import check_exists
+from cpr.Serializer import cpr_serializer
+from cpr.utilities import filesystem
+from cpr.zarr.ZarrSource import ZarrSource
+from cpr.zarr.ZarrTarget import ZarrTarget
+
+
+class MemoryFilesystemTest(TestCase):
+    location = "memory://results"
+
+    def tearDown(self) -> None:
+        fs = filesystem.get_filesystem("memory")
+        if fs.exists(self.location):
+            fs.rm(self.location, recursive=True)
+
+    def test_pooled_filesystem(self):
+        target = NumpyTarget(location=self.location, name="a", ext=".npy")
+        assert target.get_filesystem() is filesystem.get_filesystem("memory")
+        assert filesystem.get_protocol("/tmp/a.npy") == "file"
+        assert filesystem.is_local("file:///tmp/a.npy")
+        assert not filesystem.is_local(self.location)
+
+    def test_numpy_target(self):
+        target = NumpyTarget(location=self.location, name="a", ext=".npy")
+        target.set_data(np.arange(10))
+        d = target.serialize()
+        assert filesystem.exists(target.get_path())
+        assert filesystem.get_filesystem("memory").find(self.location) == [
+            f"/results/a-{target.data_hash}.npy"
+        ]
+        np.testing.assert_array_equal(NumpyTarget(**d).get_data(), np.arange(10))
+
+    def test_csv_target(self):
+        df = pd.DataFrame({"x": [1, 2, 3]})
+        target = CSVTarget(location=self.location, name="table", ext=".csv")
+        target.set_data(df)
+        pd.testing.assert_frame_equal(CSVTarget(**target.serialize()).get_data(), df)
+
+    def test_image(self):
+        img = np.arange(20, dtype=np.uint8).reshape(4, 5)
+        target = ImageTarget.from_path(join(self.location, "image.tif"))
+        target.set_data(img)
+        loaded = ImageTarget(**target.serialize())
+        np.testing.assert_array_equal(loaded.get_data(), img)
+
+        source = ImageSource.from_path(
+            loaded.get_path(), slices_start=[1, 1], slices_stop=[3, 4]
+        )
+        np.testing.assert_array_equal(source.get_data(), img[1:3, 1:4])
+
+    def test_zarr_source(self):
+        target = ZarrTarget(location=self.location, name="array", ext=".zarr")
+        target.set_data(np.ones((4, 5), dtype=np.uint16))
+        target.serialize()
+
+        source = ZarrSource.from_path(
+            target.get_path(), group="0", slices_start=[0, 1], slices_stop=[2, 5]
+        )
+        np.testing.assert_array_equal(
+            source.get_data(), np.ones((2, 4), dtype=np.uint16)
+        )
+
+    def test_store_requires_local_paths(self):
+        with self.assertRaises(AssertionError):
+            NumpyTarget(location=self.location, name="a", ext=".npy", store="/tmp")
+
+
+class IsolatedMemoryFileSystem(MemoryFileSystem):
+    """Memory filesystem whose files are only visible to its instance."""
+
+    protocol = "isolated"
+    cachable = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.store = {}
+        self.pseudo_dirs = [""]
+
+    @classmethod
+    def _strip_protocol(cls, path):
+        protocol, _, stripped = path.partition("://")
+        if protocol == "isolated":
+            path = stripped
+        return super()._strip_protocol(path)
+
+
+class PooledFilesystemTest(TestCase):
+    """All reads and writes must go through the pooled filesystem, which
+    is the only instance holding the data."""
+
+    location = "isolated://results"
+
+    def setUp(self) -> None:
+        fsspec.register_implementation(
+            "isolated", IsolatedMemoryFileSystem, clobber=True
+        )
+
+    def tearDown(self) -> None:
+        filesystem.configure_filesystem("isolated")
+
+    def test_tables(self):
+        df = pd.DataFrame({"x": [1, 2, 3], "y": [0.5, 1.5, 2.5]})
+        for target_cls, source_cls, ext in [
+            (ParquetTarget, ParquetSource, ".parquet"),
+            (FeatherTarget, FeatherSource, ".feather"),
+        ]:
+            target = target_cls(location=self.location, name="table", ext=ext)
+            target.set_data(df)
+            loaded = target_cls(**target.serialize())
+            pd.testing.assert_frame_equal(loaded.get_data(), df)
+            source = source_cls.from_path(loaded.get_path(), columns=["y"])
+            pd.testing.assert_frame_equal(source.get_data(), df[["y"]])
+
+    def test_zarr(self):
+        target = ZarrTarget(location=self.location, name="array", ext=".zarr")
+        target.set_data(np.ones((4, 5), dtype=np.uint16))
+        loaded = ZarrTarget(**target.serialize())
+        np.testing.assert_array_equal(loaded.get_data()[...], np.ones((4, 5)))
+        source = ZarrSource.from_path(loaded.get_path(), group="0")
+        np.testing.assert_array_equal(source.get_data()[...], np.ones((4, 5)))
+
+
+class LocalFilesystemTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_file_url(self):
+        target = NumpyTarget(location=f"file://{self.tmp_dir}", name="a", ext=".npy")
+        target.set_data(np.arange(10))
+        d = target.serialize()
+        assert exists(join(self.tmp_dir, f"a-{target.data_hash}.npy"))
+        np.testing.assert_array_equal(NumpyTarget(**d).get_data(), np.arange(10))
+
+    def test_move_and_remove(self):
+        src = join(self.tmp_dir, "src")
+        filesystem.makedirs(join(src, "nested"))
+        with filesystem.open_file(join(src, "nested", "f.txt"), "w") as f:
+            f.write("data")
+        dst = join(self.tmp_dir, "dst")
+        filesystem.move(src, dst)
+        assert not filesystem.exists(src)
+        assert filesystem.exists(join(dst, "nested", "f.txt"))
+        filesystem.remove(dst)
+        assert not exists(dst)
+
+
+class StatCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def _serialized(self, n):
+        serialized = []
+        for i in range(n):
+            t = NumpyTarget(location=self.tmp_dir, name=f"t-{i}", ext=".npy")
+            t.set_data(np.full((4,), i))
+            serialized.append(t.serialize())
+        return serialized
+
+    def test_path_cache(self):
+        target = NumpyTarget(location=self.tmp_dir, name="a", ext=".npy")
+        target.data_hash = "0" * 16
+        assert target.get_path() is target.get_path()
+        target.data_hash = "1" * 16
+        assert target.get_path() == join(self.tmp_dir, f"a-{'1' * 16}.npy")
+
+    def test_exists_cache(self):
+        target = NumpyTarget(**self._serialized(1)[0])
+        with patch("cpr.utilities.filesystem.exists", return_value=True) as exists:
+            target.get_data()
+            target.get_data()
+            assert exists.call_count == 1
+
+        missing = NumpyTarget(**dict(target.serialize(), data_hash="0" * 16))
+        assert not missing.exists()
+
+    def test_check_exists(self):
+        targets = [NumpyTarget(**d) for d in self._serialized(3)]
+        targets.append(NumpyTarget(**dict(targets[0].serialize(), data_hash="0" * 16)))
+        with patch("cpr.utilities.filesystem.exists", return_value=False) as exists:
+            assert check_exists(targets, min_batch=2) == [True, True, True, False]
+            # The listing decides for missing files as well.
+            exists.assert_not_called()
+        assert check_exists(targets[3:], min_batch=2) == [False]
+
+    def test_serializer_loads(self):
+        serializer = cpr_serializer(check_existence=True)
+        blob = serializer.dumps([NumpyTarget(**d) for d in self._serialized(20)])
+        with patch("cpr.utilities.filesystem.exists") as exists:
+            targets = serializer.loads(blob)
+            for t in targets:
+                t.get_data()
+            exists.assert_not_called()
+
+    def test_serializer_loads_without_io(self):
+        serializer = cpr_serializer()
+        blob = serializer.dumps([NumpyTarget(**d) for d in self._serialized(20)])
+        with patch("cpr.utilities.filesystem.exists") as exists, patch(
+            "cpr.utilities.filesystem.list_names"
+        ) as list_names:
+            targets = serializer.loads(blob)
+            exists.assert_not_called()
+            list_names.assert_not_called()
+        assert all(t.exists() for t in targets)
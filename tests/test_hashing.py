@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import numpy as np
+import xxhash
+
+from cpr.utilities.hashing import (
+    TREE_BLOCK_SIZE,
+    StreamHasher,
+    array_header,
+    hash_array,
+    iter_buffers,
+)
+
+
+def reference_hash(a):
+    data = bytes()
+    data += str(a.dtype).encode("ascii")
+    data += b","
+    data += str(a.shape).encode("ascii")
+    data += b","
+    data += a.tobytes()
+    return xxhash.xxh3_64(data).hexdigest()
+
+
+class HashingTest(TestCase):
+    def setUp(self) -> None:
+        np.random.seed(42)
+        self.data = np.random.rand(31, 17, 5)
+
+    def test_iter_buffers(self):
+        buffers = list(iter_buffers(self.data, chunk_size=1000))
+        assert all(len(b) <= 1000 for b in buffers)
+        assert b"".join(buffers) == self.data.tobytes()
+
+    def test_hash_array(self):
+        arrays = [
+            self.data,
+            self.data.T,
+            np.asfortranarray(self.data),
+            self.data[::2, 3:, ::-1],
+            self.data > 0.5,
+            np.array(3),
+            np.zeros((0, 4), dtype=np.uint16),
+        ]
+        for a in arrays:
+            assert hash_array(a) == reference_hash(a)
+            assert hash_array(a, chunk_size=100) == reference_hash(a)
+
+    def test_stream_hasher(self):
+        a = np.random.randint(0, 255, size=3 * TREE_BLOCK_SIZE + 7, dtype=np.uint8)
+        buffer = memoryview(a)
+        for hash_mode in ["flat", "tree"]:
+            hasher = StreamHasher(array_header(a), hash_mode=hash_mode, max_workers=2)
+            for start, end in [
+                (0, 5),
+                (5, TREE_BLOCK_SIZE + 11),
+                (TREE_BLOCK_SIZE + 11, len(a)),
+            ]:
+                hasher.update(buffer[start:end])
+            assert hasher.hexdigest() == hash_array(a, hash_mode=hash_mode)
+
+    def test_hash_array_tree(self):
+        digest = hash_array(self.data, hash_mode="tree")
+        assert digest != hash_array(self.data)
+        assert digest == hash_array(np.asfortranarray(self.data), hash_mode="tree")
+        assert digest == hash_array(self.data, hash_mode="tree", max_workers=1)
+        assert digest == hash_array(self.data[:, ::-1][:, ::-1], hash_mode="tree")
+        assert digest != hash_array(self.data[::-1], hash_mode="tree")
@@ -6,7 +6,7 @@ from unittest import TestCase
 
 import numpy as np
 from numpy.testing import assert_array_equal
-from tifffile import imwrite
+from tifffile import COMPRESSION, PREDICTOR, TiffFile, imwrite
 
 from cpr.image.ImageSource import ImageSource
 from cpr.image.ImageTarget import ImageTarget
@@ -60,6 +60,71 @@ class ImageTest(TestCase):
         assert img_dec.get_resolution() == img.get_resolution()
         assert img_dec.imagej == img.imagej
 
+    def test_image_target_compression(self):
+        serializer = cpr_serializer()
+        data = np.random.randint(0, 2**12, size=(3, 64, 64)).astype(np.uint16)
+
+        img = ImageTarget.from_path(
+            join(self.tmp_dir, "image.tif"),
+            imagej=False,
+            compression="zstd",
+            compression_level=5,
+            predictor=True,
+            maxworkers=2,
+        )
+        img.set_data(data)
+
+        encoded = serializer.dumps(img)
+
+        encoded_dict = json.loads(encoded.decode())
+        assert encoded_dict["data"]["compression"] == "zstd"
+        assert encoded_dict["data"]["compression_level"] == 5
+        assert encoded_dict["data"]["predictor"]
+        assert encoded_dict["data"]["maxworkers"] == 2
+
+        with TiffFile(img.get_path()) as tif:
+            assert tif.pages[0].compression == COMPRESSION.ZSTD
+            assert tif.pages[0].predictor == PREDICTOR.HORIZONTAL
+
+        img_dec = serializer.loads(encoded)
+        assert img_dec.compression == "zstd"
+        assert_array_equal(img_dec.get_data(), data)
+
+    def test_image_target_tiled(self):
+        data = np.random.randint(0, 255, size=(3, 100, 130)).astype(np.uint8)
+
+        img = ImageTarget.from_path(
+            join(self.tmp_dir, "image.tif"), imagej=False, tile=[32, 48], bigtiff=True
+        )
+        img.set_data(data)
+        img_dec = ImageTarget(**img.serialize())
+
+        assert img_dec.tile == [32, 48]
+        assert img_dec.bigtiff
+        with TiffFile(img.get_path()) as tif:
+            assert tif.is_bigtiff
+            assert tif.pages[0].is_tiled
+            assert tif.pages[0].tilelength == 32
+            assert tif.pages[0].tilewidth == 48
+        assert_array_equal(img_dec.get_data(), data)
+
+    def test_image_target_bigtiff_not_imagej(self):
+        data = np.random.randint(0, 255, size=(64, 64)).astype(np.uint8)
+
+        img = ImageTarget.from_path(join(self.tmp_dir, "image.tif"), bigtiff=True)
+        img.set_data(data)
+        img_dec = ImageTarget(**img.serialize())
+
+        with TiffFile(img.get_path()) as tif:
+            assert tif.is_bigtiff
+            assert not tif.is_imagej
+        assert_array_equal(img_dec.get_data(), data)
+
+        roi = ImageSource.from_path(
+            img.get_path(), slices_start=[1, 40], slices_stop=[2, 90]
+        )
+        assert_array_equal(roi.get_data(), data[1:2, 40:90])
+
     def test_image_source(self):
         path = join(self.tmp_dir, "source_img.tif")
         imwrite(path, self.data, compression="zlib")
@@ -88,3 +153,23 @@ class ImageTest(TestCase):
         assert img_dec.get_path() == join(self.tmp_dir, "source_img.tif")
         assert img_dec.get_path() == img.get_path()
         assert img_dec.get_name() == img.get_name()
+        assert encoded_dict["data"]["slices_start"] == []
+        assert encoded_dict["data"]["slices_stop"] == []
+
+    def test_image_source_roi(self):
+        path = join(self.tmp_dir, "source_img.tif")
+        imwrite(path, self.data, compression="zlib", tile=(32, 32))
+
+        img = ImageSource.from_path(path, slices_start=[10, 20], slices_stop=[-10, 50])
+
+        assert_array_equal(img.get_data(), self.data[10:-10, 20:50])
+
+        serializer = cpr_serializer()
+        encoded = serializer.dumps(img)
+
+        encoded_dict = json.loads(encoded.decode())
+        assert encoded_dict["data"]["slices_start"] == [10, 20]
+        assert encoded_dict["data"]["slices_stop"] == [-10, 50]
+
+        img_dec = serializer.loads(encoded)
+        assert_array_equal(img_dec.get_data(), self.data[10:-10, 20:50])
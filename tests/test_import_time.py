@@ -0,0 +1,80 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+HEAVY = ["pandas", "pyarrow", "tifffile", "zarr", "ome_zarr", "prefect", "fsspec"]
+
+# Modules which must import without any heavy dependency.
+LIGHT = [
+    "cpr.Resource",
+    "cpr.Target",
+    "cpr.numpy.NumpySource",
+    "cpr.numpy.NumpyTarget",
+    "cpr.csv.CSVSource",
+    "cpr.csv.CSVTarget",
+    "cpr.parquet.ParquetSource",
+    "cpr.parquet.ParquetTarget",
+    "cpr.feather.FeatherSource",
+    "cpr.feather.FeatherTarget",
+    "cpr.image.ImageSource",
+    "cpr.image.ImageTarget",
+    "cpr.zarr.ZarrSource",
+    "cpr.zarr.ZarrTarget",
+    "cpr.storage.StorageIndex",
+    "cpr.collection.ResourceCollection",
+    "cpr.collection.ResourceSequence",
+    "cpr.utilities.aio",
+    "cpr.utilities.filesystem",
+    "cpr.utilities.hashing",
+]
+
+
+def import_times(module: str) -> dict:
+    """Import `module` in a fresh interpreter with `-X importtime`.
+
+    Returns
+    -------
+    Cumulative import time in microseconds of every imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class ImportTimeTest(TestCase):
+    def test_no_heavy_imports(self):
+        for module in LIGHT:
+            with self.subTest(module=module):
+                times = import_times(module)
+                heavy = sorted(
+                    f"{name} ({times[name] / 1000:.0f} ms)"
+                    for name in HEAVY
+                    if name in times
+                )
+                assert heavy == [], f"{module} imports {', '.join(heavy)}."
+
+    def test_import_on_use(self):
+        script = (
+            "import sys, tempfile\n"
+            "from cpr.collection.ResourceCollection import ResourceCollection\n"
+            "from cpr.numpy.NumpySource import NumpySource\n"
+            "c = ResourceCollection(location=tempfile.mkdtemp(), name='c')\n"
+            "print('pyarrow' in sys.modules)\n"
+            "c.set_data([NumpySource(location='/d', name='a', ext='.npy')])\n"
+            "c.serialize()\n"
+            "print('pyarrow' in sys.modules, 'pandas' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.split() == ["False", "True", "False"]
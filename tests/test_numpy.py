@@ -1,8 +1,10 @@
 import json
+import os
 import shutil
 import tempfile
 from os.path import exists, join
 from unittest import TestCase
+from unittest.mock import patch
 
 import numpy as np
 from numpy.testing import assert_array_equal
@@ -48,6 +50,84 @@ class NumpyTest(TestCase):
         assert nparr_dec.get_path() == nparr.get_path()
         assert nparr_dec.get_name() == nparr.get_name()
 
+    def test_numpy_target_existing(self):
+        for data in [self.data, np.asfortranarray(self.data)]:
+            nparr = NumpyTarget.from_path(join(self.tmp_dir, "data.npy"))
+            nparr.set_data(data)
+            nparr.serialize()
+            assert nparr.data_hash == "1c4594fe64aab38f"
+
+        assert os.listdir(self.tmp_dir) == ["data-1c4594fe64aab38f.npy"]
+        assert_array_equal(np.load(nparr.get_path()), self.data)
+
+    def test_numpy_target_tree_hash(self):
+        serializer = cpr_serializer()
+
+        nparr = NumpyTarget.from_path(join(self.tmp_dir, "data.npy"), hash_mode="tree")
+        nparr.set_data(self.data)
+
+        encoded = serializer.dumps(nparr)
+
+        encoded_dict = json.loads(encoded.decode())
+        assert encoded_dict["data"]["hash_mode"] == "tree"
+        assert encoded_dict["data"]["data_hash"] != "1c4594fe64aab38f"
+
+        nparr_dec = serializer.loads(encoded)
+        assert nparr_dec.hash_mode == "tree"
+        assert_array_equal(nparr_dec.get_data(), self.data)
+
+    def test_numpy_target_mmap(self):
+        serializer = cpr_serializer()
+
+        nparr = NumpyTarget.from_path(join(self.tmp_dir, "data.npy"), mmap_mode="r")
+        nparr.set_data(self.data)
+
+        encoded = serializer.dumps(nparr)
+
+        encoded_dict = json.loads(encoded.decode())
+        assert encoded_dict["data"]["mmap_mode"] == "r"
+        assert encoded_dict["data"]["data_hash"] == "1c4594fe64aab38f"
+
+        data = serializer.loads(encoded).get_data()
+        assert isinstance(data, np.memmap)
+        assert_array_equal(data[10:20], self.data[10:20])
+
+    def test_numpy_target_mmap_modes(self):
+        path = join(self.tmp_dir, "data.npy")
+        for mode in ["r+", "w+", "x"]:
+            with self.assertRaises(AssertionError):
+                NumpyTarget.from_path(path, mmap_mode=mode)
+
+        nparr = NumpyTarget.from_path(path, mmap_mode="c")
+        assert nparr.verify == "cached"
+        nparr.set_data(self.data)
+        nparr_dec = NumpyTarget(**nparr.serialize())
+        assert nparr_dec.verify == "cached"
+
+        data = nparr_dec.get_data()
+        data[0] = 255 - self.data[0]
+        assert_array_equal(NumpyTarget(**nparr.serialize()).get_data(), self.data)
+        assert NumpyTarget.from_path(path).verify == "always"
+
+    def test_numpy_target_verify(self):
+        nparr = NumpyTarget.from_path(join(self.tmp_dir, "data.npy"), verify="cached")
+        nparr.set_data(self.data)
+        nparr_dec = NumpyTarget(**nparr.serialize())
+
+        assert nparr_dec.verify == "cached"
+        assert_array_equal(nparr_dec.get_data(), self.data)
+        assert exists(join(self.tmp_dir, ".data-1c4594fe64aab38f.npy.verified"))
+
+        with patch.object(NumpyTarget, "_hash_data", side_effect=RuntimeError):
+            assert_array_equal(nparr_dec.get_data(), self.data)
+
+        np.save(nparr.get_path(), self.data[::-1])
+        with self.assertRaises(AssertionError):
+            nparr_dec.get_data()
+
+        nparr_dec.verify = "never"
+        assert_array_equal(nparr_dec.get_data(), self.data[::-1])
+
     def test_numpy_source(self):
         path = join(self.tmp_dir, "source_data.npy")
         np.save(path, self.data)
@@ -67,3 +147,17 @@ class NumpyTest(TestCase):
         assert encoded_dict["data"]["location"] == self.tmp_dir
         assert encoded_dict["data"]["name"] == "source_data"
         assert encoded_dict["data"]["ext"] == ".npy"
+        assert encoded_dict["data"]["mmap_mode"] is None
+
+    def test_numpy_source_mmap(self):
+        path = join(self.tmp_dir, "source_data.npy")
+        np.save(path, self.data)
+
+        nparr = NumpySource.from_path(path, mmap_mode="r")
+        data = nparr.get_data()
+        assert isinstance(data, np.memmap)
+        assert_array_equal(data[:, 5], self.data[:, 5])
+
+        serializer = cpr_serializer()
+        nparr_dec = serializer.loads(serializer.dumps(nparr))
+        assert nparr_dec.mmap_mode == "r"
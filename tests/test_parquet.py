@@ -0,0 +1,96 @@
+import json
+import shutil
+import tempfile
+from os.path import exists, join
+from unittest import TestCase
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from cpr.parquet.ParquetSource import ParquetSource
+from cpr.parquet.ParquetTarget import ParquetTarget
+from cpr.Serializer import cpr_serializer
+
+
+class ParquetTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data = pd.DataFrame(
+            {"col1": [1, 2, 3], "col2": ["a", "b", "c"], "col3": [0.5, 1.5, 2.5]}
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_parquet_target(self):
+        serializer = cpr_serializer()
+
+        pq = ParquetTarget.from_path(join(self.tmp_dir, "test.parquet"))
+        pq.set_data(self.data)
+
+        encoded = serializer.dumps(pq)
+
+        assert isinstance(encoded, bytes)
+
+        encoded_dict = json.loads(encoded.decode())
+
+        assert encoded_dict["__class__"] == "cpr.parquet.ParquetTarget.ParquetTarget"
+        assert encoded_dict["data"]["location"] == self.tmp_dir
+        assert encoded_dict["data"]["name"] == "test"
+        assert encoded_dict["data"]["ext"] == ".parquet"
+        assert encoded_dict["data"]["data_hash"] == "c5e390d92676b8b5"
+        assert encoded_dict["data"]["row_group_size"] is None
+
+        assert exists(join(self.tmp_dir, "test-c5e390d92676b8b5.parquet"))
+
+        pq_dec = serializer.loads(encoded)
+        assert isinstance(pq_dec, ParquetTarget)
+        assert_frame_equal(pq_dec.get_data(), self.data)
+        assert pq_dec.get_path() == pq.get_path()
+        assert pq_dec.get_name() == pq.get_name()
+
+    def test_schema_in_hash(self):
+        area = pd.DataFrame({"area": pd.array([1, 2, 3], dtype="int32")})
+        volume = pd.DataFrame({"volume": pd.array([1, 2, 3], dtype="int64")})
+        targets = []
+        for df in [area, volume]:
+            pq = ParquetTarget.from_path(join(self.tmp_dir, "measurements.parquet"))
+            pq.set_data(df)
+            pq.serialize()
+            targets.append(pq)
+
+        assert targets[0].data_hash != targets[1].data_hash
+        assert_frame_equal(pd.read_parquet(targets[0].get_path()), area)
+        assert_frame_equal(pd.read_parquet(targets[1].get_path()), volume)
+
+    def test_parquet_source(self):
+        path = join(self.tmp_dir, "source_table.parquet")
+        self.data.to_parquet(path, row_group_size=1)
+
+        pq = ParquetSource.from_path(path)
+        assert_frame_equal(pq.get_data(), self.data)
+
+        pq = ParquetSource.from_path(
+            path, columns=["col1", "col3"], filters=[["col1", ">", 1]]
+        )
+        assert_frame_equal(
+            pq.get_data().reset_index(drop=True),
+            self.data[["col1", "col3"]][1:].reset_index(drop=True),
+        )
+
+        serializer = cpr_serializer()
+
+        encoded = serializer.dumps(pq)
+
+        encoded_dict = json.loads(encoded.decode())
+
+        assert encoded_dict["__class__"] == "cpr.parquet.ParquetSource.ParquetSource"
+        assert encoded_dict["data"]["location"] == self.tmp_dir
+        assert encoded_dict["data"]["name"] == "source_table"
+        assert encoded_dict["data"]["ext"] == ".parquet"
+        assert encoded_dict["data"]["columns"] == ["col1", "col3"]
+        assert encoded_dict["data"]["filters"] == [["col1", ">", 1]]
+
+        pq_dec = serializer.loads(encoded)
+        assert isinstance(pq_dec, ParquetSource)
+        assert_frame_equal(pq_dec.get_data(), pq.get_data())
@@ -0,0 +1,70 @@
+import shutil
+import tempfile
+from os.path import join
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from cpr.numpy.NumpySource import NumpySource
+from cpr.numpy.NumpyTarget import NumpyTarget
+from cpr.utilities import prefetch
+
+
+class PrefetchTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        prefetch.clear()
+
+    def tearDown(self) -> None:
+        prefetch.clear()
+        prefetch.set_max_prefetched(16)
+        shutil.rmtree(self.tmp_dir)
+
+    def _target(self, value=1):
+        target = NumpyTarget(location=self.tmp_dir, name="data", ext=".npy")
+        target.set_data(np.full((8, 8), value))
+        target.serialize()
+        return target
+
+    def test_get_data_takes_prefetched(self):
+        target = self._target()
+        future = target.prefetch_data()
+        np.testing.assert_array_equal(future.result(), np.full((8, 8), 1))
+
+        downstream = NumpyTarget(**target.serialize())
+        with patch.object(NumpyTarget, "_read_data") as read:
+            data = downstream.get_data()
+            read.assert_not_called()
+        assert data is future.result()
+
+        # The data is handed over once.
+        with patch.object(NumpyTarget, "_read_data") as read:
+            downstream.get_data()
+            read.assert_called_once()
+
+    def test_source_version(self):
+        path = join(self.tmp_dir, "array.npy")
+        np.save(path, np.zeros((4,)))
+        source = NumpySource.from_path(path)
+        source.prefetch_data().result()
+
+        np.save(path, np.ones((4, 4)))
+        np.testing.assert_array_equal(source.get_data(), np.ones((4, 4)))
+
+    def test_different_params(self):
+        target = self._target()
+        target.prefetch_data().result()
+        mmap = NumpyTarget(**dict(target.serialize(), mmap_mode="r"))
+        assert isinstance(mmap.get_data(), np.memmap)
+
+    def test_max_prefetched(self):
+        prefetch.set_max_prefetched(1)
+        first = self._target(1)
+        second = NumpyTarget(location=self.tmp_dir, name="other", ext=".npy")
+        second.set_data(np.full((8, 8), 2))
+        second.serialize()
+        first.prefetch_data().result()
+        second.prefetch_data().result()
+        assert prefetch.take(first._prefetch_key()) is None
+        assert prefetch.take(second._prefetch_key()) is not None
@@ -0,0 +1,69 @@
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from prefect.serializers import JSONSerializer
+
+from cpr.Serializer import cpr_serializer
+from cpr.utilities.release import deferred_collection, get_gc_policy, set_gc_policy
+from tests.helpers import numpy_targets
+
+
+class ReleaseTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.policy = get_gc_policy()
+
+    def tearDown(self) -> None:
+        set_gc_policy(self.policy)
+        shutil.rmtree(self.tmp_dir)
+
+    def _count_collections(self, policy, fn):
+        set_gc_policy(policy)
+        with patch("cpr.utilities.release.gc.collect") as collect:
+            fn()
+            return collect.call_count
+
+    def test_release(self):
+        t = numpy_targets(self.tmp_dir, 1)[0]
+        assert t.release()
+        assert t._data is None
+        assert not t.release()
+
+    def test_policies(self):
+        serializer = JSONSerializer(object_encoder="cpr.Serializer.target_encoder")
+
+        def serial():
+            serializer.dumps(numpy_targets(self.tmp_dir, 3))
+
+        assert self._count_collections("always", serial) == 3
+        assert self._count_collections("deferred", serial) == 0
+        assert self._count_collections("never", serial) == 0
+
+        def batched():
+            cpr_serializer().dumps(numpy_targets(self.tmp_dir, 3))
+
+        assert self._count_collections("always", batched) == 1
+        assert self._count_collections("deferred", batched) == 1
+        assert self._count_collections("never", batched) == 0
+
+    def test_deferred_collection(self):
+        def nested():
+            with deferred_collection():
+                with deferred_collection():
+                    for t in numpy_targets(self.tmp_dir, 3):
+                        t.release()
+                assert t._data is None
+
+        assert self._count_collections("always", nested) == 1
+
+        def nothing_released():
+            with deferred_collection():
+                pass
+
+        assert self._count_collections("always", nothing_released) == 0
+
+    def test_invalid_policy(self):
+        with self.assertRaises(AssertionError):
+            set_gc_policy("sometimes")
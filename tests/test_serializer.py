@@ -0,0 +1,164 @@
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections import OrderedDict, defaultdict, namedtuple
+from datetime import datetime
+from os.path import join
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from numpy.testing import assert_array_equal
+from prefect.results import ResultRecordMetadata
+from prefect.serializers import JSONSerializer, Serializer
+
+import cpr.numpy.NumpyTarget as numpy_target_module
+from cpr.numpy.NumpyTarget import NumpyTarget
+from cpr.Serializer import (
+    CPRSerializer,
+    cpr_serializer,
+    find_targets,
+    resolve_class,
+    target_decoder,
+)
+from tests.helpers import numpy_targets
+
+
+class SerializerTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        np.random.seed(42)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_find_targets(self):
+        t = numpy_targets(self.tmp_dir, 3)
+        result = {"a": [t[0], (t[1], "x")], "b": {"c": t[2]}, "d": t[0], "e": 1}
+        assert find_targets(result) == t
+
+    def test_resolve_class_cache(self):
+        resolve_class.cache_clear()
+        d = {
+            "__class__": "cpr.numpy.NumpyTarget.NumpyTarget",
+            "data": {"location": self.tmp_dir, "name": "a", "ext": ".npy"},
+        }
+        with patch(
+            "cpr.utilities.imports.import_module", return_value=numpy_target_module
+        ) as resolve:
+            targets = [target_decoder(dict(d)) for _ in range(3)]
+            resolve.assert_called_once()
+        assert all(isinstance(t, NumpyTarget) for t in targets)
+
+    def test_orjson(self):
+        targets = numpy_targets(self.tmp_dir, 3)
+        data = [t._data for t in targets]
+        when = datetime(2024, 1, 1, 12)
+        result = {"tiles": targets, "n": 3, "when": when}
+
+        serializer = cpr_serializer(jsonlib="orjson")
+        encoded = serializer.dumps(result)
+        assert json.loads(encoded.decode()) == json.loads(
+            cpr_serializer().dumps(result).decode()
+        )
+        decoded = serializer.loads(encoded)
+        assert decoded["n"] == 3
+        assert decoded["when"] == when
+        assert_array_equal(decoded["tiles"][2].get_data(), data[2])
+
+        # Result records are readable by a plain JSONSerializer.
+        restored = Serializer(**json.loads(serializer.model_dump_json()))
+        assert type(restored) is JSONSerializer
+        assert restored.loads(encoded)["when"] == when
+
+    def test_orjson_fallbacks(self):
+        targets = numpy_targets(self.tmp_dir, 2)
+        result = {1: targets[0], 2.5: [targets[1]], None: "x"}
+        with patch("cpr.Serializer.json.dumps") as json_dumps:
+            cpr_serializer(jsonlib="orjson").dumps(result)
+            json_dumps.assert_not_called()
+
+        result["big"] = 2**70
+        encoded = cpr_serializer(jsonlib="orjson").dumps(result)
+        assert json.loads(encoded.decode()) == json.loads(
+            cpr_serializer().dumps(result).decode()
+        )
+        decoded = cpr_serializer(jsonlib="orjson").loads(encoded)
+        assert decoded["big"] == 2**70
+        assert_array_equal(decoded["1"].get_data(), targets[0].get_data())
+
+    def test_orjson_equivalence(self):
+        point = namedtuple("Point", ["x", "y"])
+        for result in [
+            {"area": float("nan"), "max": [float("inf")]},
+            defaultdict(list, {"tiles": numpy_targets(self.tmp_dir, 1)}),
+            OrderedDict(b=1, a=2),
+            {"point": point(1, 2)},
+        ]:
+            with self.subTest(result=result):
+                encoded = cpr_serializer(jsonlib="orjson").dumps(result)
+                expected = cpr_serializer().dumps(result)
+                assert repr(json.loads(encoded)) == repr(json.loads(expected))
+                decoded = cpr_serializer(jsonlib="orjson").loads(encoded)
+                assert type(decoded) is dict
+                assert list(decoded) == list(result)
+
+    def test_batch_serialization(self):
+        targets = numpy_targets(self.tmp_dir, 8)
+        data = [t._data for t in targets]
+        result = {"tiles": targets[:6], "extra": (targets[6], {"t": targets[7]})}
+
+        serializer = cpr_serializer(max_workers=4)
+        assert isinstance(serializer, JSONSerializer)
+        with patch("cpr.utilities.release.gc.collect") as collect:
+            encoded = serializer.dumps(result)
+            collect.assert_called_once()
+        assert all(t._data is None for t in targets)
+
+        expected = JSONSerializer(
+            object_encoder="cpr.Serializer.target_encoder",
+            object_decoder="cpr.Serializer.target_decoder",
+        ).dumps(result)
+        assert encoded == expected
+
+        decoded = serializer.loads(encoded)
+        assert_array_equal(decoded["tiles"][3].get_data(), data[3])
+        assert_array_equal(decoded["extra"][1]["t"].get_data(), data[7])
+
+        encoded_dict = json.loads(encoded.decode())
+        assert encoded_dict["tiles"][0]["__class__"] == (
+            "cpr.numpy.NumpyTarget.NumpyTarget"
+        )
+
+    def test_result_record_in_fresh_process(self):
+        targets = numpy_targets(self.tmp_dir, 2)
+        serializer = cpr_serializer(max_workers=2, jsonlib="orjson")
+        metadata = ResultRecordMetadata(serializer=serializer).dump_bytes()
+        assert json.loads(metadata)["serializer"]["type"] == "json"
+
+        blob_path = join(self.tmp_dir, "result.json")
+        with open(blob_path, "wb") as f:
+            f.write(serializer.dumps(targets))
+        script = (
+            "import sys\n"
+            "from prefect.results import ResultRecordMetadata\n"
+            f"metadata = ResultRecordMetadata.load_bytes({metadata!r})\n"
+            "assert 'cpr.Serializer' not in sys.modules\n"
+            f"with open({blob_path!r}, 'rb') as f:\n"
+            "    targets = metadata.serializer.loads(f.read())\n"
+            "print(sum(int(t.get_data().sum()) for t in targets))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        expected = sum(int(t.get_data().sum()) for t in targets)
+        assert int(result.stdout) == expected
+
+    def test_dispatch(self):
+        serializer = Serializer(type="cpr-json")
+        assert isinstance(serializer, CPRSerializer)
+        assert serializer.object_encoder == "cpr.Serializer.target_encoder"
+        assert serializer.object_decoder == "cpr.Serializer.target_decoder"
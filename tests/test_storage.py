@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+import time
+from os.path import exists, join
+from unittest import TestCase
+
+import numpy as np
+from prefect.results import ResultRecord, ResultRecordMetadata
+
+from cpr.cli import main, parse_size
+from cpr.image.ImageTarget import ImageTarget
+from cpr.numpy.NumpyTarget import NumpyTarget
+from cpr.Serializer import cpr_serializer
+from cpr.storage.StorageIndex import StorageIndex, scan
+from cpr.utilities.verification import mark_verified, sidecar_path
+
+
+class StorageIndexTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.location = join(self.tmp_dir, "results")
+        self.store = join(self.tmp_dir, "store")
+        self.records = join(self.tmp_dir, "records")
+        os.makedirs(join(self.location, "nested"))
+        os.makedirs(self.records)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def _target(self, name, value, location=None, store=None):
+        t = NumpyTarget(
+            location=location or self.location, name=name, ext=".npy", store=store
+        )
+        t.set_data(np.full((32, 32), value, dtype=np.float64))
+        return t
+
+    def _record(self, name, result):
+        record = ResultRecord(
+            result=result,
+            metadata=ResultRecordMetadata(
+                serializer=cpr_serializer(), storage_key=name
+            ),
+        )
+        with open(join(self.records, name), "wb") as f:
+            f.write(record.serialize())
+
+    def test_index(self):
+        kept = self._target("img", 1)
+        self._record("task-1", [kept])
+        old = self._target("img", 2)
+        old.serialize()
+        nested = self._target("other", 3, location=join(self.location, "nested"))
+        nested.serialize()
+        mark_verified(old.get_path(), old.data_hash)
+        linked = self._target("linked", 4, store=self.store)
+        self._record("task-2", {"t": linked})
+        orphan_blob = self._target("blob", 5, store=self.store)
+        orphan_blob.serialize()
+        os.remove(orphan_blob.get_path())
+        os.makedirs(join(self.location, ".tmp"))
+
+        entries = {e.path: e for e in scan([self.location, self.store])}
+        assert set(entries) == {
+            kept.get_path(),
+            old.get_path(),
+            nested.get_path(),
+            linked.get_path(),
+            linked.get_blob_path(),
+            orphan_blob.get_blob_path(),
+        }
+        assert entries[linked.get_path()].kind == "link"
+        assert entries[linked.get_blob_path()].kind == "blob"
+        assert entries[old.get_path()].size == os.path.getsize(old.get_path())
+
+        index = StorageIndex.build([self.location, self.store], [self.records])
+        orphans = {e.path for e in index.orphans()}
+        assert orphans == {
+            old.get_path(),
+            nested.get_path(),
+            orphan_blob.get_blob_path(),
+        }
+        report = index.report()
+        assert report[(self.location, "img")]["files"] == 2
+        assert (
+            report[(self.location, "img")]["orphaned"] == entries[old.get_path()].size
+        )
+
+        now = time.time()
+        os.utime(nested.get_path(), (now - 10 * 86400, now - 10 * 86400))
+        index = StorageIndex.build([self.location, self.store], [self.records])
+        plan = index.plan_eviction(max_age=5 * 86400, now=now)
+        assert [e.path for e in plan] == [nested.get_path()]
+
+        plan = index.plan_eviction(budget=index.total_size() - 1, policy="age")
+        assert [e.path for e in plan] == [nested.get_path()]
+        plan = index.plan_eviction(budget=0, min_age=5 * 86400, now=now)
+        assert [e.path for e in plan] == [nested.get_path()]
+        assert index.plan_eviction() == []
+
+        freed = index.evict(index.plan_eviction(budget=0))
+        assert freed == sum(entries[p].size for p in orphans)
+        assert not exists(old.get_path())
+        assert not exists(sidecar_path(old.get_path()))
+        assert not exists(orphan_blob.get_blob_path())
+        assert exists(kept.get_path())
+        assert exists(linked.get_blob_path())
+
+    def test_blob_with_write_options(self):
+        img = ImageTarget(
+            location=self.location,
+            name="img",
+            ext=".tif",
+            resolution=(0.5, 0.5),
+            store=self.store,
+        )
+        img.set_data(np.ones((16, 16), dtype=np.uint8))
+        self._record("task-1", [img])
+        os.remove(img.get_path())
+
+        index = StorageIndex.build([self.location, self.store], [self.records])
+        assert [e.path for e in index.entries] == [img.get_blob_path()]
+        assert index.orphans() == []
+
+    def test_cli(self):
+        t = self._target("img", 1)
+        t.serialize()
+        main(["du", self.location])
+        gc = ["gc", self.location, "--results", self.records, "--budget", "0"]
+        with self.assertRaises(SystemExit):
+            main(gc)
+        main(gc + ["--older-than", "0", "--dry-run"])
+        main(gc + ["--older-than", "0"])
+        assert exists(t.get_path())
+        main(gc + ["--older-than", "1", "--delete"])
+        assert exists(t.get_path())
+        main(gc + ["--older-than", "0", "--delete"])
+        assert not exists(t.get_path())
+        assert parse_size("1.5K") == 1536
+        assert parse_size("2GiB") == 2 * 2**30
@@ -0,0 +1,131 @@
+import json
+import os
+import shutil
+import tempfile
+from os.path import islink, join, realpath
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_array_equal
+from tifffile import TiffFile
+
+from cpr.csv.CSVTarget import CSVTarget
+from cpr.image.ImageTarget import ImageTarget
+from cpr.numpy.NumpyTarget import NumpyTarget
+from cpr.Serializer import cpr_serializer
+from cpr.storage.StorageIndex import scan
+from cpr.utilities.store import blob_path, read_refs
+from cpr.zarr.ZarrTarget import ZarrTarget
+
+
+class StoreTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = join(self.tmp_dir, "store")
+        np.random.seed(42)
+        self.data = np.random.randint(0, 255, size=(64, 64)).astype(np.uint8)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_shared_blob(self):
+        t1 = NumpyTarget(
+            location=join(self.tmp_dir, "flow1"),
+            name="a",
+            ext=".npy",
+            store=self.store,
+        )
+        t1.set_data(self.data)
+        t1.serialize()
+        os.makedirs(join(self.tmp_dir, "flow2"))
+        t2 = NumpyTarget(
+            location=join(self.tmp_dir, "flow2"),
+            name="b",
+            ext=".npy",
+            store=self.store,
+        )
+        t2.set_data(self.data.copy())
+        with patch.object(NumpyTarget, "_write_hashed") as write:
+            encoded = cpr_serializer().dumps(t2)
+            write.assert_not_called()
+
+        assert t1.data_hash == t2.data_hash
+        blob = blob_path(self.store, t1.data_hash, ".npy")
+        assert t1.get_blob_path() == blob
+        assert sorted(os.listdir(join(self.store, t1.data_hash[:2]))) == [
+            f"{t1.data_hash}.npy",
+            f"{t1.data_hash}.npy.refs",
+        ]
+        assert islink(t1.get_path())
+        assert islink(t2.get_path())
+        assert realpath(t2.get_path()) == realpath(blob)
+        assert read_refs(blob) == [t1.get_path(), t2.get_path()]
+
+        loaded = cpr_serializer().loads(encoded)
+        assert json.loads(encoded.decode())["data"]["store"] == self.store
+        assert_array_equal(loaded.get_data(), self.data)
+
+    def test_image_and_zarr_targets(self):
+        img = ImageTarget(
+            location=self.tmp_dir, name="img", ext=".tif", store=self.store
+        )
+        img.set_data(self.data)
+        img.serialize()
+        assert islink(img.get_path())
+        assert_array_equal(img.get_data(), self.data)
+
+        zt = ZarrTarget(
+            location=self.tmp_dir, name="z", chunks=[32, 32], store=self.store
+        )
+        zt.set_data(self.data)
+        zt.serialize()
+        assert islink(zt.get_path())
+        assert_array_equal(np.asarray(zt.get_data()), self.data)
+
+    def test_write_options_in_blob_key(self):
+        targets = []
+        for i, resolution in enumerate([(0.5, 0.5), (2.0, 2.0)]):
+            img = ImageTarget(
+                location=join(self.tmp_dir, f"flow{i}"),
+                name="img",
+                ext=".tif",
+                resolution=resolution,
+                metadata={"unit": "um", "run": i},
+                store=self.store,
+            )
+            img.set_data(self.data)
+            img.serialize()
+            targets.append(img)
+
+        a, b = targets
+        assert a.data_hash == b.data_hash
+        assert a.get_blob_path() != b.get_blob_path()
+        for img, resolution in zip(targets, [0.5, 2.0]):
+            with TiffFile(img.get_path()) as tif:
+                x_resolution = tif.pages[0].tags["XResolution"].value
+                assert x_resolution[0] / x_resolution[1] == resolution
+                assert tif.imagej_metadata["run"] == targets.index(img)
+
+        entries = {e.path: e.kind for e in scan([self.store])}
+        assert entries == {a.get_blob_path(): "blob", b.get_blob_path(): "blob"}
+
+    def test_dataframe_schema_in_blob_key(self):
+        targets = []
+        for column in ["area", "volume"]:
+            csv = CSVTarget(
+                location=join(self.tmp_dir, column),
+                name="measurements",
+                ext=".csv",
+                store=self.store,
+            )
+            csv.set_data(pd.DataFrame({column: [1, 2, 3]}))
+            csv.serialize()
+            targets.append(csv)
+
+        a, b = targets
+        assert a.data_hash != b.data_hash
+        assert a.get_blob_path() != b.get_blob_path()
+        assert list(a.get_data().columns) == ["area"]
+        assert list(b.get_data().columns) == ["volume"]
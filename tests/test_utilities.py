@@ -3,11 +3,15 @@ import os
 import shutil
 from os.path import join
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
 
 import numpy as np
+import pandas as pd
 
 from cpr.image.ImageTarget import ImageTarget
-from cpr.utilities.utilities import hash_objects
+from cpr.utilities.fingerprint import _fingerprints, code_fingerprint
+from cpr.utilities.input_hashing import hash_inputs
+from cpr.utilities.utilities import hash_objects, task_input_hash
 
 
 class UtilitiesTest(TestCase):
@@ -30,3 +34,89 @@ class UtilitiesTest(TestCase):
         tmp = datetime.date(2023, 1, 16)
         h = hash_objects(tmp)
         assert h == "f2d0c50afd37a85d67c9f13a33c21e8c"
+
+    def test_hash_inputs(self):
+        img = ImageTarget.from_path(join(self.tmp_dir, "image.tif"))
+        img.set_data(self.data)
+        df = pd.DataFrame({"a": [1, 2, 3], "b": [0.5, 1.5, 2.5]})
+
+        h = hash_inputs(self.data, df, img, x=1.5, d={"k": [1, "v"]})
+        assert h == "9216ec63faf11151b2aaf629a3e0e04b"
+        assert len(os.listdir(self.tmp_dir)) == 0
+
+        img.serialize()
+        assert hash_inputs(self.data, df, img, x=1.5, d={"k": [1, "v"]}) == h
+
+        assert hash_inputs({"a": 1, "b": 2}) == hash_inputs({"b": 2, "a": 1})
+        assert hash_inputs(np.asfortranarray(self.data)) == hash_inputs(self.data)
+        assert hash_inputs(self.data) != hash_inputs(self.data.astype(np.uint16))
+        assert hash_inputs(1) != hash_inputs(1.0)
+        assert hash_inputs([1]) != hash_inputs((1,))
+        assert hash_inputs(df) != hash_inputs(df.astype({"a": np.float64}))
+        assert hash_inputs(datetime.date(2023, 1, 16)) != hash_inputs(
+            datetime.date(2023, 1, 17)
+        )
+
+    def test_task_input_hash(self):
+        context = MagicMock()
+        context.task.task_key = "task-key"
+        context.task.fn = lambda a: a + 1
+        code = code_fingerprint(context.task.fn)
+
+        h = task_input_hash(context, {"a": self.data})
+        assert h == hash_inputs("task-key", code, {"a": self.data})
+        assert h != task_input_hash(context, {"a": self.data + 1})
+
+    def test_code_fingerprint(self):
+        def make(scale, offset=0):
+            def fn(x):
+                return x * scale + offset + 1
+
+            return fn
+
+        assert code_fingerprint(make(2)) == code_fingerprint(make(2))
+        assert code_fingerprint(make(2)) != code_fingerprint(make(3))
+        assert code_fingerprint(make(2)) != code_fingerprint(make(2, offset=1))
+
+        def f1(x):
+            return x + 1
+
+        def f2(x):
+            return x + 2
+
+        def f3(x):
+            return [x + 1 for _ in range(2)]
+
+        def f4(x):
+            return [x + 2 for _ in range(2)]
+
+        assert f1.__code__.co_code == f2.__code__.co_code
+        assert code_fingerprint(f1) != code_fingerprint(f2)
+        assert code_fingerprint(f3) != code_fingerprint(f4)
+        assert code_fingerprint(np.add) == code_fingerprint(np.add)
+
+    def test_code_fingerprint_memoized(self):
+        def fn(x):
+            return x
+
+        h = code_fingerprint(fn)
+        with patch("cpr.utilities.fingerprint._function_digest") as digest:
+            assert code_fingerprint(fn) == h
+            digest.assert_not_called()
+
+    def test_code_fingerprint_follow_globals(self):
+        namespace = {"__name__": "flow_module"}
+        exec(
+            "def helper(x):\n    return x + 1\n\n"
+            "def task_fn(x):\n    return helper(x)\n",
+            namespace,
+        )
+        task_fn = namespace["task_fn"]
+        h = code_fingerprint(task_fn)
+        h_globals = code_fingerprint(task_fn, follow_globals=True)
+
+        exec("def helper(x):\n    return x + 2\n", namespace)
+        assert code_fingerprint(task_fn) == h
+        _fingerprints.clear()
+        assert code_fingerprint(task_fn) == h
+        assert code_fingerprint(task_fn, follow_globals=True) != h_globals
@@ -1,8 +1,10 @@
 import json
+import os
 import shutil
 import tempfile
-from os.path import join
+from os.path import basename, join
 from unittest import TestCase
+from unittest.mock import patch
 
 import numpy as np
 import zarr
@@ -11,7 +13,12 @@ from ome_zarr.io import parse_url
 from ome_zarr.writer import write_image
 
 from cpr.Serializer import cpr_serializer
+from cpr.utilities.hashing import hash_array
+from cpr.utilities.verification import sidecar_path
+from cpr.zarr.ChunkCache import ChunkCache, shared_chunk_cache
+from cpr.zarr.ChunkedArray import ChunkedArray
 from cpr.zarr.ZarrSource import ZarrSource
+from cpr.zarr.ZarrTarget import ZarrTarget
 
 
 class ZarrTest(TestCase):
@@ -88,5 +95,204 @@ class ZarrTest(TestCase):
         assert encoded_dict["data"]["slices_start"] == []
         assert encoded_dict["data"]["slices_stop"] == []
         assert z1._data is None
-        assert isinstance(z1.get_data(), zarr.core.Array)
+        assert isinstance(z1.get_data(), zarr.Array)
         assert z1._data is not None
+
+    def test_zarr_source_write_mode(self):
+        path = join(self.tmp_dir, "test.zarr")
+        group = zarr.open_group(path, mode="w")
+        group.create_array("0", data=self.data, chunks=(1, 32, 32))
+
+        zs = ZarrSource.from_path(path, "0", mode="w")
+        array = zs.get_data()
+        assert_array_equal(array[...], self.data)
+        array[0] = 0
+        assert_array_equal(zarr.open_group(path, mode="r")["0"][0], 0)
+
+    def test_zarr_target(self):
+        zt = ZarrTarget(
+            location=self.tmp_dir,
+            name="zarr_target",
+            chunks=[1, 64, 64],
+            axes=["z", "y", "x"],
+        )
+        zt.set_data(self.data)
+        zt.compute_data_hash()
+        expected_hash = zt.data_hash
+
+        serializer = cpr_serializer()
+        encoded = serializer.dumps(zt)
+        encoded_dict = json.loads(encoded.decode())
+        assert encoded_dict["__class__"] == "cpr.zarr.ZarrTarget.ZarrTarget"
+        assert encoded_dict["data"]["data_hash"] == expected_hash
+        assert encoded_dict["data"]["chunks"] == [1, 64, 64]
+        assert encoded_dict["data"]["compressor"] == "zstd"
+        assert encoded_dict["data"]["axes"] == ["z", "y", "x"]
+
+        group = zarr.open_group(zt.get_path(), mode="r")
+        assert group["0"].chunks == (1, 64, 64)
+        assert len(group.attrs["cpr"]["chunk_hashes"]) == 3 * 2 * 2
+        assert "multiscales" in group.attrs["ome"]
+
+        loaded = serializer.loads(encoded)
+        data = loaded.get_data()
+        assert isinstance(data, ChunkedArray)
+        assert_array_equal(data[1, 10:70, ::-3], self.data[1, 10:70, ::-3])
+        assert_array_equal(np.asarray(data), self.data)
+
+    def test_zarr_target_concurrent_writers(self):
+        targets = []
+        for _ in range(16):
+            zt = ZarrTarget(
+                location=self.tmp_dir, name="zarr_target", chunks=[1, 50, 50]
+            )
+            zt.set_data(self.data)
+            targets.append(zt)
+
+        encoded = cpr_serializer(max_workers=16).dumps(targets)
+        assert len(os.listdir(self.tmp_dir)) == 1
+        for loaded in cpr_serializer().loads(encoded):
+            assert_array_equal(np.asarray(loaded.get_data()), self.data)
+
+    def test_zarr_target_lost_rename(self):
+        first = ZarrTarget(location=self.tmp_dir, name="zarr_target")
+        first.set_data(self.data)
+        first.serialize()
+
+        # The final directory appears between the check and the rename.
+        second = ZarrTarget(location=self.tmp_dir, name="zarr_target")
+        second.set_data(self.data)
+        with patch("cpr.Target.exists", side_effect=[False, True]):
+            second.serialize()
+        assert second.get_path() == first.get_path()
+        assert os.listdir(self.tmp_dir) == [basename(first.get_path())]
+
+    def test_zarr_target_verifies_accessed_chunks(self):
+        zt = ZarrTarget(location=self.tmp_dir, name="zarr_target", chunks=[1, 50, 50])
+        zt.set_data(self.data)
+        zt.serialize()
+
+        # Corrupt the last chunk on disk.
+        array = zarr.open_group(zt.get_path(), mode="r+")["0"]
+        array[2, 50:, 50:] = 0
+
+        data = zt.get_data()
+        assert_array_equal(data[0, :50], self.data[0, :50])
+        with self.assertRaises(AssertionError):
+            data[2, 60:, 60:]
+
+        zt.verify = "never"
+        assert_array_equal(zt.get_data()[2, 50:, 50:], 0)
+
+    def test_zarr_target_cached_chunk_verification(self):
+        zt = ZarrTarget(
+            location=self.tmp_dir,
+            name="zarr_target",
+            chunks=[1, 50, 50],
+            verify="cached",
+        )
+        zt.set_data(self.data)
+        encoded = cpr_serializer().dumps(zt)
+
+        loaded = cpr_serializer().loads(encoded)
+        key = loaded._prefetch_key()
+        assert_array_equal(loaded.get_data()[0, :50, :50], self.data[0, :50, :50])
+        assert loaded._prefetch_key() == key
+        assert os.path.exists(sidecar_path(zt.get_path()))
+
+        # A new decode takes the verification from the sidecar.
+        with patch("cpr.zarr.ZarrTarget.hash_array", wraps=hash_array) as hashed:
+            loaded = cpr_serializer().loads(encoded)
+            assert_array_equal(loaded.get_data()[0, :50, :50], self.data[0, :50, :50])
+            hashed.assert_not_called()
+
+        # Changed chunk files are hashed again.
+        array = zarr.open_group(zt.get_path(), mode="r+")["0"]
+        array[0, :50, :50] = 0
+        with self.assertRaises(AssertionError):
+            cpr_serializer().loads(encoded).get_data()[0, :50, :50]
+
+    def test_zarr_source_lazy(self):
+        path = join(self.tmp_dir, "lazy.zarr")
+        group = zarr.open_group(path, mode="w")
+        array = group.create_array(
+            "0", shape=(3, 100, 100), chunks=(1, 32, 32), dtype=np.uint8
+        )
+        array[...] = self.data
+
+        z1 = ZarrSource.from_path(path, "0", [1, 10], [3, -10], lazy=True)
+        data = z1.get_data()
+        assert isinstance(data, ChunkedArray)
+        assert data.shape == (2, 80, 100)
+        assert_array_equal(data[0, 5:40], self.data[1, 15:50])
+        assert_array_equal(np.asarray(data), self.data[1:3, 10:-10])
+
+        cache = shared_chunk_cache(z1.cache_bytes)
+        assert data._cache_key[:2] == (path, "0")
+        assert (data._cache_key, (1, 0, 0)) in cache
+        assert (data._cache_key, (0, 0, 0)) not in cache
+
+        # Chunks are served from the cache by other sources of the store.
+        z2 = ZarrSource.from_path(path, "0", lazy=True, prefetch=False)
+        with patch.object(ChunkedArray, "_load_chunk") as load_chunk:
+            assert_array_equal(
+                z2.get_data()[1, 10:-10, 10:-10], self.data[1, 10:-10, 10:-10]
+            )
+            load_chunk.assert_not_called()
+
+        encoded_dict = json.loads(cpr_serializer().dumps(z1).decode())
+        assert encoded_dict["data"]["lazy"]
+        assert encoded_dict["data"]["cache_bytes"] == 2**28
+        assert encoded_dict["data"]["prefetch"]
+
+    def test_zarr_source_lazy_rewritten(self):
+        path = join(self.tmp_dir, "lazy.zarr")
+        group = zarr.open_group(path, mode="w")
+        group.create_array("0", data=self.data, chunks=(1, 32, 32))
+        zs = ZarrSource.from_path(path, "0", lazy=True, prefetch=False)
+        assert_array_equal(np.asarray(zs.get_data()), self.data)
+
+        group = zarr.open_group(path, mode="w")
+        group.create_array("0", data=255 - self.data, chunks=(1, 32, 32))
+        zs = ZarrSource.from_path(path, "0", lazy=True, prefetch=False)
+        assert_array_equal(np.asarray(zs.get_data()), 255 - self.data)
+
+    def test_chunk_cache(self):
+        cache = ChunkCache(max_bytes=250)
+        for i in range(3):
+            cache.put(i, np.zeros(100, dtype=np.uint8))
+        assert 0 not in cache
+        assert cache.get(1) is not None
+        cache.put(3, np.zeros(100, dtype=np.uint8))
+        assert 1 in cache
+        assert 2 not in cache
+        assert cache.n_bytes == 200
+        cache.put(4, np.zeros(300, dtype=np.uint8))
+        assert 4 not in cache
+
+    def test_zarr_source_level_selection(self):
+        path = join(self.tmp_dir, "pyramid.zarr")
+        data = np.random.randint(0, 255, size=(3, 256, 256)).astype(np.uint8)
+        store = parse_url(path=path, mode="w").store
+        write_image(data, group=zarr.group(store=store), axes="zyx")
+        levels = zarr.open_group(path, mode="r")
+
+        z1 = ZarrSource.from_path(
+            path, "0", [1, 32, 32], [2, 160, -32], resolution=[1, 4, 4]
+        )
+        assert_array_equal(z1.get_data(), levels["s2"][1:2, 8:40, 8:56])
+
+        z2 = ZarrSource.from_path(
+            path, "0", [0, 16, 16], [3, 240, 240], max_bytes=3 * 56 * 56
+        )
+        assert_array_equal(z2.get_data(), levels["s2"][:, 4:60, 4:60])
+
+        z3 = ZarrSource.from_path(
+            path, "0", resolution=[1, 3, 3], max_bytes=2**20, lazy=True
+        )
+        assert z3.get_data().shape == (3, 128, 128)
+
+        encoded_dict = json.loads(cpr_serializer().dumps(z1).decode())
+        assert encoded_dict["data"]["resolution"] == [1, 4, 4]
+        assert encoded_dict["data"]["max_bytes"] is None
+        assert encoded_dict["data"]["slices_start"] == [1, 32, 32]